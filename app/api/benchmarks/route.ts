@@ -1,16 +1,44 @@
 import { NextRequest, NextResponse } from "next/server";
 import { getSql } from "@/lib/db";
+import { MARK_SEASON_START } from "@/lib/leaderboardSeason";
 
 export const dynamic = "force-dynamic";
 
+type Gender = "men" | "women";
+
+const genderMap: Record<Gender, string> = { men: "M", women: "F" };
+
+type ComputedRow = {
+  season_year: number;
+  podium_avg: number | null;
+  median: number | null;
+  p90: number | null;
+};
+
 export async function GET(request: NextRequest) {
-  const eventSlug = request.nextUrl.searchParams.get("event");
+  const searchParams = request.nextUrl.searchParams;
+  const eventSlug = searchParams.get("event");
   if (!eventSlug) {
     return NextResponse.json(
       { error: "Query param 'event' is required" },
       { status: 400 }
     );
   }
+  const gender = searchParams.get("gender") as Gender | null;
+  if (gender && !(gender in genderMap)) {
+    return NextResponse.json(
+      { error: "Query param 'gender' must be 'men' or 'women'" },
+      { status: 400 }
+    );
+  }
+  const conferenceId = Number(searchParams.get("conference") ?? "1");
+  if (!Number.isInteger(conferenceId) || conferenceId <= 0) {
+    return NextResponse.json(
+      { error: "Query param 'conference' must be a conference id" },
+      { status: 400 }
+    );
+  }
+  const seasonYear = Number(MARK_SEASON_START.slice(0, 4));
   const sql = getSql();
   try {
     const rows = (await sql`
@@ -19,21 +47,33 @@ export async function GET(request: NextRequest) {
       JOIN events e ON e.id = b.event_id
       WHERE e.slug = ${eventSlug}
     `) as { slug: string; section_qual: number | null; state_qual: number | null; conference_podium_avg: number | null }[];
+    // Computed by scraper/benchmark_stats.py after each sync: this season, or the latest earlier one
+    const computed = gender
+      ? ((await sql`
+          SELECT s.season_year, s.podium_avg, s.median, s.p90
+          FROM benchmark_stats s
+          JOIN events e ON e.id = s.event_id
+          WHERE e.slug = ${eventSlug}
+            AND s.gender = ${genderMap[gender]}
+            AND s.conference_id = ${conferenceId}
+            AND s.season_year <= ${seasonYear}
+          ORDER BY s.season_year DESC
+          LIMIT 1
+        `) as ComputedRow[])[0]
+      : undefined;
     const b = rows[0];
-    if (!b) {
-      return NextResponse.json({
-        slug: eventSlug,
-        section_qual: null,
-        state_qual: null,
-        conference_podium_avg: null,
-      });
-    }
+    const toNumber = (v: number | null | undefined) => (v != null ? Number(v) : null);
     return NextResponse.json({
-      slug: b.slug,
-      section_qual: b.section_qual != null ? Number(b.section_qual) : null,
-      state_qual: b.state_qual != null ? Number(b.state_qual) : null,
+      slug: b?.slug ?? eventSlug,
+      section_qual: toNumber(b?.section_qual),
+      state_qual: toNumber(b?.state_qual),
       conference_podium_avg:
-        b.conference_podium_avg != null ? Number(b.conference_podium_avg) : null,
+        computed?.podium_avg != null
+          ? Number(computed.podium_avg)
+          : toNumber(b?.conference_podium_avg),
+      conference_median: toNumber(computed?.median),
+      conference_p90: toNumber(computed?.p90),
+      computed_season: computed?.season_year ?? null,
     });
   } catch (err) {
     console.error("Benchmarks API error:", err);
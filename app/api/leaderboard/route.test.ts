@@ -0,0 +1,85 @@
+import { NextRequest } from "next/server";
+import { beforeEach, describe, expect, it, vi } from "vitest";
+
+const { sql } = vi.hoisted(() => ({ sql: vi.fn() }));
+vi.mock("@/lib/db", () => ({ getSql: () => sql }));
+
+import { GET } from "./route";
+
+function request(query: string) {
+  return new NextRequest(`http://localhost/api/leaderboard?${query}`);
+}
+
+/** The SQL text and bound values of the one query the route ran. */
+function lastQuery() {
+  expect(sql).toHaveBeenCalledTimes(1);
+  const [strings, ...values] = sql.mock.calls[0];
+  return { text: (strings as string[]).join("?"), values };
+}
+
+describe("GET /api/leaderboard", () => {
+  beforeEach(() => {
+    sql.mockReset();
+    sql.mockResolvedValue([]);
+  });
+
+  it("requires event and gender, and checks gender and mode", async () => {
+    expect((await GET(request("event=100m"))).status).toBe(400);
+    expect((await GET(request("event=100m&gender=boys"))).status).toBe(400);
+    expect((await GET(request("event=100m&gender=men&mode=best"))).status).toBe(400);
+    expect(sql).not.toHaveBeenCalled();
+  });
+
+  it("ranks PRs from athlete_event_stats for the season and gender", async () => {
+    sql.mockResolvedValue([
+      { rank: 1, athlete_name: "A", school_name: "S", school_id: 1, grade: 11, value: 11.02, mark_date: "2026-04-01", meet_name: "M" },
+    ]);
+    const res = await GET(request("event=100m&gender=women"));
+    expect(res.status).toBe(200);
+    const body = await res.json();
+    expect(body.mode).toBe("pr");
+    expect(body.rows).toHaveLength(1);
+    const { text, values } = lastQuery();
+    expect(text).toContain("FROM athlete_event_stats st");
+    expect(text).toContain("st.pr_value");
+    expect(text).not.toContain("FROM marks");
+    expect(text).toContain("a.id AS athlete_id");
+    expect(values).toEqual(expect.arrayContaining(["100m", 2026, "F"]));
+  });
+
+  it("ranks avg3 from the stored last-three average", async () => {
+    sql.mockResolvedValue([
+      { rank: 1, athlete_name: "A", school_name: "S", school_id: 1, grade: 12, value: 4.8, mark_date_min: null, mark_date_max: null },
+    ]);
+    const body = await (await GET(request("event=lj&gender=men&mode=avg3"))).json();
+    expect(body.mode).toBe("avg3");
+    const { text, values } = lastQuery();
+    expect(text).toContain("st.last3_avg");
+    expect(text).toContain("FROM athlete_event_stats st");
+    expect(values).toEqual(expect.arrayContaining(["lj", 2026, "M"]));
+  });
+
+  it("passes the normalized grade filter and sanitizes distances stored in feet", async () => {
+    sql.mockResolvedValue([
+      { rank: 1, athlete_name: "A", school_name: "S", school_id: 1, grade: 11, value: 6, mark_date: null, meet_name: null },
+    ]);
+    const body = await (await GET(request("event=hj&gender=men&grades=11,12,abc"))).json();
+    expect(body.rows[0].value).toBeCloseTo(6 * 0.3048);
+    expect(lastQuery().values).toContainEqual([11, 12]);
+  });
+
+  it("ranks relays from relay_results by school", async () => {
+    await GET(request("event=4x400&gender=men"));
+    const { text } = lastQuery();
+    expect(text).toContain("FROM relay_results r");
+    expect(text).not.toContain("athlete_event_stats");
+  });
+
+  it("returns 500 when the query fails", async () => {
+    sql.mockRejectedValue(new Error("boom"));
+    vi.spyOn(console, "error").mockImplementation(() => {});
+    const res = await GET(request("event=100m&gender=men"));
+    expect(res.status).toBe(500);
+    expect((await res.json()).error).toBe("Failed to load leaderboard");
+  });
+});
@@ -13,6 +13,7 @@ type Gender = "men" | "women";
 
 const genderMap: Record<Gender, string> = { men: "M", women: "F" };
 const RELAY_SLUGS = ["4x100", "4x200", "4x400", "4x800"];
+const SEASON_YEAR = Number(MARK_SEASON_START.slice(0, 4));
 
 /** Correct values that were stored as feet instead of meters (e.g. 12 for HJ). Only convert when value is above plausible meters. */
 function sanitizeDistanceValue(slug: string, value: number): number {
@@ -68,25 +69,30 @@ export async function GET(request: NextRequest) {
           SELECT DISTINCT ON (s.id)
             s.id AS school_id,
             s.name AS school_name,
-            m.value,
-            m.mark_date,
-            m.meet_name
-          FROM marks m
-          JOIN athletes a ON a.id = m.athlete_id
-          JOIN schools s ON s.id = a.school_id
-          JOIN events e ON e.id = m.event_id
+            r.value,
+            r.mark_date,
+            r.meet_name
+          FROM relay_results r
+          JOIN schools s ON s.id = r.school_id
+          JOIN events e ON e.id = r.event_id
           WHERE e.slug = ${eventSlug}
-            AND a.gender = ${genderChar}
+            AND r.gender = ${genderChar}
             AND (
               ${useGradeFilter}::int[] IS NULL
-              OR a.grade = ANY((${useGradeFilter})::int[])
+              OR EXISTS (
+                SELECT 1 FROM relay_result_members rm
+                JOIN athletes a ON a.id = rm.athlete_id
+                WHERE rm.relay_result_id = r.id
+                  AND a.grade = ANY((${useGradeFilter})::int[])
+              )
             )
-            AND m.mark_date >= ${MARK_SEASON_START}::date
-            AND m.mark_date < ${MARK_SEASON_END_EXCLUSIVE}::date
-          ORDER BY s.id, m.value ASC NULLS LAST
+            AND r.mark_date >= ${MARK_SEASON_START}::date
+            AND r.mark_date < ${MARK_SEASON_END_EXCLUSIVE}::date
+          ORDER BY s.id, r.value ASC NULLS LAST
         )
         SELECT
           ROW_NUMBER() OVER (ORDER BY value ASC NULLS LAST)::int AS rank,
+          NULL::int AS athlete_id,
           'Relay' AS athlete_name,
           school_name,
           school_id,
@@ -104,54 +110,36 @@ export async function GET(request: NextRequest) {
     }
 
     if (mode === "pr") {
+      // athlete_event_stats is maintained by the scraper (scraper/athlete_stats.py)
       const rows = await sql`
-        WITH best_row AS (
-          SELECT DISTINCT ON (a.school_id, lower(trim(a.name)), a.gender)
-            a.name AS athlete_name,
-            s.name AS school_name,
-            s.id AS school_id,
-            a.grade,
-            m.value,
-            m.mark_date,
-            m.meet_name,
-            e.better_direction
-          FROM marks m
-          JOIN athletes a ON a.id = m.athlete_id
-          JOIN schools s ON s.id = a.school_id
-          JOIN events e ON e.id = m.event_id
-          WHERE e.slug = ${eventSlug}
-            AND a.gender = ${genderChar}
-            AND a.name != 'Relay Team'
-            AND (
-              ${useGradeFilter}::int[] IS NULL
-              OR a.grade = ANY((${useGradeFilter})::int[])
-            )
-            AND m.mark_date >= ${MARK_SEASON_START}::date
-            AND m.mark_date < ${MARK_SEASON_END_EXCLUSIVE}::date
-          ORDER BY a.school_id, lower(trim(a.name)), a.gender,
-            CASE WHEN a.grade IS NULL THEN 1 ELSE 0 END ASC,
-            CASE WHEN e.better_direction = 'lower' THEN m.value END ASC NULLS LAST,
-            CASE WHEN e.better_direction = 'higher' THEN m.value END DESC NULLS LAST,
-            m.mark_date DESC NULLS LAST
-        )
         SELECT
           ROW_NUMBER() OVER (
-            PARTITION BY better_direction
             ORDER BY
-              CASE WHEN better_direction = 'lower' THEN value END ASC NULLS LAST,
-              CASE WHEN better_direction = 'higher' THEN value END DESC NULLS LAST
+              CASE WHEN e.better_direction = 'lower' THEN st.pr_value END ASC NULLS LAST,
+              CASE WHEN e.better_direction = 'higher' THEN st.pr_value END DESC NULLS LAST
           )::int AS rank,
-          athlete_name,
-          school_name,
-          school_id,
-          grade,
-          value,
-          mark_date,
-          meet_name
-        FROM best_row
+          a.id AS athlete_id,
+          a.name AS athlete_name,
+          s.name AS school_name,
+          s.id AS school_id,
+          a.grade,
+          st.pr_value AS value,
+          st.pr_date AS mark_date,
+          st.pr_meet_name AS meet_name
+        FROM athlete_event_stats st
+        JOIN events e ON e.id = st.event_id
+        JOIN athletes a ON a.id = st.athlete_id
+        JOIN schools s ON s.id = a.school_id
+        WHERE e.slug = ${eventSlug}
+          AND st.season_year = ${SEASON_YEAR}
+          AND a.gender = ${genderChar}
+          AND (
+            ${useGradeFilter}::int[] IS NULL
+            OR a.grade = ANY((${useGradeFilter})::int[])
+          )
         ORDER BY rank
       `;
-      const sanitized = (rows as { rank: number; athlete_name: string; school_name: string; school_id: number; grade: number | null; value: number; mark_date: string | null; meet_name: string | null }[]).map(
+      const sanitized = (rows as { rank: number; athlete_id: number; athlete_name: string; school_name: string; school_id: number; grade: number | null; value: number; mark_date: string | null; meet_name: string | null }[]).map(
         (r) => ({ ...r, value: sanitizeDistanceValue(eventSlug, r.value) })
       );
       return NextResponse.json(
@@ -163,19 +151,23 @@ export async function GET(request: NextRequest) {
     if (mode === "avg3" && isRelay) {
       const rows = await sql`
         WITH school_performances AS (
-          SELECT DISTINCT s.id, s.name AS school_name, m.mark_date, m.value
-          FROM marks m
-          JOIN athletes a ON a.id = m.athlete_id
-          JOIN schools s ON s.id = a.school_id
-          JOIN events e ON e.id = m.event_id
+          SELECT s.id, s.name AS school_name, r.mark_date, r.value
+          FROM relay_results r
+          JOIN schools s ON s.id = r.school_id
+          JOIN events e ON e.id = r.event_id
           WHERE e.slug = ${eventSlug}
-            AND a.gender = ${genderChar}
+            AND r.gender = ${genderChar}
             AND (
               ${useGradeFilter}::int[] IS NULL
-              OR a.grade = ANY((${useGradeFilter})::int[])
+              OR EXISTS (
+                SELECT 1 FROM relay_result_members rm
+                JOIN athletes a ON a.id = rm.athlete_id
+                WHERE rm.relay_result_id = r.id
+                  AND a.grade = ANY((${useGradeFilter})::int[])
+              )
             )
-            AND m.mark_date >= ${MARK_SEASON_START}::date
-            AND m.mark_date < ${MARK_SEASON_END_EXCLUSIVE}::date
+            AND r.mark_date >= ${MARK_SEASON_START}::date
+            AND r.mark_date < ${MARK_SEASON_END_EXCLUSIVE}::date
         ),
         ranked AS (
           SELECT id, school_name, mark_date, value,
@@ -193,6 +185,7 @@ export async function GET(request: NextRequest) {
         )
         SELECT
           ROW_NUMBER() OVER (ORDER BY value ASC NULLS LAST)::int AS rank,
+          NULL::int AS athlete_id,
           'Relay' AS athlete_name,
           school_name,
           school_id,
@@ -210,82 +203,34 @@ export async function GET(request: NextRequest) {
     }
 
     const rows = await sql`
-      WITH last_three AS (
-        SELECT
-          m.athlete_id,
-          m.value,
-          m.mark_date,
-          ROW_NUMBER() OVER (PARTITION BY m.athlete_id ORDER BY m.mark_date DESC NULLS LAST, m.id DESC) AS rn
-        FROM marks m
-        JOIN athletes a ON a.id = m.athlete_id
-        JOIN events e ON e.id = m.event_id
-        WHERE e.slug = ${eventSlug}
-          AND a.gender = ${genderChar}
-          AND a.name != 'Relay Team'
-          AND (
-            ${useGradeFilter}::int[] IS NULL
-            OR a.grade = ANY((${useGradeFilter})::int[])
-          )
-          AND m.mark_date >= ${MARK_SEASON_START}::date
-          AND m.mark_date < ${MARK_SEASON_END_EXCLUSIVE}::date
-      ),
-      avg_marks AS (
-        SELECT
-          athlete_id,
-          AVG(value) AS value,
-          MIN(mark_date) AS mark_date_min,
-          MAX(mark_date) AS mark_date_max
-        FROM last_three
-        WHERE rn <= 3
-        GROUP BY athlete_id
-        HAVING COUNT(*) >= 1
-      ),
-      with_school AS (
-        SELECT
-          a.name AS athlete_name,
-          s.name AS school_name,
-          s.id AS school_id,
-          a.grade,
-          e.better_direction,
-          am.value,
-          am.mark_date_min,
-          am.mark_date_max
-        FROM avg_marks am
-        JOIN athletes a ON a.id = am.athlete_id
-        JOIN schools s ON s.id = a.school_id
-        JOIN events e ON e.slug = ${eventSlug}
-      ),
-      best_per_athlete AS (
-        SELECT
-          MIN(athlete_name) AS athlete_name,
-          school_name,
-          school_id,
-          MAX(grade) FILTER (WHERE grade IS NOT NULL) AS grade,
-          better_direction,
-          CASE WHEN better_direction = 'lower' THEN MIN(value) ELSE MAX(value) END AS value,
-          MIN(mark_date_min) AS mark_date_min,
-          MAX(mark_date_max) AS mark_date_max
-        FROM with_school
-        GROUP BY school_id, lower(trim(athlete_name)), school_name, better_direction
-      )
       SELECT
         ROW_NUMBER() OVER (
-          PARTITION BY better_direction
           ORDER BY
-            CASE WHEN better_direction = 'lower' THEN value END ASC NULLS LAST,
-            CASE WHEN better_direction = 'higher' THEN value END DESC NULLS LAST
+            CASE WHEN e.better_direction = 'lower' THEN st.last3_avg END ASC NULLS LAST,
+            CASE WHEN e.better_direction = 'higher' THEN st.last3_avg END DESC NULLS LAST
         )::int AS rank,
-        athlete_name,
-        school_name,
-        school_id,
-        grade,
-        ROUND(value::numeric, 2) AS value,
-        mark_date_min,
-        mark_date_max
-      FROM best_per_athlete
+        a.id AS athlete_id,
+        a.name AS athlete_name,
+        s.name AS school_name,
+        s.id AS school_id,
+        a.grade,
+        ROUND(st.last3_avg, 2) AS value,
+        st.last3_date_min AS mark_date_min,
+        st.last3_date_max AS mark_date_max
+      FROM athlete_event_stats st
+      JOIN events e ON e.id = st.event_id
+      JOIN athletes a ON a.id = st.athlete_id
+      JOIN schools s ON s.id = a.school_id
+      WHERE e.slug = ${eventSlug}
+        AND st.season_year = ${SEASON_YEAR}
+        AND a.gender = ${genderChar}
+        AND (
+          ${useGradeFilter}::int[] IS NULL
+          OR a.grade = ANY((${useGradeFilter})::int[])
+        )
       ORDER BY rank
     `;
-    const sanitized = (rows as { rank: number; athlete_name: string; school_name: string; school_id: number; grade: number | null; value: number; mark_date_min: string | null; mark_date_max: string | null }[]).map(
+    const sanitized = (rows as { rank: number; athlete_id: number; athlete_name: string; school_name: string; school_id: number; grade: number | null; value: number; mark_date_min: string | null; mark_date_max: string | null }[]).map(
       (r) => ({ ...r, value: sanitizeDistanceValue(eventSlug, r.value) })
     );
     return NextResponse.json(
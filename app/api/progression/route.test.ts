@@ -0,0 +1,41 @@
+import { NextRequest } from "next/server";
+import { beforeEach, describe, expect, it, vi } from "vitest";
+
+const { sql } = vi.hoisted(() => ({ sql: vi.fn() }));
+vi.mock("@/lib/db", () => ({ getSql: () => sql }));
+
+import { GET } from "./route";
+
+function request(query: string) {
+  return new NextRequest(`http://localhost/api/progression?${query}`);
+}
+
+describe("GET /api/progression", () => {
+  beforeEach(() => {
+    sql.mockReset();
+    sql.mockResolvedValue([]);
+  });
+
+  it("rejects a missing athlete or event and a non-numeric season", async () => {
+    expect((await GET(request("event=100m"))).status).toBe(400);
+    expect((await GET(request("athlete_id=abc&event=100m"))).status).toBe(400);
+    expect((await GET(request("athlete_id=7&event=100m&season=spring"))).status).toBe(400);
+    expect(sql).not.toHaveBeenCalled();
+  });
+
+  it("returns the stored series", async () => {
+    sql.mockResolvedValue([
+      {
+        series: { dates: ["2026-03-01", "2026-03-08"], values: [11.4, 11.2], meets: ["A", null], best: [true, true] },
+        marks_count: 2,
+      },
+    ]);
+    const body = await (await GET(request("athlete_id=7&event=100m&season=2026"))).json();
+    expect(body).toMatchObject({ athlete_id: 7, event: "100m", season_year: 2026, marks_count: 2, values: [11.4, 11.2] });
+  });
+
+  it("returns an empty series when nothing is stored", async () => {
+    const body = await (await GET(request("athlete_id=7&event=100m"))).json();
+    expect(body).toMatchObject({ marks_count: 0, dates: [], values: [] });
+  });
+});
@@ -0,0 +1,58 @@
+import { NextRequest, NextResponse } from "next/server";
+import { getSql } from "@/lib/db";
+import { MARK_SEASON_START } from "@/lib/leaderboardSeason";
+
+export const dynamic = "force-dynamic";
+
+type ProgressionRow = {
+  series: { dates: string[]; values: number[]; meets: (string | null)[]; best: boolean[] };
+  marks_count: number;
+};
+
+export async function GET(request: NextRequest) {
+  const searchParams = request.nextUrl.searchParams;
+  const athleteId = Number(searchParams.get("athlete_id"));
+  const eventSlug = searchParams.get("event");
+  if (!Number.isInteger(athleteId) || athleteId <= 0 || !eventSlug) {
+    return NextResponse.json(
+      { error: "Query params 'athlete_id' and 'event' are required" },
+      { status: 400 }
+    );
+  }
+  const seasonYear = Number(searchParams.get("season") ?? MARK_SEASON_START.slice(0, 4));
+  if (!Number.isInteger(seasonYear)) {
+    return NextResponse.json(
+      { error: "season must be a year, e.g. 2026" },
+      { status: 400 }
+    );
+  }
+  const sql = getSql();
+  try {
+    // Built by scraper/progressions.py after each sync: one row per athlete, event and season
+    const rows = (await sql`
+      SELECT p.series, p.marks_count
+      FROM athlete_progressions p
+      JOIN events e ON e.id = p.event_id
+      WHERE p.athlete_id = ${athleteId}
+        AND e.slug = ${eventSlug}
+        AND p.season_year = ${seasonYear}
+    `) as ProgressionRow[];
+    const row = rows[0];
+    return NextResponse.json({
+      athlete_id: athleteId,
+      event: eventSlug,
+      season_year: seasonYear,
+      marks_count: row?.marks_count ?? 0,
+      dates: row?.series.dates ?? [],
+      values: row?.series.values ?? [],
+      meets: row?.series.meets ?? [],
+      best: row?.series.best ?? [],
+    });
+  } catch (err) {
+    console.error("Progression API error:", err);
+    return NextResponse.json(
+      { error: "Failed to load progression" },
+      { status: 500 }
+    );
+  }
+}
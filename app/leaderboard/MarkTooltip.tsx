@@ -1,6 +1,6 @@
 "use client";
 
-import { useId, useLayoutEffect, useRef, useState } from "react";
+import { useEffect, useId, useLayoutEffect, useRef, useState } from "react";
 import { createPortal } from "react-dom";
 
 type PRProvenance = { mark_date?: string; meet_name?: string | null };
@@ -21,14 +21,21 @@ function formatDate(dateStr: string | undefined): string {
   }
 }
 
+/** Season series from /api/progression (built by scraper/progressions.py). */
+type Progression = { marks_count: number; values: number[] };
+
 type Props = {
   mode: "pr" | "avg3";
   provenance: PRProvenance | Avg3Provenance;
+  /** Athlete and event to show the season progression for (individual events only). */
+  progression?: { athleteId: number; event: string };
+  formatValue?: (v: number) => string;
   children: React.ReactNode;
 };
 
-export function MarkTooltip({ mode, provenance, children }: Props) {
+export function MarkTooltip({ mode, provenance, progression, formatValue, children }: Props) {
   const [visible, setVisible] = useState(false);
+  const [series, setSeries] = useState<Progression | null>(null);
   const [coords, setCoords] = useState<{ top: number; left: number } | null>(
     null
   );
@@ -59,6 +66,36 @@ export function MarkTooltip({ mode, provenance, children }: Props) {
     label = `Avg of last 3: ${min} – ${max}`;
   }
 
+  const athleteId = progression?.athleteId;
+  const progressionEvent = progression?.event;
+  // Fetched once, the first time the tooltip opens
+  useEffect(() => {
+    if (!visible || series || athleteId == null || !progressionEvent) return;
+    let cancelled = false;
+    const params = new URLSearchParams({
+      athlete_id: String(athleteId),
+      event: progressionEvent,
+    });
+    fetch(`/api/progression?${params}`)
+      .then((res) => (res.ok ? res.json() : null))
+      .then((data: Progression | null) => {
+        if (!cancelled && data) setSeries(data);
+      })
+      .catch(() => {});
+    return () => {
+      cancelled = true;
+    };
+  }, [visible, series, athleteId, progressionEvent]);
+
+  let progressionLabel: string | null = null;
+  if (series && series.values.length > 1) {
+    const fmt = formatValue ?? ((v: number) => String(v));
+    // Newest six marks keep the tooltip on one line
+    const shown = series.values.slice(-6).map((v) => fmt(Number(v)));
+    const more = series.values.length > shown.length ? "… → " : "";
+    progressionLabel = `${series.marks_count} marks this season: ${more}${shown.join(" → ")}`;
+  }
+
   useLayoutEffect(() => {
     if (!visible || !triggerRef.current) {
       setCoords(null);
@@ -85,6 +122,7 @@ export function MarkTooltip({ mode, provenance, children }: Props) {
         }}
       >
         {label}
+        {progressionLabel && <span className="block text-gray-300">{progressionLabel}</span>}
       </span>
     ) : null;
 
@@ -15,6 +15,7 @@ type SchoolRow = {
 };
 type LeaderboardRow = {
   rank: number;
+  athlete_id: number | null;
   athlete_name: string;
   school_name: string;
   school_id: number;
@@ -30,6 +31,7 @@ type Benchmarks = {
   section_qual: number | null;
   state_qual: number | null;
   conference_podium_avg: number | null;
+  computed_season?: number | null;
 };
 
 const EVENT_GROUPS: { label: string; slugs: string[] }[] = [
@@ -157,7 +159,7 @@ function LeaderboardContent() {
       fetch(leaderboardUrl, { cache: "no-store" }).then((r) =>
         parseJson(r, "Leaderboard")
       ),
-      fetch(`/api/benchmarks?event=${encodeURIComponent(eventSlug)}`, {
+      fetch(`/api/benchmarks?event=${encodeURIComponent(eventSlug)}&gender=${gender}`, {
         cache: "no-store",
       }).then((r) => parseJson(r, "Benchmarks")),
     ])
@@ -338,6 +340,8 @@ function LeaderboardContent() {
                 {benchmarks.conference_podium_avg != null
                   ? formatValue(benchmarks.conference_podium_avg)
                   : "—"}
+                {benchmarks.computed_season != null &&
+                  ` (${benchmarks.computed_season})`}
               </span>
             </div>
           )}
@@ -409,6 +413,12 @@ function LeaderboardContent() {
                       <td className="px-4 py-2 text-right font-mono text-sm font-semibold text-gray-800">
                         <MarkTooltip
                           mode={mode}
+                          progression={
+                            r.athlete_id != null
+                              ? { athleteId: r.athlete_id, event: slug }
+                              : undefined
+                          }
+                          formatValue={formatValue}
                           provenance={
                             mode === "pr"
                               ? {
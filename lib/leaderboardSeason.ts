@@ -1,6 +1,6 @@
 /**
  * Calendar window for leaderboard marks (inclusive start, exclusive end).
- * Keep in sync with scraper `upsert_athletes_marks` in scraper/run.py.
+ * Keep in sync with scraper `season_window` in scraper/run.py (applied in scraper/validate.py).
  */
 export const MARK_SEASON_START = "2026-01-01";
 export const MARK_SEASON_END_EXCLUSIVE = "2027-01-01";
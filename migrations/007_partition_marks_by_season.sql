@@ -0,0 +1,67 @@
+-- Range-partition marks by meet date: one partition per season year (Jan 1 – Jan 1).
+-- Season cleanup becomes a partition detach/drop instead of a full-table DELETE + VACUUM,
+-- and old seasons can be archived cheaply instead of thrown away.
+--
+-- Partitions are named marks_y<YEAR>; undated rows (mark_date IS NULL) land in marks_default.
+-- Manage partitions afterwards with:
+--   python scraper/season_partitions.py list
+--   python scraper/season_partitions.py rollover --year 2027
+--
+-- Run from project root:
+--   psql "%DATABASE_URL%" -v ON_ERROR_STOP=1 -f migrations/007_partition_marks_by_season.sql
+
+BEGIN;
+
+ALTER TABLE marks RENAME TO marks_unpartitioned;
+ALTER INDEX IF EXISTS idx_marks_athlete_event RENAME TO idx_marks_unpartitioned_athlete_event;
+ALTER INDEX IF EXISTS idx_marks_event RENAME TO idx_marks_unpartitioned_event;
+-- Keep the id sequence alive when the old table is dropped below
+ALTER SEQUENCE marks_id_seq OWNED BY NONE;
+
+-- No primary key on id: a partitioned PK must include mark_date, which is nullable.
+-- Nothing references marks.id; the natural key below is what upserts conflict on.
+CREATE TABLE marks (
+  id INTEGER NOT NULL DEFAULT nextval('marks_id_seq'),
+  athlete_id INTEGER NOT NULL REFERENCES athletes(id) ON DELETE CASCADE,
+  event_id INTEGER NOT NULL REFERENCES events(id) ON DELETE CASCADE,
+  value NUMERIC NOT NULL,
+  mark_date DATE,
+  meet_name TEXT,
+  created_at TIMESTAMPTZ DEFAULT NOW(),
+  CONSTRAINT marks_natural_key UNIQUE (athlete_id, event_id, mark_date, value)
+) PARTITION BY RANGE (mark_date);
+
+ALTER SEQUENCE marks_id_seq OWNED BY marks.id;
+
+CREATE TABLE marks_default PARTITION OF marks DEFAULT;
+
+-- One partition per season already present in the data, plus the current and next season
+DO $$
+DECLARE
+  y INTEGER;
+BEGIN
+  FOR y IN
+    SELECT DISTINCT EXTRACT(YEAR FROM mark_date)::int FROM marks_unpartitioned WHERE mark_date IS NOT NULL
+    UNION
+    SELECT generate_series(2026, 2027)
+  LOOP
+    EXECUTE format(
+      'CREATE TABLE IF NOT EXISTS %I PARTITION OF marks FOR VALUES FROM (%L) TO (%L)',
+      'marks_y' || y, make_date(y, 1, 1), make_date(y + 1, 1, 1)
+    );
+  END LOOP;
+END $$;
+
+INSERT INTO marks (id, athlete_id, event_id, value, mark_date, meet_name, created_at)
+SELECT id, athlete_id, event_id, value, mark_date, meet_name, created_at
+FROM marks_unpartitioned;
+
+DROP TABLE marks_unpartitioned;
+
+CREATE INDEX IF NOT EXISTS idx_marks_athlete_event ON marks(athlete_id, event_id);
+CREATE INDEX IF NOT EXISTS idx_marks_event ON marks(event_id);
+
+-- Detached/archived seasons are moved here by season_partitions.py archive
+CREATE SCHEMA IF NOT EXISTS marks_archive;
+
+COMMIT;
@@ -0,0 +1,19 @@
+-- Checkpoints for resumable syncs: each (school, season, view) finished within a scrape run.
+-- sync_conference.py / sync_orchestrator.py --resume reopen the latest unfinished run for the same
+-- target and skip steps recorded here.
+--
+--   psql "%DATABASE_URL%" -v ON_ERROR_STOP=1 -f migrations/008_scrape_run_checkpoints.sql
+
+-- What the run covers, e.g. '1:2026' (conference:season) or '1:2025,1:2026' for the orchestrator
+ALTER TABLE scrape_runs ADD COLUMN IF NOT EXISTS target TEXT;
+
+CREATE INDEX IF NOT EXISTS idx_scrape_runs_target ON scrape_runs(target, started_at DESC);
+
+CREATE TABLE IF NOT EXISTS scrape_run_steps (
+  run_id INTEGER NOT NULL REFERENCES scrape_runs(id) ON DELETE CASCADE,
+  school_id INTEGER NOT NULL REFERENCES schools(id) ON DELETE CASCADE,
+  season_year INTEGER NOT NULL,
+  view TEXT NOT NULL CHECK (view IN ('men', 'women', 'relays')),
+  completed_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  PRIMARY KEY (run_id, school_id, season_year, view)
+);
@@ -0,0 +1,19 @@
+-- Per-(school, view) fetch log: which fetch tier produced the page ('http' = plain requests,
+-- 'browser' = Playwright) and how long fetch and parse took. The tiered fetcher uses the latest
+-- row per school/view to skip the HTTP attempt for teams that recently needed the browser.
+--
+--   psql "%DATABASE_URL%" -v ON_ERROR_STOP=1 -f migrations/009_school_fetch_stats.sql
+
+CREATE TABLE IF NOT EXISTS school_fetch_stats (
+  id SERIAL PRIMARY KEY,
+  run_id INTEGER REFERENCES scrape_runs(id) ON DELETE SET NULL,
+  school_id INTEGER NOT NULL REFERENCES schools(id) ON DELETE CASCADE,
+  season_year INTEGER NOT NULL,
+  view TEXT NOT NULL CHECK (view IN ('men', 'women', 'relays')),
+  tier TEXT NOT NULL CHECK (tier IN ('http', 'browser')),
+  fetch_ms INTEGER,
+  parse_ms INTEGER,
+  fetched_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_school_fetch_stats_school_view ON school_fetch_stats(school_id, view, fetched_at DESC);
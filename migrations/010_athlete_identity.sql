@@ -0,0 +1,62 @@
+-- One athletes row per person: merge rows that differ only by grade (or spacing/case of the name),
+-- then key athletes on (school, gender, name) instead of (school, name, grade, gender).
+-- The scraper resolves names through scraper/identity.py before inserting, so the leaderboard
+-- API can group by athlete id instead of lower(trim(name)).
+--
+--   psql "%DATABASE_URL%" -v ON_ERROR_STOP=1 -f migrations/010_athlete_identity.sql
+
+BEGIN;
+
+-- Canonical row per identity: the oldest id; it takes the highest grade seen
+CREATE TEMP TABLE athlete_merge ON COMMIT DROP AS
+SELECT id AS dup_id, canonical_id
+FROM (
+  SELECT
+    id,
+    FIRST_VALUE(id) OVER (
+      PARTITION BY school_id, gender, lower(btrim(regexp_replace(name, '\s+', ' ', 'g')))
+      ORDER BY id
+    ) AS canonical_id
+  FROM athletes
+) ranked
+WHERE id <> canonical_id;
+
+UPDATE athletes a
+SET grade = g.max_grade
+FROM (
+  SELECT am.canonical_id, MAX(a2.grade) AS max_grade
+  FROM athlete_merge am
+  JOIN athletes a2 ON a2.id IN (am.dup_id, am.canonical_id)
+  GROUP BY am.canonical_id
+) g
+WHERE a.id = g.canonical_id AND g.max_grade IS NOT NULL AND a.grade IS DISTINCT FROM g.max_grade;
+
+-- Marks that would collide with the canonical athlete's existing mark after repointing
+DELETE FROM marks m
+USING (
+  SELECT
+    m2.tableoid AS part,
+    m2.ctid AS row_ctid,
+    ROW_NUMBER() OVER (
+      PARTITION BY COALESCE(am.canonical_id, m2.athlete_id), m2.event_id, m2.mark_date, m2.value
+      ORDER BY (am.dup_id IS NOT NULL), m2.id
+    ) AS rn
+  FROM marks m2
+  LEFT JOIN athlete_merge am ON am.dup_id = m2.athlete_id
+  WHERE m2.athlete_id IN (SELECT dup_id FROM athlete_merge UNION SELECT canonical_id FROM athlete_merge)
+) x
+WHERE m.tableoid = x.part AND m.ctid = x.row_ctid AND x.rn > 1;
+
+UPDATE marks m
+SET athlete_id = am.canonical_id
+FROM athlete_merge am
+WHERE m.athlete_id = am.dup_id;
+
+DELETE FROM athletes a
+USING athlete_merge am
+WHERE a.id = am.dup_id;
+
+ALTER TABLE athletes DROP CONSTRAINT IF EXISTS athletes_school_id_name_grade_gender_key;
+CREATE UNIQUE INDEX IF NOT EXISTS athletes_identity_key ON athletes(school_id, gender, lower(btrim(name)));
+
+COMMIT;
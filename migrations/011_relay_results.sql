@@ -0,0 +1,61 @@
+-- Relay runs as one row per team result instead of one mark per listed member (plus a
+-- "Relay Team" placeholder athlete when the meet listed no names). Members are a junction table
+-- with leg order when known. Existing relay marks are folded into relay_results and removed.
+--
+--   psql "%DATABASE_URL%" -v ON_ERROR_STOP=1 -f migrations/011_relay_results.sql
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS relay_results (
+  id SERIAL PRIMARY KEY,
+  school_id INTEGER NOT NULL REFERENCES schools(id) ON DELETE CASCADE,
+  gender CHAR(1) NOT NULL CHECK (gender IN ('M', 'F')),
+  event_id INTEGER NOT NULL REFERENCES events(id) ON DELETE CASCADE,
+  mark_date DATE NOT NULL,
+  value NUMERIC NOT NULL,
+  meet_name TEXT,
+  created_at TIMESTAMPTZ DEFAULT NOW(),
+  CONSTRAINT relay_results_natural_key UNIQUE (school_id, gender, event_id, mark_date, value)
+);
+
+CREATE INDEX IF NOT EXISTS idx_relay_results_event ON relay_results(event_id, gender, mark_date);
+
+CREATE TABLE IF NOT EXISTS relay_result_members (
+  relay_result_id INTEGER NOT NULL REFERENCES relay_results(id) ON DELETE CASCADE,
+  athlete_id INTEGER NOT NULL REFERENCES athletes(id) ON DELETE CASCADE,
+  leg SMALLINT,
+  PRIMARY KEY (relay_result_id, athlete_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_relay_result_members_athlete ON relay_result_members(athlete_id);
+
+-- Backfill: one result per (school, gender, event, date, time); leg order is unknown for old rows
+INSERT INTO relay_results (school_id, gender, event_id, mark_date, value, meet_name)
+SELECT a.school_id, a.gender, m.event_id, m.mark_date, m.value, MAX(m.meet_name)
+FROM marks m
+JOIN athletes a ON a.id = m.athlete_id
+JOIN events e ON e.id = m.event_id
+WHERE e.slug IN ('4x100', '4x200', '4x400', '4x800') AND m.mark_date IS NOT NULL
+GROUP BY a.school_id, a.gender, m.event_id, m.mark_date, m.value
+ON CONFLICT ON CONSTRAINT relay_results_natural_key DO NOTHING;
+
+INSERT INTO relay_result_members (relay_result_id, athlete_id)
+SELECT DISTINCT r.id, a.id
+FROM marks m
+JOIN athletes a ON a.id = m.athlete_id
+JOIN events e ON e.id = m.event_id
+JOIN relay_results r
+  ON r.school_id = a.school_id AND r.gender = a.gender AND r.event_id = m.event_id
+ AND r.mark_date = m.mark_date AND r.value = m.value
+WHERE e.slug IN ('4x100', '4x200', '4x400', '4x800') AND a.name <> 'Relay Team'
+ON CONFLICT DO NOTHING;
+
+DELETE FROM marks m
+USING events e
+WHERE e.id = m.event_id AND e.slug IN ('4x100', '4x200', '4x400', '4x800');
+
+DELETE FROM athletes a
+WHERE a.name = 'Relay Team'
+  AND NOT EXISTS (SELECT 1 FROM marks m WHERE m.athlete_id = a.id);
+
+COMMIT;
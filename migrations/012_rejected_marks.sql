@@ -0,0 +1,25 @@
+-- Quarantine for marks the scraper drops (scraper/quarantine.py), one row per rejected cell with
+-- a reason code, so data gaps can be traced without re-fetching the team pages.
+--
+--   psql "%DATABASE_URL%" -v ON_ERROR_STOP=1 -f migrations/012_rejected_marks.sql
+
+CREATE TABLE IF NOT EXISTS rejected_marks (
+  id BIGSERIAL PRIMARY KEY,
+  run_id INTEGER REFERENCES scrape_runs(id) ON DELETE SET NULL,
+  school_id INTEGER REFERENCES schools(id) ON DELETE CASCADE,
+  gender CHAR(1) CHECK (gender IN ('M', 'F')),
+  season_year INTEGER,
+  athlete_name TEXT,
+  event TEXT,           -- slug, or the raw event label when it mapped to none
+  raw_text TEXT,        -- result cell as printed (parse rejects)
+  value NUMERIC,        -- parsed value (validation rejects)
+  mark_date DATE,
+  meet_name TEXT,
+  reason TEXT NOT NULL CHECK (
+    reason IN ('unknown_event', 'unparsable', 'above_max', 'below_min', 'time_range', 'out_of_season')
+  ),
+  created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_rejected_marks_run ON rejected_marks(run_id, reason);
+CREATE INDEX IF NOT EXISTS idx_rejected_marks_school ON rejected_marks(school_id, season_year, reason);
@@ -0,0 +1,37 @@
+-- Projected conference-meet results (scraper/scoring.py): places and points per event from the
+-- current marks, and team totals. Replaced per (conference, season, mode) after each successful
+-- sync_conference.py / sync_orchestrator.py run.
+--
+--   psql "%DATABASE_URL%" -v ON_ERROR_STOP=1 -f migrations/013_meet_projections.sql
+
+CREATE TABLE IF NOT EXISTS meet_projections (
+  id BIGSERIAL PRIMARY KEY,
+  conference_id INTEGER NOT NULL REFERENCES conferences(id) ON DELETE CASCADE,
+  season_year INTEGER NOT NULL,
+  mode TEXT NOT NULL CHECK (mode IN ('pr', 'avg3')),
+  run_id INTEGER REFERENCES scrape_runs(id) ON DELETE SET NULL,
+  gender CHAR(1) NOT NULL CHECK (gender IN ('M', 'F')),
+  event_id INTEGER NOT NULL REFERENCES events(id) ON DELETE CASCADE,
+  place INTEGER NOT NULL,
+  athlete_id INTEGER REFERENCES athletes(id) ON DELETE CASCADE,  -- NULL for relays
+  school_id INTEGER NOT NULL REFERENCES schools(id) ON DELETE CASCADE,
+  value NUMERIC NOT NULL,   -- PR or average of the last 3 marks, per mode
+  points NUMERIC NOT NULL,  -- tied entrants share the points of the places they occupy
+  computed_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_meet_projections_event
+  ON meet_projections(conference_id, season_year, mode, gender, event_id, place);
+
+CREATE TABLE IF NOT EXISTS meet_projection_teams (
+  conference_id INTEGER NOT NULL REFERENCES conferences(id) ON DELETE CASCADE,
+  season_year INTEGER NOT NULL,
+  mode TEXT NOT NULL CHECK (mode IN ('pr', 'avg3')),
+  run_id INTEGER REFERENCES scrape_runs(id) ON DELETE SET NULL,
+  gender CHAR(1) NOT NULL CHECK (gender IN ('M', 'F')),
+  school_id INTEGER NOT NULL REFERENCES schools(id) ON DELETE CASCADE,
+  points NUMERIC NOT NULL,
+  rank INTEGER NOT NULL,
+  computed_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  PRIMARY KEY (conference_id, season_year, mode, gender, school_id)
+);
@@ -0,0 +1,19 @@
+-- Benchmarks computed from marks (scraper/benchmark_stats.py), per conference, season, event and
+-- gender. Refreshed after each successful sync; only changed rows are rewritten. /api/benchmarks
+-- serves conference_podium_avg from here and falls back to the hand-filled benchmarks table.
+--
+--   psql "%DATABASE_URL%" -v ON_ERROR_STOP=1 -f migrations/014_benchmark_stats.sql
+
+CREATE TABLE IF NOT EXISTS benchmark_stats (
+  conference_id INTEGER NOT NULL REFERENCES conferences(id) ON DELETE CASCADE,
+  season_year INTEGER NOT NULL,
+  event_id INTEGER NOT NULL REFERENCES events(id) ON DELETE CASCADE,
+  gender CHAR(1) NOT NULL CHECK (gender IN ('M', 'F')),
+  entrants INTEGER NOT NULL,     -- athletes (relays: schools) with a mark in the season
+  best NUMERIC(10, 2),
+  podium_avg NUMERIC(10, 2),     -- mean of the 3 best season bests
+  median NUMERIC(10, 2),
+  p90 NUMERIC(10, 2),            -- season best that beats 90% of entrants
+  computed_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  PRIMARY KEY (conference_id, season_year, event_id, gender)
+);
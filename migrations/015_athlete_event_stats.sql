@@ -0,0 +1,66 @@
+-- Per (athlete, event, season) aggregates for the leaderboard: PR and the last three marks.
+-- Maintained by the scraper's upsert path (scraper/athlete_stats.py) for the keys each batch
+-- touches; /api/leaderboard reads it for individual events in both modes.
+-- The table is filled from marks below (same computation as athlete_stats.py --rebuild; keys
+-- that already have a row are left alone, so re-running the migration is safe).
+--
+--   psql "%DATABASE_URL%" -v ON_ERROR_STOP=1 -f migrations/015_athlete_event_stats.sql
+
+CREATE TABLE IF NOT EXISTS athlete_event_stats (
+  athlete_id INTEGER NOT NULL REFERENCES athletes(id) ON DELETE CASCADE,
+  event_id INTEGER NOT NULL REFERENCES events(id) ON DELETE CASCADE,
+  season_year INTEGER NOT NULL,
+  pr_value NUMERIC NOT NULL,      -- best by events.better_direction (latest date on ties)
+  pr_date DATE,
+  pr_meet_name TEXT,
+  last3_values NUMERIC[] NOT NULL, -- newest first (mark_date DESC, id DESC)
+  last3_avg NUMERIC NOT NULL,
+  last3_date_min DATE,
+  last3_date_max DATE,
+  marks_count INTEGER NOT NULL,
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  PRIMARY KEY (athlete_id, event_id, season_year)
+);
+
+CREATE INDEX IF NOT EXISTS idx_athlete_event_stats_pr ON athlete_event_stats(event_id, season_year, pr_value);
+CREATE INDEX IF NOT EXISTS idx_athlete_event_stats_avg3 ON athlete_event_stats(event_id, season_year, last3_avg);
+
+-- Backfill from existing marks so the leaderboard is not empty after deploy
+INSERT INTO athlete_event_stats (
+  athlete_id, event_id, season_year, pr_value, pr_date, pr_meet_name, last3_values, last3_avg,
+  last3_date_min, last3_date_max, marks_count
+)
+WITH keys(athlete_id, event_id, season_year) AS (
+  SELECT DISTINCT athlete_id, event_id, EXTRACT(YEAR FROM mark_date)::int FROM marks
+  WHERE mark_date IS NOT NULL
+),
+ranked AS (
+  SELECT k.athlete_id, k.event_id, k.season_year, m.id, m.value, m.mark_date, m.meet_name,
+    ROW_NUMBER() OVER (
+      PARTITION BY k.athlete_id, k.event_id, k.season_year
+      ORDER BY
+        CASE WHEN e.better_direction = 'lower' THEN m.value END ASC NULLS LAST,
+        CASE WHEN e.better_direction = 'higher' THEN m.value END DESC NULLS LAST,
+        m.mark_date DESC NULLS LAST
+    ) AS best_rn,
+    ROW_NUMBER() OVER (
+      PARTITION BY k.athlete_id, k.event_id, k.season_year
+      ORDER BY m.mark_date DESC NULLS LAST, m.id DESC
+    ) AS recent_rn
+  FROM keys k
+  JOIN events e ON e.id = k.event_id
+  JOIN marks m ON m.athlete_id = k.athlete_id AND m.event_id = k.event_id
+    AND m.mark_date >= make_date(k.season_year, 1, 1) AND m.mark_date < make_date(k.season_year + 1, 1, 1)
+)
+SELECT athlete_id, event_id, season_year,
+  MAX(value) FILTER (WHERE best_rn = 1),
+  MAX(mark_date) FILTER (WHERE best_rn = 1),
+  MAX(meet_name) FILTER (WHERE best_rn = 1),
+  ARRAY_AGG(value ORDER BY recent_rn) FILTER (WHERE recent_rn <= 3),
+  AVG(value) FILTER (WHERE recent_rn <= 3),
+  MIN(mark_date) FILTER (WHERE recent_rn <= 3),
+  MAX(mark_date) FILTER (WHERE recent_rn <= 3),
+  COUNT(*)::int
+FROM ranked
+GROUP BY athlete_id, event_id, season_year
+ON CONFLICT (athlete_id, event_id, season_year) DO NOTHING;
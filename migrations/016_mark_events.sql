@@ -0,0 +1,25 @@
+-- Change feed written by each sync (scraper/change_feed.py): new personal records, new school
+-- bests and new entries into the leaderboard's top N, found by comparing incoming marks with the
+-- bests stored before the run.
+--
+--   psql "%DATABASE_URL%" -v ON_ERROR_STOP=1 -f migrations/016_mark_events.sql
+
+CREATE TABLE IF NOT EXISTS mark_events (
+  id BIGSERIAL PRIMARY KEY,
+  run_id INTEGER REFERENCES scrape_runs(id) ON DELETE SET NULL,
+  kind TEXT NOT NULL CHECK (kind IN ('pr', 'school_best', 'top_n')),
+  athlete_id INTEGER REFERENCES athletes(id) ON DELETE CASCADE,
+  school_id INTEGER REFERENCES schools(id) ON DELETE CASCADE,
+  event_id INTEGER NOT NULL REFERENCES events(id) ON DELETE CASCADE,
+  gender CHAR(1) NOT NULL CHECK (gender IN ('M', 'F')),
+  season_year INTEGER NOT NULL,
+  value NUMERIC NOT NULL,
+  previous_value NUMERIC,  -- prior best of the athlete (pr, top_n) or school (school_best); NULL if none
+  rank INTEGER,            -- top_n: place on the leaderboard after this mark
+  mark_date DATE,
+  meet_name TEXT,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_mark_events_run ON mark_events(run_id, kind);
+CREATE INDEX IF NOT EXISTS idx_mark_events_recent ON mark_events(season_year, created_at DESC);
@@ -0,0 +1,21 @@
+-- Per (athlete, event, season) progression series, packed into one JSONB value so a progression
+-- chart is a single primary-key lookup (GET /api/progression). Built by scraper/progressions.py
+-- after each successful sync for the keys whose athlete_event_stats row changed since the series
+-- was built; rows go away with their athlete_event_stats row.
+-- After creating the table, fill it once:  python scraper/progressions.py --rebuild
+--
+--   psql "%DATABASE_URL%" -v ON_ERROR_STOP=1 -f migrations/017_athlete_progressions.sql
+
+CREATE TABLE IF NOT EXISTS athlete_progressions (
+  athlete_id INTEGER NOT NULL,
+  event_id INTEGER NOT NULL,
+  season_year INTEGER NOT NULL,
+  -- {"dates": ["2026-03-14", ...], "values": [...], "meets": [...], "best": [true, ...]}
+  -- oldest first (mark_date, id); best = better than every earlier mark (a running PR)
+  series JSONB NOT NULL,
+  marks_count INTEGER NOT NULL,
+  built_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  PRIMARY KEY (athlete_id, event_id, season_year),
+  FOREIGN KEY (athlete_id, event_id, season_year)
+    REFERENCES athlete_event_stats(athlete_id, event_id, season_year) ON DELETE CASCADE
+);
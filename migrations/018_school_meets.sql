@@ -0,0 +1,18 @@
+-- Meets each school has results from, per season (scraper/meets.py). Refreshed from marks and
+-- relay_results after each successful sync; sync_conference.py / sync_orchestrator.py
+-- --incremental only fetch schools with a meet dated since their last sync.
+-- After creating the table, fill it once:  python scraper/meets.py --refresh
+--
+--   psql "%DATABASE_URL%" -v ON_ERROR_STOP=1 -f migrations/018_school_meets.sql
+
+CREATE TABLE IF NOT EXISTS school_meets (
+  school_id INTEGER NOT NULL REFERENCES schools(id) ON DELETE CASCADE,
+  season_year INTEGER NOT NULL,
+  meet_name TEXT NOT NULL,       -- '' when the source had no meet name
+  meet_date DATE NOT NULL,
+  first_seen_run_id INTEGER REFERENCES scrape_runs(id) ON DELETE SET NULL,
+  first_seen_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  PRIMARY KEY (school_id, season_year, meet_name, meet_date)
+);
+
+CREATE INDEX IF NOT EXISTS idx_school_meets_season_date ON school_meets(season_year, meet_date);
@@ -0,0 +1,20 @@
+-- One row per shard of a sharded conference sync (scraper/shards.py): shards share one scrape run
+-- and each reports here; sync_conference.py --finalize marks the run complete only when every
+-- shard 1..shard_count has status 'success'.
+--
+--   psql "%DATABASE_URL%" -v ON_ERROR_STOP=1 -f migrations/019_scrape_run_shards.sql
+
+CREATE TABLE IF NOT EXISTS scrape_run_shards (
+  run_id INTEGER NOT NULL REFERENCES scrape_runs(id) ON DELETE CASCADE,
+  shard_index INTEGER NOT NULL,  -- 1-based
+  shard_count INTEGER NOT NULL,
+  status TEXT NOT NULL CHECK (status IN ('running', 'success', 'failed')),
+  schools INTEGER NOT NULL DEFAULT 0,            -- schools assigned to the shard
+  schools_processed INTEGER NOT NULL DEFAULT 0,
+  est_cost_ms BIGINT,                            -- summed fetch + parse estimate used to balance shards
+  started_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  finished_at TIMESTAMPTZ,
+  error_message TEXT,
+  PRIMARY KEY (run_id, shard_index),
+  CHECK (shard_index BETWEEN 1 AND shard_count)
+);
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+athlete_event_stats: per (athlete, event, season) PR value/date/meet, the last three marks
+(newest first), their average and date range, and the mark count, so both leaderboard modes
+read one indexed row per athlete instead of ranking every mark of the event on each request.
+
+The upsert path keeps it current: run.upsert_athletes_marks collects the (athlete, event,
+season) keys of every mark batch it writes and calls refresh_keys() before its commit, which
+recomputes only those keys with one set-based statement (rows whose values did not change are
+not rewritten). Dropping, archiving or detaching a season partition clears that season's rows
+(season_partitions.py) and re-attaching rebuilds them. Orderings match the leaderboard API:
+PR = best value by events.better_direction (latest date on ties), last three = newest by
+mark_date, then id.
+
+--rebuild recomputes every row from marks (migrations/015_athlete_event_stats.sql backfills once; use it after
+manual edits to marks); --check reports rows that differ from marks without writing.
+
+Usage (from project root; DATABASE_URL in .env.local):
+  python scraper/athlete_stats.py --rebuild [--season YEAR]
+  python scraper/athlete_stats.py --check [--season YEAR]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+
+if str(SCRIPT_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPT_DIR))
+
+_COLUMNS = (
+    "pr_value", "pr_date", "pr_meet_name", "last3_values", "last3_avg",
+    "last3_date_min", "last3_date_max", "marks_count",
+)
+
+# Stats for the keys produced by {keys} (athlete_id, event_id, season_year), computed from marks
+_COMPUTE = """
+WITH keys(athlete_id, event_id, season_year) AS ({keys}),
+ranked AS (
+  SELECT k.athlete_id, k.event_id, k.season_year, m.id, m.value, m.mark_date, m.meet_name,
+    ROW_NUMBER() OVER (
+      PARTITION BY k.athlete_id, k.event_id, k.season_year
+      ORDER BY
+        CASE WHEN e.better_direction = 'lower' THEN m.value END ASC NULLS LAST,
+        CASE WHEN e.better_direction = 'higher' THEN m.value END DESC NULLS LAST,
+        m.mark_date DESC NULLS LAST
+    ) AS best_rn,
+    ROW_NUMBER() OVER (
+      PARTITION BY k.athlete_id, k.event_id, k.season_year
+      ORDER BY m.mark_date DESC NULLS LAST, m.id DESC
+    ) AS recent_rn
+  FROM keys k
+  JOIN events e ON e.id = k.event_id
+  JOIN marks m ON m.athlete_id = k.athlete_id AND m.event_id = k.event_id
+    AND m.mark_date >= make_date(k.season_year, 1, 1) AND m.mark_date < make_date(k.season_year + 1, 1, 1)
+)
+SELECT athlete_id, event_id, season_year,
+  MAX(value) FILTER (WHERE best_rn = 1),
+  MAX(mark_date) FILTER (WHERE best_rn = 1),
+  MAX(meet_name) FILTER (WHERE best_rn = 1),
+  ARRAY_AGG(value ORDER BY recent_rn) FILTER (WHERE recent_rn <= 3),
+  AVG(value) FILTER (WHERE recent_rn <= 3),
+  MIN(mark_date) FILTER (WHERE recent_rn <= 3),
+  MAX(mark_date) FILTER (WHERE recent_rn <= 3),
+  COUNT(*)::int
+FROM ranked
+GROUP BY athlete_id, event_id, season_year
+"""
+
+_UPSERT = (
+    f"INSERT INTO athlete_event_stats (athlete_id, event_id, season_year, {', '.join(_COLUMNS)}) "
+    + _COMPUTE
+    + f"""ON CONFLICT (athlete_id, event_id, season_year) DO UPDATE SET
+  {', '.join(f'{c} = EXCLUDED.{c}' for c in _COLUMNS)}, updated_at = NOW()
+WHERE ({', '.join(f'athlete_event_stats.{c}' for c in _COLUMNS)})
+  IS DISTINCT FROM ({', '.join(f'EXCLUDED.{c}' for c in _COLUMNS)})"""
+)
+
+# Keys that no longer have marks in their season
+_DELETE_EMPTY = """
+DELETE FROM athlete_event_stats s
+USING (VALUES %s) AS k(athlete_id, event_id, season_year)
+WHERE s.athlete_id = k.athlete_id AND s.event_id = k.event_id AND s.season_year = k.season_year
+  AND NOT EXISTS (
+    SELECT 1 FROM marks m
+    WHERE m.athlete_id = k.athlete_id AND m.event_id = k.event_id
+      AND m.mark_date >= make_date(k.season_year, 1, 1) AND m.mark_date < make_date(k.season_year + 1, 1, 1)
+  )
+"""
+
+_ALL_KEYS = """
+SELECT DISTINCT athlete_id, event_id, EXTRACT(YEAR FROM mark_date)::int FROM marks
+WHERE mark_date IS NOT NULL {season_filter}
+"""
+
+
+def refresh_keys(cur, keys, page_size: int = 2000):
+    """Recompute athlete_event_stats for (athlete_id, event_id, season_year) keys; the caller commits."""
+    from psycopg2.extras import execute_values
+
+    keys = list(keys)
+    for i in range(0, len(keys), page_size):
+        page = keys[i : i + page_size]
+        execute_values(cur, _UPSERT.format(keys="VALUES %s"), page, template="(%s::int, %s::int, %s::int)", page_size=page_size)
+        execute_values(cur, _DELETE_EMPTY, page, template="(%s::int, %s::int, %s::int)", page_size=page_size)
+
+
+def clear_season(cur, season_year: int) -> int:
+    """Drop a season's rows (its marks left the marks table); the caller commits."""
+    cur.execute("DELETE FROM athlete_event_stats WHERE season_year = %s", (season_year,))
+    return cur.rowcount
+
+
+def rebuild(conn, season_year: int | None = None) -> tuple[int, int]:
+    """Recompute every row (or one season's) from marks. Returns (rows written, stale rows removed). Commits."""
+    season_filter = "AND mark_date >= make_date(%(season)s, 1, 1) AND mark_date < make_date(%(season)s + 1, 1, 1)"
+    params = {"season": season_year}
+    with conn.cursor() as cur:
+        keys = _ALL_KEYS.format(season_filter=season_filter if season_year else "")
+        cur.execute(_UPSERT.format(keys=keys), params)
+        written = cur.rowcount
+        cur.execute(
+            f"""DELETE FROM athlete_event_stats s
+                WHERE {'s.season_year = %(season)s AND' if season_year else ''} NOT EXISTS (
+                  SELECT 1 FROM marks m
+                  WHERE m.athlete_id = s.athlete_id AND m.event_id = s.event_id
+                    AND m.mark_date >= make_date(s.season_year, 1, 1)
+                    AND m.mark_date < make_date(s.season_year + 1, 1, 1))""",
+            params,
+        )
+        removed = cur.rowcount
+    conn.commit()
+    return written, removed
+
+
+def check(conn, season_year: int | None = None) -> int:
+    """Rows of athlete_event_stats that differ from what marks give (missing, stale or extra)."""
+    season_filter = "AND mark_date >= make_date(%(season)s, 1, 1) AND mark_date < make_date(%(season)s + 1, 1, 1)"
+    cols = ", ".join(("athlete_id", "event_id", "season_year", *_COLUMNS))
+    with conn.cursor() as cur:
+        cur.execute(
+            f"""WITH fresh({cols}) AS ({_COMPUTE.format(keys=_ALL_KEYS.format(season_filter=season_filter if season_year else ''))}),
+                     stored AS (SELECT {cols} FROM athlete_event_stats {'WHERE season_year = %(season)s' if season_year else ''})
+                SELECT count(*) FROM ((SELECT * FROM fresh EXCEPT SELECT * FROM stored)
+                                      UNION ALL (SELECT * FROM stored EXCEPT SELECT * FROM fresh)) d""",
+            {"season": season_year},
+        )
+        return cur.fetchone()[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild or check athlete_event_stats (PR and last-3 aggregates).")
+    action = parser.add_mutually_exclusive_group(required=True)
+    action.add_argument("--rebuild", action="store_true", help="recompute rows from marks")
+    action.add_argument("--check", action="store_true", help="count rows that differ from marks (no writes)")
+    parser.add_argument("--season", type=int, default=None, help="only this season year (default: all)")
+    args = parser.parse_args()
+
+    from run import get_db
+
+    conn = get_db()
+    try:
+        t0 = time.perf_counter()
+        scope = f"season {args.season}" if args.season else "all seasons"
+        if args.rebuild:
+            written, removed = rebuild(conn, args.season)
+            print(f"athlete_event_stats ({scope}): {written} row(s) written, {removed} stale row(s) removed "
+                  f"in {time.perf_counter() - t0:.1f}s.")
+        else:
+            diff = check(conn, args.season)
+            print(f"athlete_event_stats ({scope}): {diff} row(s) differ from marks.")
+            if diff:
+                print("Repair with: python scraper/athlete_stats.py --rebuild" + (f" --season {args.season}" if args.season else ""))
+                sys.exit(1)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
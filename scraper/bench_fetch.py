@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Measure fetch-engine throughput offline: start replay_server.py in-process over the saved
+fixtures (and/or HAR recordings), then fetch + parse every recorded team page through
+TieredFetcher the way sync_conference.py does. No database or network access needed, so the
+numbers are repeatable in CI.
+
+Team pages default to every team_summary_<team>_<year>.html in the fixtures dir; pass
+--team TEAM_ID:YEAR (repeatable) to pick specific ones. The browser tier only runs with
+--fetch-tier auto/browser and Playwright installed. A view that parses to no rows counts as
+failed, so a tier that returns the wrong tab cannot look fast.
+
+Usage (from project root):
+  python scraper/bench_fetch.py [--rounds 3] [--workers 1] [--fetch-tier http] [--latency-ms 150] [--error-rate 0.05]
+                                [--adaptive-rate [--min-interval SEC]]
+
+Example:
+  python scraper/bench_fetch.py --latency-ms 200 --jitter-ms 50 --rate-limit 5 --seed 1
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+if str(SCRIPT_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPT_DIR))
+
+
+def recorded_teams(fixtures_dir: str) -> list[tuple[str, int]]:
+    """(team_id, year) for every men-view fixture in fixtures_dir."""
+    from fetch_rendered_html import list_fixtures
+
+    return [(team_id, year) for _path, team_id, year, view in list_fixtures(fixtures_dir) if view == "men"]
+
+
+def parse_team_arg(text: str) -> tuple[str, int]:
+    team_id, _, year = text.partition(":")
+    try:
+        return team_id, int(year)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"team must be TEAM_ID:YEAR, got {text!r}")
+
+
+def main():
+    from replay_server import add_fault_arguments, start_in_thread, state_kwargs_from_args
+
+    parser = argparse.ArgumentParser(description="Benchmark team-page fetch + parse against the replay server.")
+    parser.add_argument("--team", action="append", type=parse_team_arg, default=[], help="TEAM_ID:YEAR to fetch (repeatable)")
+    parser.add_argument("--rounds", type=int, default=3, help="passes over the team list (default: 3)")
+    parser.add_argument("--workers", type=int, default=1, help="concurrent fetchers, HTTP tier only (default: 1)")
+    parser.add_argument("--fetch-tier", choices=("auto", "http", "browser"), default="http")
+    parser.add_argument("--attempts", type=int, default=3, help="tries per view (default: 3)")
+    parser.add_argument("--retry-delay", type=float, default=0.5, help="base backoff between tries in seconds (default: 0.5)")
+    parser.add_argument(
+        "--keep-conditional-cache",
+        action="store_true",
+        help="let later rounds revalidate with ETags (304s) instead of refetching full bodies",
+    )
+    parser.add_argument(
+        "--adaptive-rate",
+        action="store_true",
+        help="pace requests with the adaptive rate limiter (rate_limit.py) as the sync scripts do, "
+        "with --min-interval as its floor (default: unpaced)",
+    )
+    parser.add_argument("--min-interval", type=float, default=0.05, help="limiter floor with --adaptive-rate (default: 0.05)")
+    add_fault_arguments(parser)
+    args = parser.parse_args()
+
+    teams = args.team or recorded_teams(args.fixtures)
+    if not teams:
+        print(f"No team pages to fetch: save fixtures to {args.fixtures} or pass --team TEAM_ID:YEAR")
+        sys.exit(1)
+    if args.fetch_tier != "http" and args.workers > 1:
+        print("Playwright's sync API is single-threaded; using --workers 1 for browser tiers")
+        args.workers = 1
+
+    from rate_limit import configure, unpaced
+    from run import set_base_url, with_retries
+    from tiered_fetch import TieredFetcher
+
+    if args.adaptive_rate:
+        rate = configure(interval=args.min_interval, min_interval=args.min_interval, max_interval=5.0)
+    else:
+        rate = unpaced()
+
+    server, base_url = start_in_thread(**state_kwargs_from_args(args))
+    set_base_url(base_url)
+    steps = [(team_id, year, view) for team_id, year in teams for view in ("men", "women", "relays")]
+    view_genders = {"men": ("men",), "women": ("women",), "relays": ("men", "women")}
+    print(f"Replay server on {base_url}; {len(teams)} team page(s), {len(steps)} view(s) per round, {args.rounds} round(s)")
+
+    cache_dir = tempfile.mkdtemp(prefix="bench_http_cache_")
+    latencies, failures, empty = [], 0, 0
+    tier_counts = {"http": 0, "browser": 0}
+
+    def run_steps(chunk):
+        fetcher = TieredFetcher(mode=args.fetch_tier, cache_dir=cache_dir)
+        results = []
+        try:
+            for team_id, year, view in chunk:
+                t0 = time.perf_counter()
+                try:
+                    res = with_retries(
+                        lambda: fetcher.fetch(team_id, year, view, view_genders[view]),
+                        attempts=args.attempts,
+                        base_delay=args.retry_delay,
+                        on_retry=lambda _e, _a: fetcher.invalidate(),
+                    )
+                    if any(res.parsed.values()):
+                        results.append((time.perf_counter() - t0, res.tier))
+                    else:
+                        print(f"  {team_id} {year} {view}: nothing parsed ({res.tier})")
+                        results.append((None, "empty"))
+                except Exception as e:
+                    print(f"  {team_id} {year} {view}: failed ({e})")
+                    results.append((None, None))
+                # Each view is its own step in the sync scripts; don't share the cached page
+                fetcher.invalidate()
+        finally:
+            fetcher.close()
+        return results
+
+    started = time.perf_counter()
+    try:
+        for _ in range(args.rounds):
+            if not args.keep_conditional_cache:
+                for name in os.listdir(cache_dir):
+                    os.remove(os.path.join(cache_dir, name))
+            chunks = [steps[i :: args.workers] for i in range(args.workers)]
+            with ThreadPoolExecutor(max_workers=args.workers) as pool:
+                for results in pool.map(run_steps, chunks):
+                    for elapsed, tier in results:
+                        if elapsed is None:
+                            failures += 1
+                            empty += tier == "empty"
+                        else:
+                            latencies.append(elapsed)
+                            tier_counts[tier] += 1
+        wall = time.perf_counter() - started
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    done = len(latencies)
+    print(f"Views fetched: {done}, failed: {failures} ({empty} parsed empty), wall: {wall:.2f}s, throughput: {done / wall:.2f} views/s")
+    if latencies:
+        ms = sorted(x * 1000 for x in latencies)
+        p95 = ms[min(len(ms) - 1, int(round(0.95 * (len(ms) - 1))))]
+        print(f"Per view ms: median {statistics.median(ms):.0f}, p95 {p95:.0f}, max {ms[-1]:.0f}")
+    print(f"Fetch tiers: {tier_counts['http']} http, {tier_counts['browser']} browser")
+    print(rate.summary())
+    print("Server responses by status:", dict(sorted(server.state.counts.items())))
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Recompute conference benchmarks from the stored marks: per (conference, season, event, gender),
+the podium average (mean of the three best season bests), the best mark, the median and the
+90th-percentile season best (better than 90% of the conference's entrants), and the entrant count.
+
+Season bests come from one set-based query per conference (GROUP BY athlete, or school for
+relay_results, taking MIN or MAX by the event's better_direction); the per-group statistics are
+then computed for all groups at once with NumPy. Only rows whose values changed are written to
+benchmark_stats (migrations/014_benchmark_stats.sql), and groups that no longer have marks are
+deleted, so a refresh after a sync touches a handful of rows. sync_conference.py and
+sync_orchestrator.py run it for the synced (conference, season) after each successful run;
+/api/benchmarks serves the conference_podium_avg from here, falling back to the hand-filled
+benchmarks table.
+
+Usage (from project root; DATABASE_URL in .env.local):
+  python scraper/benchmark_stats.py [--conference-id 1] [--year YEAR | --all-seasons] [--dry-run]
+
+Example:
+  python scraper/benchmark_stats.py
+  python scraper/benchmark_stats.py --all-seasons
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+
+if str(SCRIPT_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPT_DIR))
+
+PODIUM = 3
+STATS = ("entrants", "best", "podium_avg", "median", "p90")
+
+# Season bests per athlete (marks) and per school (relay_results), one row each
+_SEASON_BESTS = """
+SELECT EXTRACT(YEAR FROM m.mark_date)::int, m.event_id, a.gender, e.better_direction = 'higher',
+       CASE WHEN e.better_direction = 'higher' THEN MAX(m.value) ELSE MIN(m.value) END
+FROM marks m
+JOIN athletes a ON a.id = m.athlete_id
+JOIN schools s ON s.id = a.school_id
+JOIN events e ON e.id = m.event_id
+WHERE s.conference_id = %(conference_id)s AND m.mark_date >= %(lo)s AND m.mark_date < %(hi)s
+GROUP BY 1, 2, 3, 4, a.id
+UNION ALL
+SELECT EXTRACT(YEAR FROM r.mark_date)::int, r.event_id, r.gender, e.better_direction = 'higher',
+       CASE WHEN e.better_direction = 'higher' THEN MAX(r.value) ELSE MIN(r.value) END
+FROM relay_results r
+JOIN schools s ON s.id = r.school_id
+JOIN events e ON e.id = r.event_id
+WHERE s.conference_id = %(conference_id)s AND r.mark_date >= %(lo)s AND r.mark_date < %(hi)s
+GROUP BY 1, 2, 3, 4, r.school_id
+"""
+
+
+def compute_stats(season, event_id, gender, higher, value) -> dict:
+    """
+    Season bests (parallel sequences; gender 'M'/'F', higher True where bigger is better) ->
+    {(season, event_id, gender): (entrants, best, podium_avg, median, p90)}, values rounded to 0.01.
+    """
+    import numpy as np
+
+    if len(value) == 0:
+        return {}
+    season = np.asarray(season, dtype=np.int64)
+    event_id = np.asarray(event_id, dtype=np.int64)
+    is_men = np.asarray([g == "M" for g in gender])
+    # Signed so that smaller is better for every event
+    signed = np.where(np.asarray(higher, dtype=bool), -1.0, 1.0) * np.asarray(value, dtype=np.float64)
+
+    order = np.lexsort((signed, is_men, event_id, season))
+    season, event_id, is_men, signed = season[order], event_id[order], is_men[order], signed[order]
+    new = np.r_[True, (season[1:] != season[:-1]) | (event_id[1:] != event_id[:-1]) | (is_men[1:] != is_men[:-1])]
+    starts = np.flatnonzero(new)
+    group = np.cumsum(new) - 1
+    counts = np.bincount(group)
+    rank = np.arange(len(signed)) - starts[group]
+
+    podium = rank < PODIUM
+    podium_avg = np.bincount(group, weights=signed * podium) / np.bincount(group, weights=podium)
+
+    def quantile(q):
+        # Linear interpolation between the sorted season bests of each group (q = 0 is the best)
+        pos = q * (counts - 1)
+        lo = np.floor(pos).astype(np.int64)
+        hi = np.minimum(lo + 1, counts - 1)
+        frac = pos - lo
+        return signed[starts + lo] * (1 - frac) + signed[starts + hi] * frac
+
+    sign = np.where(np.asarray(higher, dtype=bool)[order][starts], -1.0, 1.0)
+    columns = [signed[starts] * sign, podium_avg * sign, quantile(0.5) * sign, quantile(0.1) * sign]
+    out = {}
+    for i, start in enumerate(starts):
+        key = (int(season[start]), int(event_id[start]), "M" if is_men[start] else "F")
+        out[key] = (int(counts[i]), *(round(float(c[i]), 2) for c in columns))
+    return out
+
+
+def load_season_bests(conn, conference_id: int, first_season: int, last_season: int) -> dict:
+    from run import season_window
+
+    lo, _ = season_window(first_season)
+    _, hi = season_window(last_season)
+    with conn.cursor() as cur:
+        cur.execute(_SEASON_BESTS, {"conference_id": conference_id, "lo": lo, "hi": hi})
+        rows = cur.fetchall()
+    if not rows:
+        return {}
+    return compute_stats(*zip(*rows))
+
+
+def refresh_benchmark_stats(conn, conference_id: int, first_season: int, last_season: int | None = None,
+                            dry_run: bool = False) -> tuple[int, int]:
+    """
+    Bring benchmark_stats for the conference and seasons up to date, writing only changed rows.
+    Returns (rows upserted, rows deleted). Commits unless dry_run.
+    """
+    from psycopg2.extras import execute_values
+
+    last_season = last_season or first_season
+    fresh = load_season_bests(conn, conference_id, first_season, last_season)
+    with conn.cursor() as cur:
+        cur.execute(
+            f"""SELECT season_year, event_id, gender, {', '.join(STATS)} FROM benchmark_stats
+                WHERE conference_id = %s AND season_year BETWEEN %s AND %s""",
+            (conference_id, first_season, last_season),
+        )
+        current = {
+            (season, event_id, gender): (entrants, *(float(v) if v is not None else None for v in values))
+            for season, event_id, gender, entrants, *values in cur.fetchall()
+        }
+        changed = [(conference_id, *key, *stats) for key, stats in fresh.items() if current.get(key) != stats]
+        gone = [(conference_id, *key) for key in current if key not in fresh]
+        if dry_run:
+            conn.rollback()
+            return len(changed), len(gone)
+        if changed:
+            execute_values(
+                cur,
+                f"""INSERT INTO benchmark_stats (conference_id, season_year, event_id, gender, {', '.join(STATS)})
+                    VALUES %s
+                    ON CONFLICT (conference_id, season_year, event_id, gender) DO UPDATE SET
+                    {', '.join(f'{c} = EXCLUDED.{c}' for c in STATS)}, computed_at = NOW()""",
+                changed,
+            )
+        if gone:
+            execute_values(
+                cur,
+                """DELETE FROM benchmark_stats b USING (VALUES %s) AS g(conference_id, season_year, event_id, gender)
+                   WHERE b.conference_id = g.conference_id AND b.season_year = g.season_year
+                     AND b.event_id = g.event_id AND b.gender = g.gender""",
+                gone,
+            )
+    conn.commit()
+    return len(changed), len(gone)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recompute conference benchmarks (podium avg, percentiles) from marks.")
+    parser.add_argument("--conference-id", type=int, default=1, help="conference id (default: 1)")
+    parser.add_argument("--year", type=int, default=None, help="season year (default: the conference's season_year)")
+    parser.add_argument("--all-seasons", action="store_true", help="every season that has marks, up to --year")
+    parser.add_argument("--dry-run", action="store_true", help="report how many rows would change without writing")
+    args = parser.parse_args()
+
+    from run import fetch_conference_season_year, get_db
+
+    conn = get_db()
+    try:
+        year = args.year or fetch_conference_season_year(conn, args.conference_id)
+        if year is None:
+            print(f"Conference {args.conference_id} not found.")
+            sys.exit(1)
+        first = year
+        if args.all_seasons:
+            with conn.cursor() as cur:
+                cur.execute("SELECT EXTRACT(YEAR FROM MIN(mark_date))::int FROM marks")
+                first = min(cur.fetchone()[0] or year, year)
+        t0 = time.perf_counter()
+        upserted, deleted = refresh_benchmark_stats(conn, args.conference_id, first, year, args.dry_run)
+        seasons = f"{first}-{year}" if first != year else str(year)
+        verb = "would change" if args.dry_run else "changed"
+        print(
+            f"Benchmarks for conference {args.conference_id}, {seasons}: {upserted} row(s) {verb}, "
+            f"{deleted} removed ({(time.perf_counter() - t0) * 1000:.0f} ms)."
+        )
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
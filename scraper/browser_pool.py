@@ -0,0 +1,182 @@
+"""
+Warm Playwright browser contexts for fetching athletic.net team summaries.
+
+The Men / Women / Relays tabs share one URL and switch client-side, so a FetchSession loads each
+team page once (one Angular bootstrap) and reads every tab from that loaded app. Contexts are
+kept for the whole run, so the HTTP cache and service-worker storage carry over from school to
+school and the JS bundles are only downloaded once. With profile_dir they live in an on-disk
+Chromium profile and survive across runs too (e.g. cached between CI jobs).
+
+Usage:
+  with sync_playwright() as p:
+      pool = BrowserPool(p, size=1, profile_dir=None)
+      with pool.session() as session:
+          html = session.view_html(url, "women")
+      pool.close()
+"""
+import os
+from contextlib import contextmanager
+
+from fetch_rendered_html import load_team_page, switch_view
+
+USER_AGENT = "ConferenceLeaderboard/1.0 (school use)"
+# Not needed to render the team summary tables. Blocking is opt-in: Playwright serves routed
+# requests without the browser HTTP cache, so ctx.route("**/*") makes every JS bundle download again
+# on each page load, which costs more than the images it saves.
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font"}
+
+
+class FetchSession:
+    """One reusable page; remembers which team page is loaded and which tab is showing."""
+
+    def __init__(self, context):
+        self.context = context
+        self.page = context.pages[0] if context.pages else context.new_page()
+        self._url = None
+        self._view = None
+        self.page_loads = 0
+
+    def load(self, url: str):
+        load_team_page(self.page, url)
+        self._url = url
+        self._view = "men"
+        self.page_loads += 1
+
+    def view_html(self, url: str, view: str) -> str:
+        """Rendered HTML of one tab; only navigates when url is not the page already loaded."""
+        if self._url != url:
+            self.load(url)
+        if self._view != view:
+            switch_view(self.page, view)
+            self._view = view
+        return self.page.content()
+
+    def invalidate(self):
+        """Force a fresh navigation on the next view_html (e.g. after a failed step)."""
+        self._url = None
+        self._view = None
+
+
+def _har_options(record_har: str | None, index: int, size: int) -> dict:
+    """Playwright options to record context `index` to a HAR (written on close) for replay_server.py."""
+    if not record_har:
+        return {}
+    if size > 1:
+        root, ext = os.path.splitext(record_har)
+        record_har = f"{root}.{index}{ext or '.har'}"
+    os.makedirs(os.path.dirname(os.path.abspath(record_har)), exist_ok=True)
+    return {"record_har_path": record_har}
+
+
+class BrowserPool:
+    """
+    Fixed set of warm browser contexts, handed out round-robin by session().
+
+    Playwright's sync API is single-threaded, so callers use one session at a time; size > 1
+    only spreads work across independent caches/profiles. record_har saves every response
+    (documents, JS bundles, XHR) to a HAR file when the pool is closed. block_resources aborts
+    BLOCKED_RESOURCE_TYPES at the cost of the HTTP cache (see above).
+    """
+
+    def __init__(
+        self,
+        playwright,
+        size: int = 1,
+        profile_dir: str | None = None,
+        block_resources: bool = False,
+        record_har: str | None = None,
+    ):
+        self._browser = None
+        self._contexts = []
+        self._sessions = []
+        self._next = 0
+        options = {"user_agent": USER_AGENT, "service_workers": "allow"}
+        if profile_dir:
+            # Persistent contexts each need their own user-data dir
+            for i in range(max(size, 1)):
+                ctx_dir = os.path.join(profile_dir, f"ctx{i}")
+                os.makedirs(ctx_dir, exist_ok=True)
+                self._contexts.append(
+                    playwright.chromium.launch_persistent_context(
+                        ctx_dir, headless=True, **options, **_har_options(record_har, i, size)
+                    )
+                )
+        else:
+            self._browser = playwright.chromium.launch(headless=True)
+            for i in range(max(size, 1)):
+                self._contexts.append(self._browser.new_context(**options, **_har_options(record_har, i, size)))
+        for ctx in self._contexts:
+            if block_resources:
+                ctx.route(
+                    "**/*",
+                    lambda route: route.abort()
+                    if route.request.resource_type in BLOCKED_RESOURCE_TYPES
+                    else route.continue_(),
+                )
+            self._sessions.append(FetchSession(ctx))
+
+    @contextmanager
+    def session(self):
+        sess = self._sessions[self._next % len(self._sessions)]
+        self._next += 1
+        try:
+            yield sess
+        except Exception:
+            sess.invalidate()
+            raise
+
+    @property
+    def page_loads(self) -> int:
+        return sum(s.page_loads for s in self._sessions)
+
+    def invalidate_all(self):
+        for sess in self._sessions:
+            sess.invalidate()
+
+    def close(self):
+        for ctx in self._contexts:
+            try:
+                ctx.close()
+            except Exception:
+                pass
+        if self._browser:
+            self._browser.close()
+
+
+class LazyBrowserPool:
+    """BrowserPool that only starts Playwright and Chromium on the first session() call."""
+
+    def __init__(self, **pool_kwargs):
+        self._pool_kwargs = pool_kwargs
+        self._playwright = None
+        self._pool = None
+
+    @property
+    def started(self) -> bool:
+        return self._pool is not None
+
+    @contextmanager
+    def session(self):
+        if self._pool is None:
+            from playwright.sync_api import sync_playwright
+
+            self._playwright = sync_playwright().start()
+            self._pool = BrowserPool(self._playwright, **self._pool_kwargs)
+        with self._pool.session() as sess:
+            yield sess
+
+    @property
+    def page_loads(self) -> int:
+        return self._pool.page_loads if self._pool else 0
+
+    def invalidate_all(self):
+        if self._pool:
+            self._pool.invalidate_all()
+
+    def close(self):
+        if self._pool:
+            self._pool.close()
+            self._pool = None
+        if self._playwright:
+            self._playwright.stop()
+            self._playwright = None
@@ -0,0 +1,207 @@
+"""
+Change feed of what a sync changed: new personal records, new school bests and new entries into
+the leaderboard's top N, one event per (athlete, event) and kind.
+
+Incoming marks are compared in memory against the bests that were stored before the run: the
+first batch for a school/gender loads that school's PRs from athlete_event_stats (one indexed
+SELECT), and the top-N boards are loaded once per gender and season. The index is updated as
+marks arrive, so a run's later batches compare against its earlier ones and nothing rescans
+marks. Re-syncing marks that are already stored emits nothing (only strictly better values count).
+
+Kinds:
+  pr           athlete's best in the event for the season (previous_value NULL = first mark)
+  school_best  best in the event among the school's athletes for the season
+  top_n        athlete's best now ranks inside the top N of all schools (rank given)
+
+Events are written by flush(): to mark_events (migrations/016_mark_events.sql) and/or appended to
+scraper/.change_feed/run_<run_id>.jsonl, depending on the sink (both, db, jsonl, off).
+
+Usage:
+  feed = ChangeFeed(sink="both", run_id=run_id)
+  upsert_view(conn, school_id, view, gender, rows, season, quarantine=q, feed=feed)  # flushes before its commit
+
+The sync scripts take --change-feed both|db|jsonl|off and --top-n (add_feed_arguments). To look at a run:
+  SELECT kind, count(*) FROM mark_events WHERE run_id = 42 GROUP BY 1;
+"""
+import json
+import os
+from bisect import insort
+from collections import Counter
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+CHANGE_FEED_DIR = os.path.join(SCRIPT_DIR, ".change_feed")
+SINKS = ("both", "db", "jsonl", "off")
+KINDS = ("pr", "school_best", "top_n")
+DEFAULT_TOP_N = 10
+
+# (kind, athlete_id, school_id, event_id, gender, season_year, value, previous_value, rank, mark_date, meet_name)
+_FIELDS = (
+    "kind", "athlete_id", "school_id", "event_id", "gender", "season_year",
+    "value", "previous_value", "rank", "mark_date", "meet_name",
+)
+
+
+def add_feed_arguments(parser):
+    parser.add_argument(
+        "--change-feed",
+        choices=SINKS,
+        default="both",
+        help="where new PRs / school bests / top-N entries go: mark_events and scraper/.change_feed/run_<id>.jsonl "
+        "(both, default), one of them, or off",
+    )
+    parser.add_argument(
+        "--top-n",
+        type=int,
+        default=DEFAULT_TOP_N,
+        help=f"leaderboard places that count as a top-N entry in the change feed (default: {DEFAULT_TOP_N})",
+    )
+
+
+class ChangeFeed:
+    """In-memory index of stored bests plus the events found in this run; counts holds written events per kind."""
+
+    def __init__(self, sink: str = "both", run_id: int | None = None, top_n: int = DEFAULT_TOP_N,
+                 directory: str = CHANGE_FEED_DIR):
+        if sink not in SINKS:
+            raise ValueError(f"sink must be one of {SINKS}")
+        self.sink = sink
+        self.run_id = run_id
+        self.top_n = top_n
+        self.directory = directory
+        self.counts = Counter()
+        self._events = []
+        self._reset_index()
+
+    def _reset_index(self):
+        self._higher = None  # event_id -> True when bigger is better
+        self._loaded = set()  # (school_id, gender, season) whose stored PRs are in the index
+        self._best = {}  # (athlete_id, event_id, season) -> value
+        self._school_best = {}  # (school_id, gender, event_id, season) -> value (events are shared by both genders)
+        self._boards = {}  # (gender, season) -> {event_id: sorted [(signed value, athlete_id)]} (top N)
+
+    @property
+    def enabled(self) -> bool:
+        return self.sink != "off"
+
+    def _signed(self, event_id, value) -> float:
+        return -float(value) if self._higher.get(event_id) else float(value)
+
+    def _load(self, cur, school_id: int, gender: str, season_year: int):
+        if self._higher is None:
+            cur.execute("SELECT id, better_direction = 'higher' FROM events")
+            self._higher = dict(cur.fetchall())
+        if (school_id, gender, season_year) not in self._loaded:
+            self._loaded.add((school_id, gender, season_year))
+            cur.execute(
+                """SELECT st.athlete_id, st.event_id, st.pr_value FROM athlete_event_stats st
+                   JOIN athletes a ON a.id = st.athlete_id
+                   WHERE a.school_id = %s AND a.gender = %s AND st.season_year = %s""",
+                (school_id, gender, season_year),
+            )
+            for athlete_id, event_id, value in cur.fetchall():
+                self._best[(athlete_id, event_id, season_year)] = value
+                key = (school_id, gender, event_id, season_year)
+                if key not in self._school_best or self._signed(event_id, value) < self._signed(event_id, self._school_best[key]):
+                    self._school_best[key] = value
+        if (gender, season_year) not in self._boards:
+            cur.execute(
+                """SELECT event_id, athlete_id, pr_value FROM (
+                     SELECT st.event_id, st.athlete_id, st.pr_value,
+                       ROW_NUMBER() OVER (
+                         PARTITION BY st.event_id
+                         ORDER BY CASE WHEN e.better_direction = 'lower' THEN st.pr_value END ASC NULLS LAST,
+                                  CASE WHEN e.better_direction = 'higher' THEN st.pr_value END DESC NULLS LAST
+                       ) AS rn
+                     FROM athlete_event_stats st
+                     JOIN athletes a ON a.id = st.athlete_id
+                     JOIN events e ON e.id = st.event_id
+                     WHERE a.gender = %s AND st.season_year = %s
+                   ) t WHERE rn <= %s""",
+                (gender, season_year, self.top_n),
+            )
+            boards = {}
+            for event_id, athlete_id, value in cur.fetchall():
+                insort(boards.setdefault(event_id, []), (self._signed(event_id, value), athlete_id))
+            self._boards[(gender, season_year)] = boards
+
+    def observe(self, cur, school_id: int, gender: str, marks):
+        """
+        Compare written marks [(athlete_id, event_id, mark_date, value, meet_name)] of one school and
+        gender ('M'/'F') with the index, record new events and update the index.
+        """
+        if not self.enabled:
+            return
+        best_in_batch = {}
+        for athlete_id, event_id, mark_date, value, meet_name in marks:
+            season = mark_date.year
+            self._load(cur, school_id, gender, season)
+            key = (athlete_id, event_id, season)
+            current = best_in_batch.get(key)
+            if current is None or self._signed(event_id, value) < self._signed(event_id, current[0]):
+                best_in_batch[key] = (value, mark_date, meet_name)
+        for (athlete_id, event_id, season), (value, mark_date, meet_name) in sorted(best_in_batch.items()):
+            signed = self._signed(event_id, value)
+            previous = self._best.get((athlete_id, event_id, season))
+            if previous is not None and signed >= self._signed(event_id, previous):
+                continue
+            self._best[(athlete_id, event_id, season)] = value
+            common = (athlete_id, school_id, event_id, gender, season, value)
+            self._events.append(("pr", *common, previous, None, mark_date, meet_name))
+
+            school_key = (school_id, gender, event_id, season)
+            school_prev = self._school_best.get(school_key)
+            if school_prev is None or signed < self._signed(event_id, school_prev):
+                self._school_best[school_key] = value
+                self._events.append(("school_best", *common, school_prev, None, mark_date, meet_name))
+
+            board = self._boards[(gender, season)].setdefault(event_id, [])
+            was_on_board = any(a == athlete_id for _s, a in board)
+            board[:] = [entry for entry in board if entry[1] != athlete_id]
+            insort(board, (signed, athlete_id))
+            del board[self.top_n :]
+            rank = next((i for i, (_s, a) in enumerate(board, start=1) if a == athlete_id), None)
+            if rank is not None and not was_on_board:
+                self._events.append(("top_n", *common, previous, rank, mark_date, meet_name))
+
+    def pending(self) -> int:
+        return len(self._events)
+
+    def discard(self):
+        """Drop unflushed events and the index (the step's transaction was rolled back and will be retried)."""
+        self._events.clear()
+        self._reset_index()
+
+    def flush(self, conn=None) -> int:
+        """Write collected events (db: on conn, caller commits). Returns the number written."""
+        events, self._events = self._events, []
+        if not events or not self.enabled:
+            return 0
+        self.counts.update(event[0] for event in events)
+        if self.sink in ("both", "db"):
+            from psycopg2.extras import execute_values
+
+            with conn.cursor() as cur:
+                execute_values(
+                    cur,
+                    f"INSERT INTO mark_events (run_id, {', '.join(_FIELDS)}) VALUES %s",
+                    [(self.run_id, *event) for event in events],
+                    page_size=1000,
+                )
+        if self.sink in ("both", "jsonl"):
+            os.makedirs(self.directory, exist_ok=True)
+            path = os.path.join(self.directory, f"run_{self.run_id if self.run_id is not None else 'local'}.jsonl")
+            with open(path, "a", encoding="utf-8") as f:
+                for event in events:
+                    rec = {"run_id": self.run_id, **dict(zip(_FIELDS, event))}
+                    for field in ("value", "previous_value"):
+                        if rec[field] is not None:
+                            rec[field] = float(rec[field])
+                    if rec["mark_date"] is not None:
+                        rec["mark_date"] = rec["mark_date"].isoformat()
+                    f.write(json.dumps(rec, separators=(",", ":")) + "\n")
+        return len(events)
+
+
+def format_counts(counts) -> str:
+    """'pr 12, school_best 3, top_n 2' (in KINDS order, kinds without events left out)."""
+    return ", ".join(f"{kind} {counts[kind]}" for kind in KINDS if counts[kind])
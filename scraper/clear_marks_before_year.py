@@ -5,9 +5,16 @@ Remove marks dated before Jan 1 of the given season year, then delete athletes w
 Default year=2026 removes 2025-and-earlier meet dates from Neon so the leaderboard reflects
 the current outdoor season after you re-sync with --year 2026.
 
+On a season-partitioned marks table (migrations/007_partition_marks_by_season.sql), whole
+seasons before the cutoff are dropped as partitions (or archived with --archive) instead of
+deleted row by row; the DELETE then only touches undated/default-partition leftovers.
+Athletes are not pruned with --archive; without it, athletes still referenced by a partition
+archived or detached in an earlier run are kept (their marks would cascade away with them).
+
 Usage (from project root; DATABASE_URL in .env / .env.local):
   python scraper/clear_marks_before_year.py
   python scraper/clear_marks_before_year.py --year 2026
+  python scraper/clear_marks_before_year.py --year 2026 --archive
 """
 import argparse
 import sys
@@ -26,6 +33,13 @@ except ImportError:
     pass
 
 from run import get_db  # noqa: E402
+from season_partitions import (  # noqa: E402
+    archive_season_partition,
+    drop_season_partition,
+    list_partitions,
+    partition_name,
+    prune_orphan_athletes,
+)
 
 
 def main():
@@ -36,23 +50,40 @@ def main():
         default=2026,
         help="Keep marks with mark_date on or after Jan 1 of this year (default: 2026)",
     )
+    parser.add_argument(
+        "--archive",
+        action="store_true",
+        help="archive older season partitions instead of dropping them (keeps athletes)",
+    )
     args = parser.parse_args()
     cutoff = f"{args.year}-01-01"
 
     conn = get_db()
     try:
+        for y, _schema, attached, _rows in list_partitions(conn):
+            if not attached or y >= args.year:
+                continue
+            if args.archive:
+                archive_season_partition(conn, y)
+                print(f"Archived partition {partition_name(y)}.")
+            else:
+                drop_season_partition(conn, y)
+                print(f"Dropped partition {partition_name(y)}.")
         with conn.cursor() as cur:
             cur.execute(
                 "DELETE FROM marks WHERE mark_date IS NOT NULL AND mark_date < %s::date",
                 (cutoff,),
             )
             deleted_marks = cur.rowcount
-            cur.execute(
-                "DELETE FROM athletes a WHERE NOT EXISTS (SELECT 1 FROM marks m WHERE m.athlete_id = a.id)"
-            )
-            deleted_athletes = cur.rowcount
+            cur.execute("DELETE FROM athlete_event_stats WHERE season_year < %s", (args.year,))
+            deleted_relays = deleted_athletes = 0
+            if not args.archive:
+                cur.execute("DELETE FROM relay_results WHERE mark_date < %s::date", (cutoff,))
+                deleted_relays = cur.rowcount
         conn.commit()
-        print(f"Deleted {deleted_marks} mark(s) with mark_date before {cutoff}.")
+        if not args.archive:
+            deleted_athletes = prune_orphan_athletes(conn)
+        print(f"Deleted {deleted_marks} mark(s) and {deleted_relays} relay result(s) dated before {cutoff}.")
         print(f"Deleted {deleted_athletes} athlete row(s) with no marks remaining.")
         print("Re-sync 2026 data if needed: python scraper/sync_conference.py --year 2026")
     finally:
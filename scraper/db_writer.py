@@ -0,0 +1,163 @@
+"""
+Background DB writer for the sync scripts: parsed views are written on a second connection in a
+worker thread while the main thread fetches and parses the next team page.
+
+The sync loop submits one SchoolWrite per team page (every fetched view of it); the worker writes
+it with the same upsert functions and SQL as the inline path (run.upsert_view with commit=False,
+so conflict handling is unchanged), records fetch stats and step checkpoints, flushes the
+quarantine and change feed, and commits once per school. The queue is bounded: when the writer
+falls behind, submit() blocks the fetch loop until a slot frees (the time spent waiting is
+reported), so parsed pages never pile up in memory.
+
+A write that fails is retried with backoff on a rolled-back (or reconnected) connection; if it
+still fails the school is reported and its steps stay un-checkpointed for --resume.
+
+Usage:
+  writer = BackgroundWriter(get_db, quarantine=q, feed=feed, maxsize=2)
+  writer.submit(SchoolWrite(name, school_ids, season, run_id, [(view, loads, fetch_result), ...]))
+  writer.close()  # drains the queue; writer.failed counts schools not written
+
+This is not pipelined: psycopg2 has no pipeline mode, so the worker still waits for one
+round-trip per statement (the batched execute_values upserts, checkpoints, stats) exactly as
+the inline path does. What it buys is overlap: those round-trips run while the main thread is
+fetching and parsing the next page. An asyncio driver (asyncpg, psycopg3 pipelines) would not
+fit the Playwright sync API the fetch loop drives.
+"""
+import queue
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+
+
+@dataclass
+class SchoolWrite:
+    """Everything fetched for one team page: [(view, [(label, gender)], tiered_fetch.FetchResult)]."""
+
+    label: str
+    school_ids: list
+    season_year: int
+    run_id: int | None
+    views: list = field(default_factory=list)
+
+
+def write_school(conn, job: SchoolWrite, quarantine=None, feed=None):
+    """Upsert every view of job for each school id, checkpoint the steps and commit once."""
+    from run import record_fetch_stat, record_step, upsert_view
+    from validate import format_rejections
+
+    prefix = f"{job.label} " if job.label else ""
+    lines = []
+    for view, loads, result in job.views:
+        for label, g in loads:
+            rows = result.parsed.get(g) or []
+            if quarantine is not None:
+                for school_id in job.school_ids:
+                    quarantine.add_parse_rejects(list(result.rejects.get(g, ())), school_id, g, job.season_year)
+            if rows:
+                rejected = Counter()  # summed over the school ids sharing this team page
+                for school_id in job.school_ids:
+                    rejected.update(
+                        upsert_view(
+                            conn, school_id, view, g, rows, job.season_year, quarantine=quarantine, feed=feed, commit=False
+                        )
+                    )
+                kind = "relay results" if view == "relays" else "athletes"
+                dropped = format_rejections(rejected)
+                lines.append(f"  {prefix}{label}: {len(rows)} {kind} ({result.tier})" + (f"; rejected {dropped}" if dropped else ""))
+        for school_id in job.school_ids:
+            record_fetch_stat(
+                conn, job.run_id, school_id, job.season_year, view, result.tier, result.fetch_ms, result.parse_ms
+            )
+            if job.run_id is not None:
+                record_step(conn, job.run_id, school_id, job.season_year, view)
+    if quarantine is not None:
+        quarantine.flush(conn)
+    if feed is not None:
+        feed.flush(conn)
+    conn.commit()
+    for line in lines:
+        print(line)
+
+
+class BackgroundWriter:
+    """One worker thread and connection; submit() blocks while maxsize jobs are waiting."""
+
+    def __init__(self, connect, quarantine=None, feed=None, maxsize: int = 2, attempts: int = 3):
+        self._connect = connect
+        self.quarantine = quarantine
+        self.feed = feed
+        self.attempts = attempts
+        self.written = self.failed = 0
+        self.wait_sec = 0.0  # time the fetch loop spent blocked on a full queue
+        self._queue = queue.Queue(maxsize=max(1, maxsize))
+        self._conn = None
+        self.error = None  # set if the worker itself stopped (e.g. could not reconnect)
+        self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+        self._thread.start()
+
+    def _put(self, item) -> bool:
+        """Queue item, blocking while the queue is full; False if the worker has stopped."""
+        while self._thread.is_alive():
+            try:
+                self._queue.put(item, timeout=1.0)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def submit(self, job: SchoolWrite):
+        t0 = time.perf_counter()
+        if not self._put(job):
+            raise RuntimeError(f"DB writer stopped: {self.error}")
+        self.wait_sec += time.perf_counter() - t0
+
+    def close(self):
+        """Write everything still queued, then stop the worker and close its connection."""
+        if self._put(None):
+            self._thread.join()
+
+    def _reset(self, *_args):
+        """Roll back a failed write (reconnect if the connection is gone) and drop its unflushed rows."""
+        try:
+            self._conn.rollback()
+        except Exception:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+            self._conn = self._connect()
+        if self.quarantine is not None:
+            self.quarantine.discard()
+        if self.feed is not None:
+            self.feed.discard()
+
+    def _run(self):
+        from run import with_retries
+
+        try:
+            self._conn = self._connect()
+            while True:
+                job = self._queue.get()
+                if job is None:
+                    break
+                try:
+                    with_retries(
+                        lambda: write_school(self._conn, job, self.quarantine, self.feed),
+                        attempts=self.attempts,
+                        on_retry=self._reset,
+                    )
+                    self.written += 1
+                except Exception as e:
+                    self.failed += 1
+                    print(f"  Warning: writing {job.label} failed after {self.attempts} attempt(s): {e}")
+                    self._reset()
+        except Exception as e:
+            self.error = e
+            print(f"  Warning: DB writer stopped: {e}")
+        finally:
+            if self._conn is not None:
+                try:
+                    self._conn.close()
+                except Exception:
+                    pass
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Parser diagnostics over saved team-summary fixtures, in one pass.
+
+Each fixture is parsed once (in parallel across processes, and cached by parse_cache.py) into a small summary: athletes or
+relay runs per gender, marks per event slug, every event label seen with its slug, and the
+cells the parser skipped. All reports are built from those summaries:
+
+  coverage   per school and gender: athletes, marks, and counts for the --focus events
+  labels     event-header labels that map to no slug (--verbose: every label and its slug)
+  events     per event: marks, athletes and schools per gender, plus skipped cells by reason
+
+Fixtures are the saved views in scraper/fixtures (team_summary_<team>_<year>[_women|_relays].html)
+for --year, or the files given on the command line. Each is parsed for the season in its
+file name unless --season-year is given.
+
+Usage (from project root; DATABASE_URL in .env.local only for --school-names):
+  python scraper/diagnostics.py [PATH ...] [--year YEAR] [--season-year YEAR] [--report coverage|labels|events]
+                                [--focus SLUG ...] [--workers N] [--school-names] [--verbose]
+
+Example:
+  python scraper/diagnostics.py --year 2026
+  python scraper/diagnostics.py --report labels scraper/fixtures/team_summary_12207_2026_women.html
+  python scraper/diagnostics.py --report coverage --focus 1600m --focus sp --school-names
+"""
+import argparse
+import os
+import sys
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+try:
+    from dotenv import load_dotenv
+    load_dotenv(PROJECT_ROOT / ".env")
+    load_dotenv(PROJECT_ROOT / ".env.local", override=True)
+except ImportError:
+    pass
+
+if str(SCRIPT_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPT_DIR))
+
+REPORTS = ("coverage", "labels", "events")
+
+# Events that have gone missing for non-Liberty schools before (throws, 1600m, hurdles, relays)
+FOCUS_SLUGS = ("100m", "800m", "1600m", "100h", "110h", "hj", "sp", "discus", "4x100")
+
+# Genders parsed from each saved view (the Relays tab holds both)
+VIEW_GENDERS = {"men": ("men",), "women": ("women",), "relays": ("men", "women")}
+
+
+def _event_labels(block) -> list[str]:
+    """Event-header labels in one athlete block, whitespace-collapsed as the parser reads them."""
+    labels = []
+    for eh in block.find_all("div", class_=lambda c: c and "event-header" in (c or "").split()):
+        label = " ".join((eh.get_text() or "").split())
+        if label:
+            labels.append(label)
+    return labels
+
+
+def summarize_fixture(path: str, team_id: str, year: int, view: str, season_year: int | None = None) -> dict:
+    """
+    Parse one saved view (one BeautifulSoup build for all genders and reports) into a picklable
+    summary: {"genders": {gender: {"rows", "marks", "athletes_by_slug", "rejects"}}, "labels", ...}.
+    Summaries are kept in parse_cache.py (keyed on this module's source too), so unchanged
+    fixtures are not parsed again.
+    """
+    from parse_cache import default_cache, html_digest, source_hash
+
+    season_year = season_year or year
+    t0 = time.perf_counter()
+    with open(path, encoding="utf-8") as f:
+        html = f.read()
+    cache = default_cache()
+    key = cache.key(html_digest(html), "diagnostics", source_hash("diagnostics.py"), view, season_year) if cache else None
+    summary = cache.get(key) if cache else None
+    if summary is None:
+        summary = _summarize_html(html, view, season_year)
+        if cache:
+            cache.put(key, summary)
+        summary["cached"] = False
+    else:
+        summary["cached"] = True
+    summary.update(path=path, team_id=team_id, year=year, view=view, parse_ms=(time.perf_counter() - t0) * 1000)
+    return summary
+
+
+def _summarize_html(html: str, view: str, season_year: int) -> dict:
+    from bs4 import BeautifulSoup
+
+    from run import _is_athlete_block, _parse_athlete_block, _parse_athletic_net_relays, parse_view
+
+    soup = BeautifulSoup(html, "lxml")
+    labels = Counter()
+    genders = {}
+    for gender in VIEW_GENDERS[view]:
+        rejects = []
+        marks = Counter()
+        athletes_by_slug = Counter()
+        if view == "relays":
+            rows = _parse_athletic_net_relays(soup, gender, season_year, rejects)
+            for slug, *_rest in rows:
+                marks[slug] += 1
+        else:
+            rows = []
+            for block in soup.find_all(_is_athlete_block):
+                labels.update(_event_labels(block))
+                parsed = _parse_athlete_block(block, season_year, rejects)
+                if parsed:
+                    rows.append(parsed)
+            if not rows:
+                # Single-table layout (no athlete blocks): same fallback as parse_team_summary
+                rows = parse_view(html, view, gender, season_year, rejects)
+            for _name, _grade, events_marks in rows:
+                slugs = [item[0] for item in events_marks]
+                marks.update(slugs)
+                athletes_by_slug.update(set(slugs))
+        genders[gender] = {
+            "rows": len(rows),
+            "marks": marks,
+            "athletes_by_slug": athletes_by_slug,
+            "rejects": Counter(reason for reason, *_rest in rejects),
+        }
+    return {"genders": genders, "labels": labels}
+
+
+def summarize_all(fixtures, season_year: int | None = None, workers: int | None = None) -> list[dict]:
+    """summarize_fixture for each (path, team_id, year, view), in fixture order."""
+    jobs = [(path, team_id, year, view, season_year) for path, team_id, year, view in fixtures]
+    if (workers or os.cpu_count() or 1) <= 1 or len(jobs) <= 1:
+        return [summarize_fixture(*job) for job in jobs]
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(summarize_fixture, *zip(*jobs)))
+
+
+def school_names() -> dict:
+    """{athletic_net_team_id: school name} from the schools table."""
+    from run import get_db
+
+    conn = get_db()
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT athletic_net_team_id, name FROM schools")
+            return {str(team_id): name for team_id, name in cur.fetchall()}
+    finally:
+        conn.close()
+
+
+def _by_team_gender(summaries) -> dict:
+    """{(year, gender): {team_id: merged gender summary}}: a team's individual and relay views combined."""
+    merged = defaultdict(dict)
+    for s in summaries:
+        for gender, g in s["genders"].items():
+            team = merged[(s["year"], gender)].setdefault(
+                s["team_id"], {"athletes": 0, "relays": 0, "marks": Counter(), "athletes_by_slug": Counter()}
+            )
+            team["relays" if s["view"] == "relays" else "athletes"] += g["rows"]
+            team["marks"].update(g["marks"])
+            team["athletes_by_slug"].update(g["athletes_by_slug"])
+    return merged
+
+
+def report_coverage(summaries, focus, names: dict, verbose: bool = False):
+    for (year, gender), teams in sorted(_by_team_gender(summaries).items()):
+        print(f"=== Event coverage: {gender}, {year} ===")
+        width = max([len(names.get(t, t)) for t in teams] + [6])
+        print(f"{'school':<{width}} {'athl':>5} {'marks':>6}  " + " ".join(f"{slug:>6}" for slug in focus))
+        for team_id, team in sorted(teams.items(), key=lambda kv: names.get(kv[0], kv[0])):
+            counts = [team["marks"].get(slug, 0) for slug in focus]
+            missing = [slug for slug, n in zip(focus, counts) if not n]
+            print(
+                f"{names.get(team_id, team_id):<{width}} {team['athletes']:>5} {sum(team['marks'].values()):>6}  "
+                + " ".join(f"{n if n else '-':>6}" for n in counts)
+                + (f"   missing: {', '.join(missing)}" if missing else "")
+            )
+            if verbose:
+                print(f"{'':<{width}}   all events: {', '.join(sorted(team['marks']))}")
+        print()
+
+
+def report_labels(summaries, verbose: bool = False):
+    from run import _event_label_to_slug
+
+    labels = Counter()
+    seen_in = defaultdict(list)
+    for s in summaries:
+        labels.update(s["labels"])
+        for label in s["labels"]:
+            seen_in[label].append(os.path.basename(s["path"]))
+    unmapped = [(label, n) for label, n in labels.most_common() if _event_label_to_slug(label) is None]
+    print(f"=== Event labels: {len(labels)} distinct, {len(unmapped)} unmapped ===")
+    for label, n in unmapped:
+        files = seen_in[label]
+        print(f"  {n:4d}x  {label!r} -> UNMAPPED  ({len(files)} fixture(s), e.g. {files[0]})")
+    if verbose:
+        print("Mapped:")
+        for label, n in labels.most_common():
+            slug = _event_label_to_slug(label)
+            if slug:
+                print(f"  {n:4d}x  {label!r} -> {slug}")
+    print()
+
+
+def report_events(summaries):
+    for (year, gender), teams in sorted(_by_team_gender(summaries).items()):
+        marks, athletes, schools = Counter(), Counter(), Counter()
+        for team in teams.values():
+            marks.update(team["marks"])
+            athletes.update(team["athletes_by_slug"])
+            schools.update(set(team["marks"]))
+        print(f"=== Marks per event: {gender}, {year} ({len(teams)} school(s)) ===")
+        print(f"  {'event':<10} {'marks':>6} {'athletes':>9} {'schools':>8}")
+        for slug, n in sorted(marks.items()):
+            print(f"  {slug:<10} {n:>6} {athletes.get(slug, '-'):>9} {schools[slug]:>8}")
+        print()
+    rejects = Counter()
+    for s in summaries:
+        for g in s["genders"].values():
+            rejects.update(g["rejects"])
+    if rejects:
+        print("Skipped cells: " + ", ".join(f"{reason} {n}" for reason, n in rejects.most_common()))
+        print()
+
+
+def main(argv=None):
+    from fetch_rendered_html import FIXTURES_DIR, fixture_info, list_fixtures
+    from run import DEFAULT_SEASON_YEAR
+
+    parser = argparse.ArgumentParser(description="Parse saved fixtures once and report parser coverage.")
+    parser.add_argument("paths", nargs="*", help="fixture files (default: every saved view in --fixtures)")
+    parser.add_argument("--fixtures", default=FIXTURES_DIR, help="saved team-summary HTML directory")
+    parser.add_argument("--year", type=int, default=None, help="only fixtures for this season year (default: all)")
+    parser.add_argument(
+        "--season-year",
+        type=int,
+        default=None,
+        help="season to parse marks for (default: the year in each fixture's file name)",
+    )
+    parser.add_argument(
+        "--report",
+        action="append",
+        choices=REPORTS,
+        default=None,
+        help="report to print (repeatable; default: all)",
+    )
+    parser.add_argument("--focus", action="append", default=None, help=f"coverage events (repeatable; default: {' '.join(FOCUS_SLUGS)})")
+    parser.add_argument("--workers", type=int, default=None, help="parser processes (default: CPU count)")
+    parser.add_argument("--school-names", action="store_true", help="label teams with school names from the database")
+    parser.add_argument("--verbose", "-v", action="store_true", help="list every event per school and every mapped label")
+    args = parser.parse_args(argv)
+
+    if args.paths:
+        fixtures = []
+        for path in args.paths:
+            if not os.path.isfile(path):
+                print(f"File not found: {path}")
+                sys.exit(1)
+            team_id, year, view = fixture_info(path) or (
+                Path(path).stem, args.year or args.season_year or DEFAULT_SEASON_YEAR, "men"
+            )
+            fixtures.append((path, team_id, year, view))
+    else:
+        fixtures = list_fixtures(args.fixtures, args.year)
+    if not fixtures:
+        print(f"No fixtures found in {args.fixtures}. Save some with sync_school.py or fetch_rendered_html.py.")
+        sys.exit(1)
+
+    t0 = time.perf_counter()
+    summaries = summarize_all(fixtures, args.season_year, args.workers)
+    wall = time.perf_counter() - t0
+    names = school_names() if args.school_names else {}
+
+    reports = args.report or REPORTS
+    if "coverage" in reports:
+        report_coverage(summaries, args.focus or FOCUS_SLUGS, names, args.verbose)
+    if "labels" in reports:
+        report_labels(summaries, args.verbose)
+    if "events" in reports:
+        report_events(summaries)
+    parse_ms = sum(s["parse_ms"] for s in summaries)
+    cached = sum(s["cached"] for s in summaries)
+    print(
+        f"Read {len(summaries)} fixture(s) ({cached} from the parse cache): "
+        f"{parse_ms:.0f} ms of parsing in {wall * 1000:.0f} ms wall."
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -13,42 +13,93 @@ Usage:
 Requires: pip install playwright && python -m playwright install chromium
 """
 import os
+import re
 import sys
+import time
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 FIXTURES_DIR = os.path.join(SCRIPT_DIR, "fixtures")
 os.makedirs(FIXTURES_DIR, exist_ok=True)
 
-def fetch_one(page, url: str, view: str, team_id: str, year: str) -> tuple[str, str]:
-    """Load url, optionally switch to Women or Relays tab, return (html, output_path)."""
-    page.goto(url, wait_until="domcontentloaded", timeout=60000)
-    try:
-        page.wait_for_selector("table, [class*='table'], .athlete", timeout=15000)
-    except Exception:
-        page.wait_for_timeout(3000)
-    if view == "women":
-        try:
-            page.locator("a.nav-link").filter(has_text="Women").first.click(timeout=5000)
-            page.wait_for_timeout(2000)
-            page.wait_for_selector(".athlete", timeout=10000)
-        except Exception as e:
-            print(f"Warning: could not switch to Women tab: {e}")
-    elif view == "relays":
-        try:
-            page.locator("a.nav-link").filter(has_text="Relays").first.click(timeout=5000)
-            page.wait_for_timeout(2000)
-            page.wait_for_selector("table, .athlete", timeout=10000)
-        except Exception as e:
-            print(f"Warning: could not switch to Relays tab: {e}")
-    html = page.content()
+# Tab link text; word boundaries keep "Men" from matching "Women"
+TAB_LABELS = {
+    "men": re.compile(r"\bMen\b", re.I),
+    "women": re.compile(r"\bWomen\b", re.I),
+    "relays": re.compile(r"\bRelays\b", re.I),
+}
+
+
+def fixture_path(team_id: str, year, view: str) -> str:
+    """scraper/fixtures path for a saved view (men keeps the historical unsuffixed name)."""
     if view == "women":
         out_name = f"team_summary_{team_id}_{year}_women.html"
     elif view == "relays":
         out_name = f"team_summary_{team_id}_{year}_relays.html"
     else:
         out_name = f"team_summary_{team_id}_{year}.html"
-    out_path = os.path.join(FIXTURES_DIR, out_name)
-    return html, out_path
+    return os.path.join(FIXTURES_DIR, out_name)
+
+
+_FIXTURE_NAME = re.compile(r"^team_summary_([^_]+)_(\d{4})(?:_(women|relays))?\.html$")
+
+
+def fixture_info(path: str) -> tuple[str, int, str] | None:
+    """(team_id, year, view) from a saved view's file name, or None if it is not named by fixture_path."""
+    m = _FIXTURE_NAME.match(os.path.basename(path))
+    return (m.group(1), int(m.group(2)), m.group(3) or "men") if m else None
+
+
+def list_fixtures(fixtures_dir: str = FIXTURES_DIR, year: int | None = None) -> list[tuple[str, str, int, str]]:
+    """Saved views as (path, team_id, year, view), sorted by file name; optionally one season only."""
+    found = []
+    for name in sorted(os.listdir(fixtures_dir)) if os.path.isdir(fixtures_dir) else []:
+        info = fixture_info(name)
+        if info and (year is None or info[1] == year):
+            found.append((os.path.join(fixtures_dir, name), *info))
+    return found
+
+
+def load_team_page(page, url: str):
+    """
+    Navigate to the team summary and wait for Angular to render (the Men tab is shown by default).
+    Paced by the process-wide rate limiter, which also sees the status and render time.
+    """
+    from rate_limit import limiter
+
+    lim = limiter()
+    lim.wait()
+    t0 = time.perf_counter()
+    try:
+        response = page.goto(url, wait_until="domcontentloaded", timeout=60000)
+    except Exception:
+        lim.record(error=True, elapsed=time.perf_counter() - t0, kind="browser")
+        raise
+    try:
+        page.wait_for_selector("table, [class*='table'], .athlete", timeout=15000)
+    except Exception:
+        page.wait_for_timeout(3000)
+    status = response.status if response is not None else None
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    lim.record(status, time.perf_counter() - t0, retry_after, kind="browser")
+
+
+def switch_view(page, view: str):
+    """Click the Men / Women / Relays tab on an already loaded team summary page."""
+    selector = "table, .athlete" if view == "relays" else ".athlete"
+    try:
+        page.locator("a.nav-link").filter(has_text=TAB_LABELS[view]).first.click(timeout=5000)
+        page.wait_for_timeout(2000)
+        page.wait_for_selector(selector, timeout=10000)
+    except Exception as e:
+        print(f"Warning: could not switch to {view.capitalize()} tab: {e}")
+
+
+def fetch_one(page, url: str, view: str, team_id: str, year: str) -> tuple[str, str]:
+    """Load url, optionally switch to Women or Relays tab, return (html, output_path)."""
+    load_team_page(page, url)
+    if view != "men":
+        switch_view(page, view)
+    return page.content(), fixture_path(team_id, year, view)
 
 
 def main():
@@ -58,7 +109,9 @@ def main():
     if view not in ("men", "women", "relays", "all"):
         print("view must be: men | women | relays | all")
         sys.exit(1)
-    url = f"https://www.athletic.net/team/{team_id}/track-and-field-outdoor/{year}/team-summary"
+    from run import team_summary_url
+
+    url = team_summary_url(team_id, year)
 
     try:
         from playwright.sync_api import sync_playwright
@@ -69,17 +122,19 @@ def main():
     to_fetch = ["men", "women", "relays"] if view == "all" else [view]
     print(f"Loading {url} ...")
 
+    from browser_pool import BrowserPool
+
     with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
-        page.set_extra_http_headers({"User-Agent": "ConferenceLeaderboard/1.0 (school use)"})
-        for v in to_fetch:
-            print(f"  Fetching {v} ...")
-            html, out_path = fetch_one(page, url, v, team_id, year)
-            with open(out_path, "w", encoding="utf-8") as f:
-                f.write(html)
-            print(f"  Saved {len(html)} chars to {out_path}")
-        browser.close()
+        pool = BrowserPool(p)
+        with pool.session() as session:
+            for v in to_fetch:
+                print(f"  Fetching {v} ...")
+                html = session.view_html(url, v)
+                out_path = fixture_path(team_id, year, v)
+                with open(out_path, "w", encoding="utf-8") as f:
+                    f.write(html)
+                print(f"  Saved {len(html)} chars to {out_path}")
+        pool.close()
 
 
 if __name__ == "__main__":
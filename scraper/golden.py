@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Golden-output regression harness for the team-summary parsers.
+
+`record` parses every saved fixture (scraper/fixtures/team_summary_<team>_<year>[_women|_relays].html)
+with the reference backend and stores the canonical rows as JSON in scraper/golden/. `check` runs
+one or more parser backends over the same fixtures, diffs each against the stored output at the
+(athlete, event slug, value, date, meet) level, and prints per-backend timings side by side.
+A parser rewrite lands once `check` shows no differences for it.
+
+Relay rows use the members joined with " / " as the athlete ("" when the meet listed none).
+
+Backends:
+  soup    parse_view: BeautifulSoup over the whole page (reference)
+  stream  iter_team_summary: lxml pull parser, one athlete block at a time (relays: same as soup)
+
+Usage (from project root):
+  python scraper/golden.py record [--year YEAR] [--backend soup]
+  python scraper/golden.py check [--year YEAR] [--backend soup --backend stream] [--repeat 3] [--verbose]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+GOLDEN_DIR = SCRIPT_DIR / "golden"
+if str(SCRIPT_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPT_DIR))
+
+# Genders parsed from each saved view (the Relays tab holds both)
+VIEW_GENDERS = {"men": ("men",), "women": ("women",), "relays": ("men", "women")}
+
+
+def _soup_backend(html: str, view: str, gender: str, season_year: int):
+    from run import parse_view
+
+    return parse_view(html, view, gender, season_year)
+
+
+def _stream_backend(html: str, view: str, gender: str, season_year: int):
+    from run import iter_team_summary, parse_relay_results
+
+    if view == "relays":
+        return parse_relay_results(html, gender, season_year)
+    return list(iter_team_summary(html, gender, season_year))
+
+
+BACKENDS = {
+    "soup": _soup_backend,
+    "stream": _stream_backend,
+}
+
+
+def canonical_rows(view: str, rows) -> list[list]:
+    """Sorted [athlete, slug, value, date, meet] rows; values rounded so float noise is not a diff."""
+    out = []
+    if view == "relays":
+        for slug, value, mark_date, meet_name, members in rows:
+            out.append([" / ".join(members), slug, round(float(value), 4), _iso(mark_date), meet_name])
+    else:
+        for name, _grade, events_marks in rows:
+            for item in events_marks:
+                slug, value, mark_date = item[0], item[1], item[2]
+                meet_name = item[3] if len(item) > 3 else None
+                out.append([name, slug, round(float(value), 4), _iso(mark_date), meet_name])
+    out.sort(key=lambda r: [("" if v is None else str(v)) for v in r])
+    return out
+
+
+def _iso(d):
+    return d.isoformat() if d else None
+
+
+def run_backend(backend: str, html: str, view: str, season_year: int) -> dict:
+    """{gender: canonical rows} for one fixture."""
+    fn = BACKENDS[backend]
+    return {g: canonical_rows(view, fn(html, view, g, season_year)) for g in VIEW_GENDERS[view]}
+
+
+def golden_path(fixture_path: str) -> Path:
+    return GOLDEN_DIR / (Path(fixture_path).stem + ".json")
+
+
+def diff_rows(expected: list, actual: list) -> tuple[list, list]:
+    """(missing, extra): rows only in the golden output / only in the backend output."""
+    exp = {json.dumps(r) for r in expected}
+    act = {json.dumps(r) for r in actual}
+    missing = [json.loads(r) for r in sorted(exp - act)]
+    extra = [json.loads(r) for r in sorted(act - exp)]
+    return missing, extra
+
+
+def _dump_golden(out: dict) -> str:
+    """JSON with one row per line, so golden updates review as row-level git diffs."""
+    head = {k: v for k, v in out.items() if k != "rows"}
+    lines = [json.dumps(head)[:-1] + ', "rows": {']
+    genders = list(out["rows"].items())
+    for gi, (gender, rows) in enumerate(genders):
+        lines.append(f"  {json.dumps(gender)}: [")
+        lines.extend(f"    {json.dumps(r)}{',' if i < len(rows) - 1 else ''}" for i, r in enumerate(rows))
+        lines.append("  ]" + ("," if gi < len(genders) - 1 else ""))
+    lines.append("}}")
+    return "\n".join(lines) + "\n"
+
+
+def record(fixtures, backend: str) -> int:
+    GOLDEN_DIR.mkdir(exist_ok=True)
+    for path, team_id, year, view in fixtures:
+        with open(path, encoding="utf-8") as f:
+            html = f.read()
+        out = {
+            "fixture": os.path.basename(path),
+            "team_id": team_id,
+            "season_year": year,
+            "view": view,
+            "backend": backend,
+            "rows": run_backend(backend, html, view, year),
+        }
+        with open(golden_path(path), "w", encoding="utf-8") as f:
+            f.write(_dump_golden(out))
+        counts = ", ".join(f"{g} {len(r)}" for g, r in out["rows"].items())
+        print(f"  {os.path.basename(path)}: {counts} row(s)")
+    print(f"Recorded {len(fixtures)} golden file(s) in {GOLDEN_DIR}")
+    return 0
+
+
+def check(fixtures, backends, repeat: int = 1, verbose: bool = False) -> int:
+    timings = {b: 0.0 for b in backends}
+    failures = 0
+    checked = 0
+    for path, _team_id, year, view in fixtures:
+        gpath = golden_path(path)
+        if not gpath.exists():
+            print(f"  {os.path.basename(path)}: no golden output; run `golden.py record` first")
+            failures += 1
+            continue
+        with open(gpath, encoding="utf-8") as f:
+            expected = json.load(f)["rows"]
+        with open(path, encoding="utf-8") as f:
+            html = f.read()
+        checked += 1
+        line = []
+        for backend in backends:
+            best = None
+            for _ in range(max(repeat, 1)):
+                t0 = time.perf_counter()
+                actual = run_backend(backend, html, view, year)
+                elapsed = time.perf_counter() - t0
+                best = elapsed if best is None else min(best, elapsed)
+            timings[backend] += best
+            diffs = {g: diff_rows(expected.get(g, []), actual.get(g, [])) for g in VIEW_GENDERS[view]}
+            bad = {g: d for g, d in diffs.items() if d[0] or d[1]}
+            line.append(f"{backend} {best * 1000:.1f}ms {'DIFF' if bad else 'ok'}")
+            if bad:
+                failures += 1
+                for g, (missing, extra) in bad.items():
+                    print(f"  {os.path.basename(path)} [{backend}, {g}]: {len(missing)} missing, {len(extra)} extra")
+                    if verbose:
+                        for r in missing:
+                            print(f"    - {r}")
+                        for r in extra:
+                            print(f"    + {r}")
+        print(f"  {os.path.basename(path)}: " + " | ".join(line))
+
+    print()
+    print(f"{'backend':<10} {'total ms':>10} {'vs ' + backends[0]:>10}")
+    base = timings[backends[0]] or 1e-9
+    for backend in backends:
+        print(f"{backend:<10} {timings[backend] * 1000:>10.1f} {timings[backend] / base:>9.2f}x")
+    if failures:
+        print(f"\n{failures} difference(s) across {checked} fixture(s).")
+        return 1
+    print(f"\nAll {len(backends)} backend(s) match the golden output on {checked} fixture(s).")
+    return 0
+
+
+def main():
+    from fetch_rendered_html import FIXTURES_DIR, list_fixtures
+
+    parser = argparse.ArgumentParser(description="Record or check golden parser output for saved fixtures.")
+    parser.add_argument("command", choices=("record", "check"))
+    parser.add_argument("--fixtures", default=FIXTURES_DIR, help="saved team-summary HTML directory")
+    parser.add_argument("--year", type=int, default=None, help="only fixtures for this season year")
+    parser.add_argument(
+        "--backend",
+        action="append",
+        choices=sorted(BACKENDS),
+        default=None,
+        help="parser backend (repeatable; record uses the first, default soup; check defaults to all)",
+    )
+    parser.add_argument("--repeat", type=int, default=1, help="check: time each backend N times, keep the best")
+    parser.add_argument("--verbose", action="store_true", help="check: print every differing row")
+    args = parser.parse_args()
+
+    fixtures = list_fixtures(args.fixtures, args.year)
+    if not fixtures:
+        print(f"No fixtures found in {args.fixtures}. Save some with sync_school.py or fetch_rendered_html.py.")
+        sys.exit(1)
+    if args.command == "record":
+        sys.exit(record(fixtures, (args.backend or ["soup"])[0]))
+    sys.exit(check(fixtures, args.backend or list(BACKENDS), args.repeat, args.verbose))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Athlete identity resolution: map parsed athlete names to canonical athletes.id values.
+
+athletic.net shows the same person with a different grade from season to season (or none at all
+on the Relays tab), and relay Members cells sometimes spell names differently from the event
+tabs ("Smith, John", "J. Smith", "John  Smith (11)"). Keying athletes on (name, grade) created a
+new row for each variant, and the leaderboard API had to regroup them by lower(trim(name)) on
+every request. AthleteIndex loads a school's athletes for one gender once, indexes them by a
+normalised name key, and resolves each parsed athlete to an existing id before anything is
+written; only genuinely new names are inserted.
+
+Usage:
+  index = AthleteIndex.load(conn, school_id, "M")
+  athlete_id = index.resolve(name)               # None if unknown
+  athlete_id = index.resolve(name, relay=True)   # also tries initial + last name
+"""
+import re
+import unicodedata
+
+_GRADE_SUFFIX = re.compile(r"\s*(?:\(\s*(?:gr\.?\s*)?\d{1,2}\s*\)|-\s*\d{1,2}|\b(?:gr\.?\s*)?\d{1,2})\s*$", re.I)
+_NON_NAME = re.compile(r"[^a-z\s'-]")
+_SPACES = re.compile(r"\s+")
+_SUFFIXES = {"jr", "sr", "ii", "iii", "iv"}
+
+
+def normalize_name(name: str) -> str:
+    """
+    Canonical key for a display name: accents stripped, lower-case, "Last, First" reordered,
+    trailing grade ("(11)", "- 11") and periods removed, whitespace collapsed.
+    "Smith, John  (11)" and "john smith" -> "john smith".
+    """
+    if not name:
+        return ""
+    text = unicodedata.normalize("NFKD", name)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    text = _GRADE_SUFFIX.sub("", text.strip())
+    if text.count(",") == 1:
+        last, first = (part.strip() for part in text.split(","))
+        # "Smith, Jr." is a suffix, not "Last, First"
+        if first and first.lower().rstrip(".") not in _SUFFIXES:
+            text = f"{first} {last}"
+    text = text.lower().replace(".", " ").replace(",", " ")
+    text = _NON_NAME.sub("", text)
+    return _SPACES.sub(" ", text).strip()
+
+
+def _initial_key(key: str) -> tuple[str, str] | None:
+    """("j", "smith") for "john smith" / "j smith"; None for single-word names."""
+    parts = [p for p in key.split(" ") if p not in _SUFFIXES]
+    if len(parts) < 2:
+        return None
+    return parts[0][0], parts[-1]
+
+
+class AthleteIndex:
+    """In-memory (normalised name -> athlete) index for one school and gender."""
+
+    def __init__(self, school_id: int, gender_char: str):
+        self.school_id = school_id
+        self.gender_char = gender_char
+        self._by_key = {}  # key -> athlete id
+        self._by_initial = {}  # (initial, last) -> set of keys
+        self.grades = {}  # athlete id -> grade
+
+    @classmethod
+    def load(cls, conn, school_id: int, gender_char: str) -> "AthleteIndex":
+        index = cls(school_id, gender_char)
+        with conn.cursor() as cur:
+            # Lowest id first so the oldest row wins if legacy duplicates are still present
+            cur.execute(
+                "SELECT id, name, grade FROM athletes WHERE school_id = %s AND gender = %s ORDER BY id",
+                (school_id, gender_char),
+            )
+            for athlete_id, name, grade in cur.fetchall():
+                index.add(athlete_id, name, grade)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._by_key)
+
+    def add(self, athlete_id: int, name: str, grade: int | None = None):
+        key = normalize_name(name)
+        if not key or key in self._by_key:
+            return
+        self._by_key[key] = athlete_id
+        self.grades[athlete_id] = grade
+        initial = _initial_key(key)
+        if initial:
+            self._by_initial.setdefault(initial, set()).add(key)
+
+    def newer_grade(self, athlete_id: int, grade: int | None) -> bool:
+        """Record a parsed grade; True when it is higher than the stored one (the athlete moved up a year)."""
+        if grade is None:
+            return False
+        known = self.grades.get(athlete_id)
+        if known is not None and known >= grade:
+            return False
+        self.grades[athlete_id] = grade
+        return True
+
+    def resolve(self, name: str, relay: bool = False) -> int | None:
+        """
+        Existing athlete id for name, or None. Grade is not part of the identity (it drifts by
+        season and relay rows have none). With relay=True an abbreviated first name ("J. Smith")
+        also matches when exactly one athlete shares that initial and last name.
+        """
+        key = normalize_name(name)
+        if not key:
+            return None
+        hit = self._by_key.get(key)
+        if hit is not None:
+            return hit
+        if relay:
+            initial = _initial_key(key)
+            first = key.split(" ")[0]
+            # Only when the parsed first name is itself an initial; "John" must not match "Jane"
+            if initial and len(first) == 1:
+                candidates = self._by_initial.get(initial, set())
+                if len(candidates) == 1:
+                    return self._by_key[next(iter(candidates))]
+        return None
@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+In-memory leaderboard engine: a columnar snapshot of marks, relay results, athletes, schools and
+events that answers the same PR and avg3 rankings as /api/leaderboard for any event, gender,
+grade set and date window (e.g. "the leaderboard on May 1"), without querying the database
+per ranking.
+
+Snapshot.load() reads each table once. Marks are kept as NumPy arrays sorted by (event, gender,
+athlete, mark_date DESC, id DESC), with offsets per (event, gender), so a ranking only touches
+its own slice; relay results are kept the same way per school. Semantics follow the route:
+
+  pr     best value per athlete by events.better_direction, latest date on ties; relays: best
+         (lowest) time per school
+  avg3   average of the three most recent marks (mark_date DESC, then id) per athlete or school,
+         rounded to 0.01, with the date range of those marks
+  grades athlete's current grade in the set; relays count when any listed member is in it
+  window marks with start <= mark_date < end; default the season window (run.season_window),
+         --as-of DATE means the season up to and including DATE
+
+Distance values are corrected for feet stored as meters after ranking, as the route does.
+
+Usage (from project root; DATABASE_URL in .env.local):
+  python scraper/leaderboard.py --event SLUG --gender men|women [--mode pr|avg3] [--grades 11,12]
+                                [--season YEAR] [--as-of DATE | --from DATE --to DATE]
+                                [--limit N] [--csv FILE] [--bench N] [--verify]
+
+Example:
+  python scraper/leaderboard.py --event 1600m --gender women --as-of 2026-05-01
+  python scraper/leaderboard.py --event 4x400 --gender men --mode avg3 --csv 4x400_men.csv
+"""
+import argparse
+import csv
+import sys
+import time
+from collections import namedtuple
+from datetime import date, timedelta
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+
+if str(SCRIPT_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPT_DIR))
+
+MODES = ("pr", "avg3")
+GENDERS = {"men": "M", "women": "F"}
+GRADE_RANGE = range(7, 13)  # lib/leaderboard/gradeFilter.ts
+
+
+def normalize_grades(raw: str | None) -> list[int] | None:
+    """Same rules as normalizeGradeFilter: integers 7..12, anything else dropped; empty means no filter."""
+    if not raw:
+        return None
+    grades = []
+    for part in raw.split(","):
+        try:
+            grade = int(part.strip())
+        except ValueError:
+            continue
+        if grade in GRADE_RANGE:
+            grades.append(grade)
+    return grades or None
+
+
+def sanitize_distance_value(slug: str, value: float) -> float:
+    """sanitizeDistanceValue in app/api/leaderboard/route.ts: feet stored as meters for jumps."""
+    if slug in ("hj", "pv") and 2.5 < value < 10:
+        return value * 0.3048
+    if slug == "lj" and value > 9.5:
+        return value * 0.3048
+    if slug == "tj" and value > 16:
+        return value * 0.3048
+    return value
+
+
+class Columns(namedtuple("Columns", "entrant value ordinal row_id meet offsets")):
+    """
+    Rows of one kind (marks or relay results), sorted by (event, gender, entrant, date DESC, id DESC).
+    entrant is an athlete id, or a school id for relays; ordinal is mark_date.toordinal() (0 for
+    undated); offsets maps (event_id, gender char) to the (start, stop) slice of that leaderboard.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def build(cls, rows):
+        """rows: (id, event_id, gender, entrant, value, mark_date, meet_name)."""
+        import numpy as np
+
+        if not rows:
+            empty = np.zeros(0, dtype=np.int64)
+            return cls(empty, np.zeros(0), empty, empty, [], {})
+        row_id, event_id, gender, entrant, value, mark_date, meet = zip(*rows)
+        row_id = np.asarray(row_id, dtype=np.int64)
+        event_id = np.asarray(event_id, dtype=np.int64)
+        is_women = np.asarray([g == "F" for g in gender])
+        entrant = np.asarray(entrant, dtype=np.int64)
+        value = np.asarray([float(v) for v in value])
+        ordinal = np.asarray([d.toordinal() if d else 0 for d in mark_date], dtype=np.int64)
+        order = np.lexsort((-row_id, -ordinal, entrant, is_women, event_id))
+        event_id, is_women = event_id[order], is_women[order]
+        new = np.r_[True, (event_id[1:] != event_id[:-1]) | (is_women[1:] != is_women[:-1])]
+        starts = np.flatnonzero(new)
+        stops = np.r_[starts[1:], len(order)]
+        offsets = {
+            (int(event_id[a]), "F" if is_women[a] else "M"): (int(a), int(b)) for a, b in zip(starts, stops)
+        }
+        return cls(entrant[order], value[order], ordinal[order], row_id[order], [meet[i] for i in order], offsets)
+
+
+class Snapshot:
+    """Columnar copy of the leaderboard tables; rank() answers one leaderboard query from memory."""
+
+    def __init__(self, events, athletes, schools, marks, relay_rows, relay_members, season_year: int):
+        import numpy as np
+
+        self.season_year = season_year
+        self.events = {slug: (event_id, direction == "higher") for event_id, slug, direction in events}
+        self.athletes = {aid: (name, grade, school_id) for aid, name, grade, school_id in athletes}
+        self.schools = dict(schools)
+        self.marks = Columns.build(marks)
+        self.relays = Columns.build(relay_rows)
+        # Dense grade lookup by athlete id (-1 = no grade) for vectorised grade filters
+        max_id = max(self.athletes, default=0)
+        self._grade = np.full(max_id + 1, -1, dtype=np.int64)
+        for aid, (_name, grade, _school) in self.athletes.items():
+            if grade is not None:
+                self._grade[aid] = grade
+        # relay_result_id -> member grades, for "any member in the grade set"
+        self._member_grades = {}
+        for result_id, athlete_id in relay_members:
+            grade = self.athletes.get(athlete_id, (None, None, None))[1]
+            if grade is not None:
+                self._member_grades.setdefault(result_id, set()).add(grade)
+
+    @classmethod
+    def load(cls, conn, season_year: int | None = None, start: date | None = None, end: date | None = None):
+        """Read every table once; marks limited to [start, end) (default: the season window of season_year)."""
+        from run import DEFAULT_SEASON_YEAR, season_window
+
+        season_year = season_year or DEFAULT_SEASON_YEAR
+        lo, hi = season_window(season_year)
+        start, end = start or lo, end or hi
+        with conn.cursor() as cur:
+            cur.execute("SELECT id, slug, better_direction FROM events")
+            events = cur.fetchall()
+            cur.execute("SELECT id, name, grade, school_id FROM athletes")
+            athletes = cur.fetchall()
+            cur.execute("SELECT id, name FROM schools")
+            schools = cur.fetchall()
+            cur.execute(
+                """SELECT m.id, m.event_id, a.gender, m.athlete_id, m.value, m.mark_date, m.meet_name
+                   FROM marks m JOIN athletes a ON a.id = m.athlete_id
+                   WHERE m.mark_date >= %s AND m.mark_date < %s""",
+                (start, end),
+            )
+            marks = cur.fetchall()
+            cur.execute(
+                """SELECT id, event_id, gender, school_id, value, mark_date, meet_name FROM relay_results
+                   WHERE mark_date >= %s AND mark_date < %s""",
+                (start, end),
+            )
+            relay_rows = cur.fetchall()
+            cur.execute(
+                """SELECT rm.relay_result_id, rm.athlete_id FROM relay_result_members rm
+                   JOIN relay_results r ON r.id = rm.relay_result_id
+                   WHERE r.mark_date >= %s AND r.mark_date < %s""",
+                (start, end),
+            )
+            relay_members = cur.fetchall()
+        return cls(events, athletes, schools, marks, relay_rows, relay_members, season_year)
+
+    def window(self, as_of: date | None = None, start: date | None = None, end: date | None = None) -> tuple[int, int]:
+        """(start, end) ordinals: explicit [start, end), else the season up to and including as_of."""
+        from run import season_window
+
+        lo, hi = season_window(self.season_year)
+        start = start or lo
+        end = end or (as_of + timedelta(days=1) if as_of else hi)
+        return start.toordinal(), end.toordinal()
+
+    def rank(self, slug: str, gender: str, mode: str = "pr", grades=None, as_of: date | None = None,
+             start: date | None = None, end: date | None = None, limit: int | None = None) -> list[dict]:
+        """
+        Leaderboard rows as /api/leaderboard returns them (PR: mark_date/meet_name; avg3: date range),
+        the first limit of them if given (only those rows are built).
+        """
+        return [row for _entrant, row in self._ranked(slug, gender, mode, grades, as_of, start, end, limit)]
+
+    def _ranked(self, slug, gender, mode, grades, as_of, start, end, limit=None) -> list[tuple[int, dict]]:
+        """(athlete id, or school id for relays; row) in rank order."""
+        import numpy as np
+
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {MODES}")
+        if slug not in self.events:
+            raise KeyError(f"unknown event {slug!r}")
+        event_id, higher = self.events[slug]
+        relay = slug.startswith("4x")
+        cols = self.relays if relay else self.marks
+        a, b = cols.offsets.get((event_id, GENDERS[gender]), (0, 0))
+        lo, hi = self.window(as_of, start, end)
+
+        ordinal = cols.ordinal[a:b]
+        keep = (ordinal >= lo) & (ordinal < hi)
+        if grades:
+            if relay:
+                wanted = set(grades)
+                keep &= np.fromiter(
+                    (bool(self._member_grades.get(int(rid), set()) & wanted) for rid in cols.row_id[a:b]),
+                    dtype=bool,
+                    count=b - a,
+                )
+            else:
+                keep &= np.isin(self._grade[cols.entrant[a:b]], list(grades))
+        idx = a + np.flatnonzero(keep)
+        if len(idx) == 0:
+            return []
+
+        entrant = cols.entrant[idx]
+        # Relays rank lowest time first regardless of direction, like the route
+        signed = cols.value[idx] * (-1.0 if higher and not relay else 1.0)
+        new = np.r_[True, entrant[1:] != entrant[:-1]]
+        starts = np.flatnonzero(new)
+        group = np.cumsum(new) - 1
+
+        if mode == "pr":
+            best = np.minimum.reduceat(signed, starts)
+            # First row reaching the group's best: rows are newest first, so the latest date wins ties
+            hits = np.flatnonzero(signed == best[group])
+            _, first = np.unique(group[hits], return_index=True)
+            pick = idx[hits[first]]
+            score = best
+        else:
+            recent = (np.arange(len(idx)) - starts[group]) < 3
+            sums = np.bincount(group, weights=signed * recent)
+            score = sums / np.bincount(group, weights=recent)
+            ordinal_sel = np.where(recent, cols.ordinal[idx], np.iinfo(np.int64).max)
+            date_min = np.minimum.reduceat(ordinal_sel, starts)
+            date_max = np.maximum.reduceat(np.where(recent, cols.ordinal[idx], 0), starts)
+
+        sign = -1.0 if higher and not relay else 1.0
+        order = np.lexsort((entrant[starts], score))[:limit]
+        out = []
+        for rank, g in enumerate(order, start=1):
+            entrant_id = int(entrant[starts[g]])
+            if relay:
+                name, grade, school_id = "Relay", None, entrant_id
+            else:
+                name, grade, school_id = self.athletes.get(entrant_id, (None, None, None))
+            row = {
+                "rank": rank,
+                "athlete_name": name,
+                "school_name": self.schools.get(school_id),
+                "school_id": school_id,
+                "grade": grade,
+            }
+            if mode == "pr":
+                i = pick[g]
+                value = float(cols.value[i])
+                row.update(value=value, mark_date=_date(cols.ordinal[i]), meet_name=cols.meet[i])
+            else:
+                value = round(float(score[g]) * sign, 2)
+                row.update(value=value, mark_date_min=_date(date_min[g]), mark_date_max=_date(date_max[g]))
+            if not relay:
+                row["value"] = sanitize_distance_value(slug, row["value"])
+            out.append((entrant_id, row))
+        return out
+
+
+def _date(ordinal) -> date | None:
+    return date.fromordinal(int(ordinal)) if ordinal > 0 else None
+
+
+def verify(conn, snapshot: Snapshot, slug: str, gender: str, mode: str) -> list[str]:
+    """Differences between the engine and athlete_event_stats (what /api/leaderboard reads) for one event."""
+    column = "pr_value" if mode == "pr" else "ROUND(last3_avg, 2)"
+    with conn.cursor() as cur:
+        cur.execute(
+            f"""SELECT st.athlete_id, {column} FROM athlete_event_stats st
+                JOIN events e ON e.id = st.event_id JOIN athletes a ON a.id = st.athlete_id
+                WHERE e.slug = %s AND a.gender = %s AND st.season_year = %s""",
+            (slug, GENDERS[gender], snapshot.season_year),
+        )
+        stored = {aid: sanitize_distance_value(slug, float(v)) for aid, v in cur.fetchall()}
+    engine = {aid: row["value"] for aid, row in snapshot._ranked(slug, gender, mode, None, None, None, None)}
+    problems = [f"athlete {aid}: stored {stored.get(aid)} vs engine {engine.get(aid)}"
+                for aid in sorted(set(stored) | set(engine))
+                if stored.get(aid) is None or engine.get(aid) is None or abs(stored[aid] - engine[aid]) > 0.005]
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rank an event from an in-memory snapshot of the leaderboard tables.")
+    parser.add_argument("--event", required=True, help="event slug, e.g. 100m, 1600m, 4x400")
+    parser.add_argument("--gender", choices=GENDERS, required=True)
+    parser.add_argument("--mode", choices=MODES, default="pr", help="season best (pr) or average of last 3 (avg3)")
+    parser.add_argument("--grades", default=None, help="comma-separated grades 7-12 (default: all)")
+    parser.add_argument("--season", type=int, default=None, help="season year (default: run.DEFAULT_SEASON_YEAR)")
+    parser.add_argument("--as-of", type=date.fromisoformat, default=None, help="leaderboard as it stood on DATE (YYYY-MM-DD)")
+    parser.add_argument("--from", dest="start", type=date.fromisoformat, default=None, help="window start (inclusive)")
+    parser.add_argument("--to", dest="end", type=date.fromisoformat, default=None, help="window end (exclusive)")
+    parser.add_argument("--limit", type=int, default=25, help="rows to print (default: 25; 0 = all)")
+    parser.add_argument("--csv", default=None, help="write all rows to this CSV file")
+    parser.add_argument("--bench", type=int, default=0, help="time N rankings and report the median")
+    parser.add_argument("--verify", action="store_true", help="compare with athlete_event_stats for the season")
+    args = parser.parse_args()
+
+    import numpy as np  # after --help, which stays within the startup budget
+
+    from run import get_db
+
+    conn = get_db()
+    try:
+        t0 = time.perf_counter()
+        snapshot = Snapshot.load(conn, args.season, args.start, args.end)
+        load_s = time.perf_counter() - t0
+        grades = normalize_grades(args.grades)
+        query = dict(grades=grades, as_of=args.as_of, start=args.start, end=args.end)
+        rows = snapshot.rank(args.event, args.gender, args.mode, **query)
+        print(f"Loaded {len(snapshot.marks.value)} marks and {len(snapshot.relays.value)} relay results in {load_s:.1f}s.")
+        for row in rows[: args.limit or None]:
+            when = row.get("mark_date") or f"{row.get('mark_date_min')}..{row.get('mark_date_max')}"
+            print(f"{row['rank']:4d}. {row['athlete_name'] or '':<26} {row['school_name'] or '':<30} {row['value']:>9.2f}  {when}")
+        if args.csv:
+            with open(args.csv, "w", newline="", encoding="utf-8") as f:
+                writer = csv.DictWriter(f, fieldnames=list(rows[0]) if rows else ["rank"])
+                writer.writeheader()
+                writer.writerows(rows)
+            print(f"Wrote {len(rows)} row(s) to {args.csv}")
+        if args.bench:
+            times = []
+            for _ in range(args.bench):
+                t0 = time.perf_counter()
+                snapshot.rank(args.event, args.gender, args.mode, limit=args.limit or None, **query)
+                times.append((time.perf_counter() - t0) * 1000)
+            print(f"Ranking over {args.bench} run(s): median {float(np.median(times)):.3f} ms")
+        if args.verify and args.event.startswith("4x"):
+            print("--verify covers individual events only (relays are not in athlete_event_stats).")
+        elif args.verify:
+            problems = verify(conn, snapshot, args.event, args.gender, args.mode)
+            for line in problems[:20]:
+                print(f"  mismatch: {line}")
+            print(f"Verify against athlete_event_stats: {len(problems)} mismatch(es).")
+            if problems:
+                sys.exit(1)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -39,17 +39,38 @@ def main():
     if not os.path.isfile(path):
         print(f"File not found: {path}")
         sys.exit(1)
-    with open(path, encoding="utf-8") as f:
-        html = f.read()
-    from run import parse_team_summary, upsert_athletes_marks, get_db
-    athletes = parse_team_summary(html, school_id, gender)
-    print(f"Parsed {len(athletes)} athletes")
-    if not athletes:
-        sys.exit(0)
+    from parse_cache import cached_iter_team_summary, cached_parse_view
+    from run import get_db, upsert_athletes_marks, upsert_relay_results
+
+    # Relays-tab fixtures (team_summary_<id>_<year>_relays.html) hold team results, not athlete marks
+    if path.endswith("_relays.html"):
+        with open(path, encoding="utf-8") as f:
+            results = cached_parse_view(f.read(), "relays", gender)
+        print(f"Parsed {len(results)} relay results")
+        if not results:
+            sys.exit(0)
+        conn = get_db()
+        try:
+            upsert_relay_results(conn, school_id, gender, results)
+            print("Upserted to database.")
+        finally:
+            conn.close()
+        return
+
+    # Athletes are streamed from the file (or, when this file was loaded before, from its
+    # scraper/.parse_cache entry) into batched upserts, so large pages load in flat memory
+    parsed = 0
+
+    def counted(athletes):
+        nonlocal parsed
+        for athlete in athletes:
+            parsed += 1
+            yield athlete
+
     conn = get_db()
     try:
-        upsert_athletes_marks(conn, school_id, gender, athletes)
-        print("Upserted to database.")
+        upsert_athletes_marks(conn, school_id, gender, counted(cached_iter_team_summary(path, gender)))
+        print(f"Parsed and upserted {parsed} athletes.")
     finally:
         conn.close()
 
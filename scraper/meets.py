@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Meet-aware incremental syncs: new marks only appear after a meet, so a school only needs its team
+page re-fetched when a meet has happened since its last successful sync.
+
+school_meets (migrations/018_school_meets.sql) records the meets (name, date) each school has
+marks or relay results from, with the run that first saw them; sync_conference.py and
+sync_orchestrator.py refresh it after each successful run. With --incremental the sync scripts
+ask a MeetPlanner which schools are due:
+
+  never synced  no completed step for the season's views in scrape_run_steps
+  settled       --settle-days have passed since one of the school's own meets and it has not
+                been synced since, so results posted late are picked up (once per meet)
+  meet day      a weekday on which the school had a meet in the last SCHEDULE_DAYS (21) has
+                passed since its last sync (its usual dual or invitational day)
+  new meet      a meet the school attends (same name, years ignored, in any season of its
+                school_meets history) was seen at another school, dated on or after its last
+                sync minus --settle-days, and is not on the school's own page yet; meets on pages
+                fetched during the run count immediately, so an invitational found on one page
+                makes its usual entrants due
+  stale         last sync more than --max-age-days ago (catches first-time and dual meets)
+  probe         one of the --probe least recently synced other schools, fetched every run so new
+                meets are found
+
+Everything else is skipped: a meet only makes the schools that take part in it due, not the
+whole conference. A full resync is the default without --incremental.
+
+Usage (from project root; DATABASE_URL in .env.local):
+  python scraper/meets.py [--conference-id 1] [--year YEAR] [--gender all] [--settle-days 3]
+                          [--max-age-days 7] [--probe 1] [--refresh]
+
+Example:
+  python scraper/meets.py                 # which schools an incremental sync would fetch, and why
+  python scraper/meets.py --refresh       # update school_meets from marks first
+"""
+import argparse
+import re
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+
+if str(SCRIPT_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPT_DIR))
+
+DEFAULT_SETTLE_DAYS = 3
+DEFAULT_MAX_AGE_DAYS = 7
+DEFAULT_PROBE = 1
+
+SCHEDULE_DAYS = 21
+_SCHEDULE = timedelta(days=SCHEDULE_DAYS)
+_YEAR = re.compile(r"\b(19|20)\d\d\b")
+
+# Meets (name, date) of the conference's schools in the season, from marks and relay results
+_MEETS = """
+SELECT a.school_id, COALESCE(m.meet_name, ''), m.mark_date
+FROM marks m JOIN athletes a ON a.id = m.athlete_id JOIN schools s ON s.id = a.school_id
+WHERE s.conference_id = %(conference_id)s AND m.mark_date >= %(lo)s AND m.mark_date < %(hi)s
+UNION
+SELECT r.school_id, COALESCE(r.meet_name, ''), r.mark_date
+FROM relay_results r JOIN schools s ON s.id = r.school_id
+WHERE s.conference_id = %(conference_id)s AND r.mark_date >= %(lo)s AND r.mark_date < %(hi)s
+"""
+
+
+def add_meet_arguments(parser):
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="only fetch schools with a meet since their last sync (see meets.py); default: full resync",
+    )
+    parser.add_argument(
+        "--settle-days",
+        type=int,
+        default=DEFAULT_SETTLE_DAYS,
+        help=f"with --incremental, keep re-fetching for this many days after a meet (default: {DEFAULT_SETTLE_DAYS})",
+    )
+    parser.add_argument(
+        "--max-age-days",
+        type=int,
+        default=DEFAULT_MAX_AGE_DAYS,
+        help=f"with --incremental, always fetch schools not synced for this long (default: {DEFAULT_MAX_AGE_DAYS})",
+    )
+    parser.add_argument(
+        "--probe",
+        type=int,
+        default=DEFAULT_PROBE,
+        help=f"with --incremental, least recently synced schools fetched every run (default: {DEFAULT_PROBE})",
+    )
+
+
+def refresh_school_meets(conn, conference_id: int, season_year: int, run_id=None) -> tuple[int, int]:
+    """Bring school_meets up to date from marks. Returns (meets added, meets removed). Commits."""
+    from run import season_window
+
+    lo, hi = season_window(season_year)
+    params = {"conference_id": conference_id, "season": season_year, "lo": lo, "hi": hi, "run_id": run_id}
+    with conn.cursor() as cur:
+        cur.execute(
+            f"""INSERT INTO school_meets (school_id, season_year, meet_name, meet_date, first_seen_run_id)
+                SELECT school_id, %(season)s, meet_name, mark_date, %(run_id)s FROM ({_MEETS}) found(school_id, meet_name, mark_date)
+                ON CONFLICT (school_id, season_year, meet_name, meet_date) DO NOTHING""",
+            params,
+        )
+        added = cur.rowcount
+        cur.execute(
+            f"""DELETE FROM school_meets sm USING schools s
+                WHERE s.id = sm.school_id AND s.conference_id = %(conference_id)s AND sm.season_year = %(season)s
+                  AND (sm.school_id, sm.meet_name, sm.meet_date) NOT IN ({_MEETS})""",
+            params,
+        )
+        removed = cur.rowcount
+    conn.commit()
+    return added, removed
+
+
+def parsed_meets(view: str, rows) -> set:
+    """(meet_name, date) of parsed team-summary rows (athletes, or relay results for "relays")."""
+    if view == "relays":
+        return {(meet or "", mark_date) for _slug, _value, mark_date, meet, _members in rows if mark_date}
+    return {
+        (item[3] if len(item) == 4 else "", item[2])
+        for _name, _grade, events_marks in rows
+        for item in events_marks
+        if item[2]
+    }
+
+
+def _at(day) -> datetime:
+    return datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
+
+
+def meet_key(name: str) -> str:
+    """Meet name without years or case, so an annual meet matches across seasons ('' if unnamed)."""
+    return " ".join(_YEAR.sub(" ", name or "").lower().split())
+
+
+class MeetPlanner:
+    """Which (school, season) team pages an incremental sync fetches; reason() explains each decision."""
+
+    def __init__(self, last_sync: dict, meets: dict, settle_days: int = DEFAULT_SETTLE_DAYS,
+                 max_age_days: int = DEFAULT_MAX_AGE_DAYS, probe=(), now: datetime | None = None):
+        self.last_sync = last_sync  # (school_id, season) -> datetime (tz-aware) or None
+        self.own = {}  # (school_id, season) -> {(meet name, date)} the school has results from
+        self.attends = {}  # school_id -> {meet_key} of every meet it has results from, any season
+        self.seen = {}  # season -> {(meet name, date)} at any school, stored or fetched this run
+        for (school_id, season), found in meets.items():
+            self.own[(school_id, season)] = set(found)
+            self.attends.setdefault(school_id, set()).update(meet_key(name) for name, _d in found if meet_key(name))
+            self.observe(season, found)
+        self.settle = timedelta(days=settle_days)
+        self.max_age = timedelta(days=max_age_days)
+        self.probe = set(probe)  # (school_id, season)
+        self.now = now or datetime.now(timezone.utc)
+
+    @classmethod
+    def load(cls, conn, school_seasons, views, settle_days: int = DEFAULT_SETTLE_DAYS,
+             max_age_days: int = DEFAULT_MAX_AGE_DAYS, probe: int = DEFAULT_PROBE):
+        """
+        school_seasons: [(school_id, season)]. A school's last sync is when every one of `views`
+        had last completed; the `probe` least recently synced schools per season are always due.
+        Meets come from school_meets for these schools, earlier seasons included (meets attended).
+        """
+        seasons = sorted({season for _school, season in school_seasons})
+        school_ids = sorted({school for school, _season in school_seasons})
+        with conn.cursor() as cur:
+            cur.execute(
+                """SELECT school_id, season_year, view, MAX(completed_at) FROM scrape_run_steps
+                   WHERE school_id = ANY(%s) AND season_year = ANY(%s) AND view = ANY(%s)
+                   GROUP BY 1, 2, 3""",
+                (school_ids, seasons, list(views)),
+            )
+            per_view = {}
+            for school_id, season, view, completed in cur.fetchall():
+                per_view.setdefault((school_id, season), {})[view] = completed
+            cur.execute(
+                """SELECT school_id, season_year, meet_name, meet_date FROM school_meets
+                   WHERE school_id = ANY(%s) AND season_year <= %s""",
+                (school_ids, max(seasons)),
+            )
+            meets = {}
+            for school_id, season, name, meet_date in cur.fetchall():
+                meets.setdefault((school_id, season), set()).add((name, meet_date))
+        last_sync = {}
+        for key in school_seasons:
+            done = per_view.get(tuple(key), {})
+            last_sync[tuple(key)] = min(done[v] for v in views) if all(v in done for v in views) else None
+        # Probes come from schools that are neither new nor stale (those are fetched anyway)
+        cutoff = datetime.now(timezone.utc) - timedelta(days=max_age_days)
+        chosen = []
+        for season in seasons:
+            recent = sorted(
+                (key for key, last in last_sync.items() if key[1] == season and last is not None and last >= cutoff),
+                key=lambda key: (last_sync[key], key[0]),
+            )
+            chosen.extend(recent[:probe])
+        return cls(last_sync, meets, settle_days, max_age_days, chosen)
+
+    def observe(self, season: int, meets):
+        """Meets (name, date) seen for season, e.g. on a page fetched during this run."""
+        self.seen.setdefault(season, set()).update(meets)
+
+    def observe_result(self, season: int, view: str, result):
+        """Meets on a fetched tiered_fetch.FetchResult (sync_conference.sync_school_views on_result)."""
+        for rows in result.parsed.values():
+            self.observe(season, parsed_meets(view, rows or []))
+
+    def reason(self, school_ids, season: int) -> str | None:
+        """Why the team page of school_ids for season must be fetched, or None to skip it."""
+        for school_id in school_ids:
+            last = self.last_sync.get((school_id, season))
+            if last is None:
+                return "never synced"
+            # One more fetch once each of its own meets has settled, unless the last sync was after that
+            settled = [m for m in self.own.get((school_id, season), ()) if last < _at(m[1] + self.settle) <= self.now]
+            if settled:
+                name, meet_date = max(settled, key=lambda m: (m[1], m[0]))
+                return f"late results of {name or '(unnamed)'} on {meet_date.isoformat()}"
+            # Its own meets of the last SCHEDULE_DAYS give its usual meet days (weekly duals, invitationals)
+            recent = {d.weekday() for _name, d in self.own.get((school_id, season), ()) if d >= (self.now - _SCHEDULE).date()}
+            missed = [last.date() + timedelta(days=i) for i in range((self.now.date() - last.date()).days)]
+            usual = [d for d in missed if d.weekday() in recent]
+            if usual:
+                return f"usually competes on {usual[-1].strftime('%A')}s"
+            # A meet it usually enters, seen elsewhere but not yet on its own page (results can post late)
+            since = (last - self.settle).date()
+            attends, own = self.attends.get(school_id, ()), self.own.get((school_id, season), ())
+            shared = [
+                m for m in self.seen.get(season, ()) if m[1] >= since and m not in own and meet_key(m[0]) in attends
+            ]
+            if shared:
+                name, meet_date = max(shared, key=lambda m: (m[1], m[0]))
+                return f"meet {name} on {meet_date.isoformat()}"
+            if self.now - last > self.max_age:
+                return f"last synced {(self.now - last).days} day(s) ago"
+            if (school_id, season) in self.probe:
+                return "probe for new meets"
+        return None
+
+    def order(self, keys) -> list:
+        """keys [(school_id, season), ...] least recently synced first, so new meets are found early."""
+        return sorted(keys, key=lambda key: (self.last_sync.get(key) is not None, self.last_sync.get(key) or 0))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show which schools an incremental (meet-aware) sync would fetch.")
+    parser.add_argument("--conference-id", type=int, default=1, help="conference id (default: 1)")
+    parser.add_argument("--year", type=int, default=None, help="season year (default: the conference's season_year)")
+    parser.add_argument("--gender", choices=("all", "men", "women"), default="all", help="views the sync fetches")
+    parser.add_argument("--settle-days", type=int, default=DEFAULT_SETTLE_DAYS)
+    parser.add_argument("--max-age-days", type=int, default=DEFAULT_MAX_AGE_DAYS)
+    parser.add_argument("--probe", type=int, default=DEFAULT_PROBE)
+    parser.add_argument("--refresh", action="store_true", help="update school_meets from marks before planning")
+    args = parser.parse_args()
+
+    from run import fetch_conference_season_year, fetch_schools, get_db
+    from sync_conference import real_schools, views_for_gender
+
+    conn = get_db()
+    try:
+        year = args.year or fetch_conference_season_year(conn, args.conference_id)
+        if year is None:
+            print(f"Conference {args.conference_id} not found.")
+            sys.exit(1)
+        if args.refresh:
+            t0 = time.perf_counter()
+            added, removed = refresh_school_meets(conn, args.conference_id, year)
+            print(f"school_meets: {added} added, {removed} removed ({(time.perf_counter() - t0) * 1000:.0f} ms).")
+        schools = real_schools(fetch_schools(conn, conference_id=args.conference_id))
+        planner = MeetPlanner.load(
+            conn, [(school_id, year) for school_id, _team, _name in schools], views_for_gender(args.gender),
+            args.settle_days, args.max_age_days, args.probe,
+        )
+        due = 0
+        for school_id, _team_id, name in schools:
+            reason = planner.reason([school_id], year)
+            last = planner.last_sync.get((school_id, year))
+            synced = last.strftime("%Y-%m-%d %H:%M") if last else "never"
+            print(f"  {'fetch' if reason else 'skip '}  {name:<36} last sync {synced:<16}  {reason or 'no new meet it attends'}")
+            due += bool(reason)
+        print(f"Incremental sync for conference {args.conference_id}, {year}: {due} of {len(schools)} school(s) due.")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
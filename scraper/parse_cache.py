@@ -0,0 +1,250 @@
+"""
+On-disk cache of parse results, so re-running parse_sample.py, diagnostics.py or load_fixture.py
+on unchanged fixtures skips rebuilding the soup. Live syncs do not use it: every fetched page is
+new, so entries would only cost a write and an eviction scan.
+
+Entries are pickles in scraper/.parse_cache/, keyed by sha256 of the HTML plus the parser
+fingerprint (run.PARSER_VERSION and a hash of the parser source, so editing run.py never serves
+stale rows), the kind of result, view, gender and season year. Reads touch the file, and writes
+evict least recently used entries once the directory is over its size budget. Streamed entries
+(cached_iter_team_summary) are written and read one row at a time, so large pages stay in flat
+memory either way.
+
+  PARSE_CACHE=off            disable (always parse)
+  PARSE_CACHE_MAX_MB=200     size budget for the cache directory
+
+Usage:
+  from parse_cache import cached_parse_view
+  rows = cached_parse_view(html, view, gender, season_year, rejects)
+"""
+import hashlib
+import os
+import pickle
+import tempfile
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PARSE_CACHE_DIR = os.path.join(SCRIPT_DIR, ".parse_cache")
+DEFAULT_MAX_BYTES = int(float(os.environ.get("PARSE_CACHE_MAX_MB", "200")) * 1024 * 1024)
+
+CHUNK_SIZE = 1024 * 1024
+
+_SOURCE_HASHES = {}
+_END = "__end__"  # last record of a streamed entry: (_END, parser rejects)
+
+
+def source_hash(filename: str) -> str:
+    """Short hash of a scraper module's source (e.g. "diagnostics.py"), for keys of results it computes."""
+    if filename not in _SOURCE_HASHES:
+        with open(os.path.join(SCRIPT_DIR, filename), "rb") as f:
+            _SOURCE_HASHES[filename] = hashlib.sha256(f.read()).hexdigest()[:12]
+    return _SOURCE_HASHES[filename]
+
+
+def parser_fingerprint() -> str:
+    """run.PARSER_VERSION plus a short hash of the parser source (run.py)."""
+    from run import PARSER_VERSION
+
+    return f"{PARSER_VERSION}-{source_hash('run.py')}"
+
+
+def html_digest(html) -> str:
+    data = html.encode("utf-8") if isinstance(html, str) else html
+    return hashlib.sha256(data).hexdigest()
+
+
+def file_digest(path: str) -> str:
+    """html_digest of a file's bytes, read in CHUNK_SIZE pieces."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class ParseCache:
+    """Pickled values under sha256-derived file names, with size-based LRU eviction (file mtime = last use)."""
+
+    def __init__(self, directory: str = PARSE_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = self.misses = 0
+
+    def key(self, digest: str, *parts) -> str:
+        material = "|".join([digest, parser_fingerprint(), *(str(p) for p in parts)])
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ".pickle")
+
+    def get(self, key: str):
+        """Cached value, or None on a miss (unreadable entries count as misses)."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return value
+
+    def put(self, key: str, value):
+        for _value in self.tee(key, [value]):
+            pass
+
+    def tee(self, key: str, values):
+        """
+        Yield values while pickling each into the entry for key (read back with get_stream()).
+        The entry only appears once values are exhausted; stopping early stores nothing.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        # Write-then-rename so parallel workers never read a half-written entry
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for value in values:
+                    pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+                    yield value
+            os.replace(tmp, self._path(key))
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        self.evict()
+
+    def get_stream(self, key: str):
+        """Iterator over the values of a put_stream() entry, one unpickled at a time, or None on a miss."""
+        path = self._path(key)
+        try:
+            f = open(path, "rb")
+            os.utime(path)
+        except OSError:
+            self.misses += 1
+            return None
+        self.hits += 1
+
+        def values():
+            with f:
+                while True:
+                    try:
+                        yield pickle.load(f)
+                    except EOFError:
+                        return
+
+        return values()
+
+    def entries(self) -> list[tuple[float, int, str]]:
+        """(last use, size, path) per entry, least recently used first."""
+        out = []
+        for name in os.listdir(self.directory) if os.path.isdir(self.directory) else []:
+            if name.endswith(".pickle"):
+                path = os.path.join(self.directory, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                out.append((st.st_mtime, st.st_size, path))
+        out.sort()
+        return out
+
+    def evict(self) -> int:
+        """Drop least recently used entries until the cache fits max_bytes. Returns entries removed."""
+        entries = self.entries()
+        total = sum(size for _t, size, _p in entries)
+        removed = 0
+        for _mtime, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        return removed
+
+    def clear(self) -> int:
+        entries = self.entries()
+        for _t, _s, path in entries:
+            os.remove(path)
+        return len(entries)
+
+
+_DEFAULT = None
+
+
+def default_cache() -> ParseCache | None:
+    """The shared cache, or None when PARSE_CACHE=off."""
+    global _DEFAULT
+    if os.environ.get("PARSE_CACHE", "").lower() in ("off", "0", "false", "no"):
+        return None
+    if _DEFAULT is None:
+        _DEFAULT = ParseCache()
+    return _DEFAULT
+
+
+def _season(season_year):
+    from run import DEFAULT_SEASON_YEAR
+
+    return season_year or DEFAULT_SEASON_YEAR
+
+
+def cached_parse_view(html: str, view: str, gender: str, season_year: int | None = None, rejects: list | None = None,
+                      cache: ParseCache | None = None):
+    """run.parse_view through the cache; cached parser rejects are replayed into rejects."""
+    from run import parse_view
+
+    cache = cache or default_cache()
+    if cache is None:
+        return parse_view(html, view, gender, season_year, rejects)
+    key = cache.key(html_digest(html), "view", view, gender, _season(season_year))
+    hit = cache.get(key)
+    if hit is None:
+        found = []
+        rows = parse_view(html, view, gender, season_year, found)
+        cache.put(key, (rows, found))
+    else:
+        rows, found = hit
+    if rejects is not None:
+        rejects.extend(found)
+    return rows
+
+
+def cached_parse_team_summary(html: str, gender: str, season_year: int | None = None, rejects: list | None = None,
+                              cache: ParseCache | None = None):
+    """run.parse_team_summary (men/women pages) through the cache."""
+    return cached_parse_view(html, gender, gender, season_year, rejects, cache)
+
+
+def cached_iter_team_summary(path: str, gender: str = "men", season_year: int | None = None,
+                             rejects: list | None = None, cache: ParseCache | None = None):
+    """
+    run.iter_team_summary over a saved file through the cache, in flat memory: the file is hashed
+    in chunks, a hit replays the stored rows one at a time, and a miss streams the file as before
+    while writing each row to the entry (kept only if the page is read to the end).
+    """
+    from run import iter_team_summary
+
+    cache = cache or default_cache()
+    if cache is None:
+        yield from iter_team_summary(path, gender, season_year, rejects)
+        return
+    key = cache.key(file_digest(path), "stream", gender, _season(season_year))
+    stored = cache.get_stream(key)
+    if stored is None:
+        found = []
+
+        def rows():
+            yield from iter_team_summary(path, gender, season_year, found)
+            yield (_END, found)
+
+        stored = cache.tee(key, rows())
+    for record in stored:
+        if record[0] == _END:
+            if rejects is not None:
+                rejects.extend(record[1])
+            continue  # let tee() finish the entry
+        yield record
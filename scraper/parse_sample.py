@@ -24,8 +24,8 @@ def main():
         sys.exit(1)
     with open(path, encoding="utf-8") as f:
         html = f.read()
-    from run import parse_team_summary
-    athletes = parse_team_summary(html, school_id=1, gender="men")
+    from parse_cache import cached_parse_team_summary
+    athletes = cached_parse_team_summary(html, gender="men")
     print(f"Parsed {len(athletes)} athletes from {path}")
     for name, grade, events_marks in athletes[:10]:
         print(f"  {name} (grade {grade}): {len(events_marks)} marks")
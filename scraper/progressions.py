@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Athlete progression series: every mark of an athlete in an event and season, oldest first, with
+a running-best flag per mark, packed into one JSONB row of athlete_progressions
+(migrations/017_athlete_progressions.sql) so a progression chart is a single key lookup
+(GET /api/progression?athlete_id=&event=) instead of a marks query per athlete.
+
+After each successful sync, sync_conference.py and sync_orchestrator.py rebuild the series of the
+conference's (athlete, event) keys whose athlete_event_stats row changed since their series was
+built (or that have none yet): athlete_stats.refresh_keys rewrites a stats row whenever a mark is
+added or removed for that key, so unchanged athletes are not read or written. Series are deleted
+with their athlete_event_stats row. --rebuild rebuilds every series of the conference and season
+(e.g. after the migration, or after meet names were edited in place).
+
+Usage (from project root; DATABASE_URL in .env.local):
+  python scraper/progressions.py [--conference-id 1] [--year YEAR] [--rebuild]
+"""
+import argparse
+import sys
+import time
+from itertools import groupby
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+
+if str(SCRIPT_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPT_DIR))
+
+# Marks of the conference's keys that need a (re)build, oldest first per key
+_STALE_MARKS = """
+WITH stale AS (
+  SELECT st.athlete_id, st.event_id FROM athlete_event_stats st
+  JOIN athletes a ON a.id = st.athlete_id
+  JOIN schools s ON s.id = a.school_id
+  LEFT JOIN athlete_progressions p
+    ON p.athlete_id = st.athlete_id AND p.event_id = st.event_id AND p.season_year = st.season_year
+  WHERE s.conference_id = %(conference_id)s AND st.season_year = %(season)s
+    AND (%(rebuild)s OR p.athlete_id IS NULL OR st.updated_at > p.built_at)
+)
+SELECT m.athlete_id, m.event_id, e.better_direction = 'higher', m.mark_date, m.value, m.meet_name
+FROM stale k
+JOIN events e ON e.id = k.event_id
+JOIN marks m ON m.athlete_id = k.athlete_id AND m.event_id = k.event_id
+  AND m.mark_date >= %(lo)s AND m.mark_date < %(hi)s
+ORDER BY m.athlete_id, m.event_id, m.mark_date, m.id
+"""
+
+_UPSERT = """
+INSERT INTO athlete_progressions (athlete_id, event_id, season_year, series, marks_count) VALUES %s
+ON CONFLICT (athlete_id, event_id, season_year) DO UPDATE SET
+  series = EXCLUDED.series, marks_count = EXCLUDED.marks_count, built_at = NOW()
+"""
+
+
+def build_series(marks, higher: bool) -> dict:
+    """[(mark_date, value, meet_name)] oldest first -> the packed series stored in athlete_progressions."""
+    series = {"dates": [], "values": [], "meets": [], "best": []}
+    best = None
+    for mark_date, value, meet_name in marks:
+        value = float(value)
+        improved = best is None or (value > best if higher else value < best)
+        if improved:
+            best = value
+        series["dates"].append(mark_date.isoformat())
+        series["values"].append(value)
+        series["meets"].append(meet_name)
+        series["best"].append(improved)
+    return series
+
+
+def refresh_progressions(conn, conference_id: int, season_year: int, rebuild: bool = False) -> int:
+    """Rebuild the conference's stale series for the season (all of them with rebuild). Returns rows written. Commits."""
+    from psycopg2.extras import Json, execute_values
+
+    from run import season_window
+
+    lo, hi = season_window(season_year)
+    with conn.cursor() as cur:
+        cur.execute(
+            _STALE_MARKS,
+            {"conference_id": conference_id, "season": season_year, "rebuild": rebuild, "lo": lo, "hi": hi},
+        )
+        rows = []
+        for (athlete_id, event_id, higher), marks in groupby(cur.fetchall(), key=lambda r: r[:3]):
+            marks = [r[3:] for r in marks]
+            rows.append((athlete_id, event_id, season_year, Json(build_series(marks, higher)), len(marks)))
+        if rows:
+            execute_values(cur, _UPSERT, rows, page_size=1000)
+    conn.commit()
+    return len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build athlete progression series (athlete_progressions) from marks.")
+    parser.add_argument("--conference-id", type=int, default=1, help="conference id (default: 1)")
+    parser.add_argument("--year", type=int, default=None, help="season year (default: the conference's season_year)")
+    parser.add_argument("--rebuild", action="store_true", help="rebuild every series, not only stale ones")
+    args = parser.parse_args()
+
+    from run import fetch_conference_season_year, get_db
+
+    conn = get_db()
+    try:
+        year = args.year or fetch_conference_season_year(conn, args.conference_id)
+        if year is None:
+            print(f"Conference {args.conference_id} not found.")
+            sys.exit(1)
+        t0 = time.perf_counter()
+        written = refresh_progressions(conn, args.conference_id, year, args.rebuild)
+        print(
+            f"Progressions for conference {args.conference_id}, {year}: {written} series built "
+            f"({(time.perf_counter() - t0) * 1000:.0f} ms)."
+        )
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
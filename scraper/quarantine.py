@@ -0,0 +1,120 @@
+"""
+Quarantine for marks the pipeline drops, with a reason code per row, so data gaps can be
+investigated from the database (or a JSONL file) instead of re-fetching and re-running
+diagnose_parser.py.
+
+Reason codes:
+  unknown_event   parse: event label maps to no slug; write: slug has no events row
+  unparsable      parse: result cell could not be read as a time or distance
+  above_max, below_min, time_range   validate.py plausibility bounds (out of range)
+  out_of_season   validate.py: no date or dated outside the season window
+
+The hot path only appends small tuples; rows are written in bulk by flush(): to the
+rejected_marks table (migrations/012_rejected_marks.sql) or appended to
+scraper/.quarantine/run_<run_id>.jsonl.
+
+Usage:
+  q = Quarantine(sink="db", run_id=run_id)
+  rejects = []
+  athletes = parse_view(html, view, gender, season, rejects)
+  q.add_parse_rejects(rejects, school_id, gender, season)
+  upsert_view(conn, school_id, view, gender, athletes, season, quarantine=q)  # flushes before its commit
+
+The sync scripts take --quarantine db|jsonl|off (add_sink_argument). To look at a run:
+  SELECT reason, event, count(*) FROM rejected_marks WHERE run_id = 42 GROUP BY 1, 2 ORDER BY 3 DESC;
+"""
+import json
+import os
+from collections import Counter
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+QUARANTINE_DIR = os.path.join(SCRIPT_DIR, ".quarantine")
+SINKS = ("db", "jsonl", "off")
+
+# Parser rejects (see run.parse_team_summary): (reason, athlete_name, event, raw_text)
+# Stored rows: (school_id, gender, season_year, athlete_name, event, raw_text, value, mark_date, meet_name, reason)
+_FIELDS = ("school_id", "gender", "season_year", "athlete_name", "event", "raw_text", "value", "mark_date", "meet_name", "reason")
+
+
+def add_sink_argument(parser):
+    parser.add_argument(
+        "--quarantine",
+        choices=SINKS,
+        default="db",
+        help="where rejected marks go: rejected_marks table (default), scraper/.quarantine/run_<id>.jsonl, or off",
+    )
+
+
+def format_counts(counts) -> str:
+    """'unparsable 3, out_of_season 12' (most common first)."""
+    return ", ".join(f"{reason} {n}" for reason, n in counts.most_common())
+
+
+class Quarantine:
+    """Collects rejected cells for one run and writes them in bulk; counts holds written rows per reason."""
+
+    def __init__(self, sink: str = "db", run_id: int | None = None, directory: str = QUARANTINE_DIR):
+        if sink not in SINKS:
+            raise ValueError(f"sink must be one of {SINKS}")
+        self.sink = sink
+        self.run_id = run_id
+        self.directory = directory
+        self._rows = []
+        self.counts = Counter()
+
+    @property
+    def enabled(self) -> bool:
+        return self.sink != "off"
+
+    def add(self, reason, school_id, gender, season_year, athlete_name=None, event=None,
+            raw_text=None, value=None, mark_date=None, meet_name=None):
+        if not self.enabled:
+            self.counts[reason] += 1
+            return
+        gender_char = "M" if gender == "men" else "F" if gender == "women" else gender
+        self._rows.append(
+            (school_id, gender_char, season_year, athlete_name, event, raw_text, value, mark_date, meet_name, reason)
+        )
+
+    def add_parse_rejects(self, rejects, school_id, gender, season_year):
+        """Move parser rejects (reason, athlete_name, event, raw_text) into the quarantine and clear the list."""
+        for reason, athlete_name, event, raw_text in rejects:
+            self.add(reason, school_id, gender, season_year, athlete_name, event, raw_text)
+        rejects.clear()
+
+    def pending(self) -> int:
+        return len(self._rows)
+
+    def discard(self):
+        """Drop unflushed rows (e.g. the step's transaction was rolled back and will be retried)."""
+        self._rows.clear()
+
+    def flush(self, conn=None) -> int:
+        """Write collected rows (db sink: on conn, caller commits). Returns the number written."""
+        rows, self._rows = self._rows, []
+        if not rows:
+            return 0
+        self.counts.update(row[-1] for row in rows)
+        if self.sink == "db":
+            from psycopg2.extras import execute_values
+
+            with conn.cursor() as cur:
+                execute_values(
+                    cur,
+                    """INSERT INTO rejected_marks
+                       (run_id, school_id, gender, season_year, athlete_name, event, raw_text, value, mark_date, meet_name, reason)
+                       VALUES %s""",
+                    [(self.run_id, *row) for row in rows],
+                    page_size=1000,
+                )
+        elif self.sink == "jsonl":
+            os.makedirs(self.directory, exist_ok=True)
+            path = os.path.join(self.directory, f"run_{self.run_id if self.run_id is not None else 'local'}.jsonl")
+            with open(path, "a", encoding="utf-8") as f:
+                for row in rows:
+                    rec = dict(zip(_FIELDS, row))
+                    rec["run_id"] = self.run_id
+                    if rec["mark_date"] is not None:
+                        rec["mark_date"] = rec["mark_date"].isoformat()
+                    f.write(json.dumps(rec, separators=(",", ":")) + "\n")
+        return len(rows)
@@ -0,0 +1,187 @@
+"""
+Adaptive pacing of requests to athletic.net, shared by the HTTP tier (run.http_get, used by
+fetch_page and tiered_fetch) and the Playwright fetchers (fetch_rendered_html.load_team_page).
+
+Every request first waits for its slot (wait()), then reports how it went (record()). The delay
+between requests starts at run.RATE_LIMIT_SEC and adapts to the server:
+
+  429 / 503     honour Retry-After (seconds or an HTTP date): nothing is sent before it passes,
+                and the delay doubles
+  5xx, errors   connection errors, timeouts and 5xx double the delay
+  slow response a response far slower than usual for its kind (3x the running average, at least
+                min_slow_sec) raises the delay by half
+  healthy       after every `recover_after` healthy responses in a row the delay shrinks by 10%
+
+The delay never drops below min_interval (the throughput ceiling) or rises above max_interval.
+Sharded syncs divide the ceiling between their workers (configure_from_args(workers=N)).
+Nothing here sleeps for more than the computed slot, so a healthy site is fetched at the ceiling
+after a few pages. summary() gives the effective request rate for the run log.
+
+Usage:
+  lim = limiter()                  # process-wide instance (configure() / add_rate_arguments to set it up)
+  lim.wait()
+  ... send the request ...
+  lim.record(status, elapsed_sec, retry_after_header, kind="http")
+  print(lim.summary())
+"""
+import os
+import threading
+import time
+
+DEFAULT_INTERVAL = 12.0  # run.RATE_LIMIT_SEC
+DEFAULT_MIN_INTERVAL = 4.0
+DEFAULT_MAX_INTERVAL = 120.0
+
+
+def add_rate_arguments(parser):
+    parser.add_argument(
+        "--min-interval",
+        type=float,
+        default=float(os.environ.get("RATE_LIMIT_MIN_SEC", DEFAULT_MIN_INTERVAL)),
+        help="shortest delay between requests to athletic.net once the site is healthy, in seconds "
+        f"(the throughput ceiling; default: RATE_LIMIT_MIN_SEC or {DEFAULT_MIN_INTERVAL:g})",
+    )
+    parser.add_argument(
+        "--max-interval",
+        type=float,
+        default=DEFAULT_MAX_INTERVAL,
+        help=f"longest delay the limiter backs off to, in seconds (default: {DEFAULT_MAX_INTERVAL:g})",
+    )
+
+
+def parse_retry_after(value, now: float | None = None) -> float | None:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date), or None."""
+    if value is None or value == "":
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    from datetime import timezone
+    from email.utils import parsedate_to_datetime
+
+    try:
+        when = parsedate_to_datetime(str(value))
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, when.timestamp() - (time.time() if now is None else now))
+
+
+class RateLimiter:
+    """Delay between requests, adapted from response status, Retry-After and latency. Thread-safe."""
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL, min_interval: float = DEFAULT_MIN_INTERVAL,
+                 max_interval: float = DEFAULT_MAX_INTERVAL, backoff: float = 2.0, recover: float = 0.9,
+                 recover_after: int = 3, min_slow_sec: float = 1.0, clock=time.monotonic, sleep=time.sleep):
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval, min_interval)
+        self.interval = min(max(interval, min_interval), self.max_interval)
+        self.backoff = backoff
+        self.recover = recover
+        self.recover_after = recover_after
+        self.min_slow_sec = min_slow_sec
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._next = 0.0  # earliest start of the next request
+        self._streak = 0
+        self._latency = {}  # kind -> (running average seconds, samples)
+        self.requests = 0
+        self.backoffs = 0
+        self.retry_afters = 0
+        self.waited_sec = 0.0
+        self._first = self._last = None
+
+    def wait(self) -> float:
+        """Block until this request's slot; returns the seconds slept."""
+        with self._lock:
+            now = self._clock()
+            start = max(now, self._next)
+            self._next = start + self.interval
+            self.requests += 1
+            self._first = start if self._first is None else self._first
+            self._last = start
+            delay = start - now
+            self.waited_sec += delay
+        # Sleep outside the lock so other threads can take the following slots meanwhile
+        if delay > 0:
+            self._sleep(delay)
+        return delay
+
+    def _slow_down(self, factor: float, hold: float = 0.0):
+        self.interval = min(self.max_interval, self.interval * factor)
+        self._streak = 0
+        self.backoffs += 1
+        self._next = max(self._next, self._clock() + max(self.interval, hold))
+
+    def record(self, status: int | None = None, elapsed: float = 0.0, retry_after=None, error: bool = False,
+               kind: str = "http"):
+        """Report one finished request (status None with error=True for exceptions)."""
+        with self._lock:
+            hold = parse_retry_after(retry_after) if status in (429, 503) else None
+            if hold is not None:
+                self.retry_afters += 1
+            if error or status == 429 or (status is not None and status >= 500):
+                self._slow_down(self.backoff, hold or 0.0)
+                return
+            average, samples = self._latency.get(kind, (elapsed, 0))
+            self._latency[kind] = (average + (elapsed - average) / min(samples + 1, 5), samples + 1)
+            if samples >= 3 and elapsed > max(self.min_slow_sec, 3 * average):
+                self._slow_down(1.5)
+                return
+            self._streak += 1
+            if self._streak >= self.recover_after:
+                self._streak = 0
+                self.interval = max(self.min_interval, self.interval * self.recover)
+
+    def rate_per_min(self) -> float:
+        """Requests per minute actually sent (first to last request)."""
+        if self.requests < 2 or self._last == self._first:
+            return 0.0
+        return (self.requests - 1) * 60.0 / (self._last - self._first)
+
+    def summary(self) -> str:
+        return (
+            f"Rate limit: {self.requests} request(s), {self.rate_per_min():.1f}/min effective, "
+            f"delay now {self.interval:.1f}s (range {self.min_interval:g}-{self.max_interval:g}s), "
+            f"{self.backoffs} backoff(s), {self.retry_afters} Retry-After, {self.waited_sec:.0f}s waiting"
+        )
+
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+
+def configure(**kwargs) -> RateLimiter:
+    """Replace the process-wide limiter (RateLimiter keyword arguments)."""
+    global _limiter
+    with _limiter_lock:
+        _limiter = RateLimiter(**kwargs)
+    return _limiter
+
+
+def configure_from_args(args, interval: float = DEFAULT_INTERVAL, workers: int = 1) -> RateLimiter:
+    """
+    The process-wide limiter from add_rate_arguments flags. workers: processes sharing the
+    ceiling (sync_conference.py --shard i/N passes N), each spacing its requests N times as far
+    apart so together they stay within --min-interval.
+    """
+    return configure(
+        interval=interval * workers, min_interval=args.min_interval * workers, max_interval=args.max_interval * workers
+    )
+
+
+def limiter() -> RateLimiter:
+    """The process-wide limiter (defaults, RATE_LIMIT_MIN_SEC honoured, until configure() is called)."""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = RateLimiter(min_interval=float(os.environ.get("RATE_LIMIT_MIN_SEC", DEFAULT_MIN_INTERVAL)))
+        return _limiter
+
+
+def unpaced() -> RateLimiter:
+    """A limiter that does not pace requests (replay server benchmarks); Retry-After is still honoured."""
+    return configure(interval=0.0, min_interval=0.0, max_interval=0.0)
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for athletic.net that replays recorded pages, for offline fetch benchmarks and
+regression runs. Point the scraper at it with --base-url http://127.0.0.1:PORT (or the
+ATHLETIC_NET_BASE_URL env var).
+
+Responses come from, in order:
+  1. Playwright HAR recordings (--har, repeatable): every recorded request, i.e. the team-summary
+     document plus its JS bundles and XHR payloads, keyed by path + query string.
+  2. Saved fixtures (--fixtures, default scraper/fixtures) for team-summary URLs:
+     /team/<id>/track-and-field-outdoor/<year>/team-summary[?view=women|relays]
+     -> team_summary_<id>_<year>[_women|_relays].html
+Anything else is a 404. Responses carry an ETag and honour If-None-Match (304), so the HTTP
+tier's conditional GET path is exercised too.
+
+Fault injection (all optional, reproducible with --seed):
+  --latency-ms / --jitter-ms   delay every response
+  --error-rate                 fraction of requests answered with 503
+  --rate-limit                 requests per second before answering 429 with Retry-After
+
+GET /__replay/stats returns request counts by status as JSON.
+
+Record a HAR with: python scraper/sync_school.py <team_id> <school_id> --record-har scraper/fixtures/team.har
+
+Usage:
+  python scraper/replay_server.py [--port 8765] [--har FILE ...] [--latency-ms 150] [--error-rate 0.05] [--rate-limit 5]
+"""
+import argparse
+import base64
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_FIXTURES_DIR = os.path.join(SCRIPT_DIR, "fixtures")
+TEAM_SUMMARY_PATH = re.compile(r"^/team/([^/]+)/track-and-field-outdoor/(\d{4})/team-summary/?$")
+
+
+def load_har(path: str) -> dict:
+    """{path?query: (status, content_type, body_bytes)} from a HAR file (last entry per URL wins)."""
+    with open(path, encoding="utf-8") as f:
+        har = json.load(f)
+    responses = {}
+    for entry in har.get("log", {}).get("entries", []):
+        request, response = entry.get("request", {}), entry.get("response", {})
+        if request.get("method", "GET") != "GET":
+            continue
+        parts = urlsplit(request.get("url", ""))
+        key = parts.path + (f"?{parts.query}" if parts.query else "")
+        content = response.get("content", {})
+        text = content.get("text") or ""
+        body = base64.b64decode(text) if content.get("encoding") == "base64" else text.encode("utf-8")
+        status = response.get("status") or 200
+        if status in (301, 302, 304) or status >= 400:
+            continue
+        responses[key] = (status, content.get("mimeType") or "application/octet-stream", body)
+    return responses
+
+
+class ReplayState:
+    """Recorded responses, fault settings and counters shared by all handler threads."""
+
+    def __init__(self, fixtures_dir=DEFAULT_FIXTURES_DIR, har_paths=(), latency_ms=0, jitter_ms=0,
+                 error_rate=0.0, rate_limit=0.0, seed=None):
+        self.fixtures_dir = fixtures_dir
+        self.recorded = {}
+        for path in har_paths:
+            self.recorded.update(load_har(path))
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._window_start = time.monotonic()
+        self._window_count = 0
+        self.counts = Counter()
+
+    def fault(self):
+        """(status, retry_after) for an injected failure, or None to serve normally."""
+        with self._lock:
+            if self.rate_limit:
+                now = time.monotonic()
+                if now - self._window_start >= 1.0:
+                    self._window_start, self._window_count = now, 0
+                self._window_count += 1
+                if self._window_count > self.rate_limit:
+                    return 429, max(1, int(round(1.0 - (now - self._window_start))))
+            if self.error_rate and self._rng.random() < self.error_rate:
+                return 503, None
+            delay = self.latency_ms + (self._rng.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0)
+        if delay > 0:
+            time.sleep(delay / 1000.0)
+        return None
+
+    def lookup(self, raw_path: str):
+        """(status, content_type, body) for a request path, or None."""
+        if raw_path in self.recorded:
+            return self.recorded[raw_path]
+        parts = urlsplit(raw_path)
+        if parts.path in self.recorded and not parts.query:
+            return self.recorded[parts.path]
+        m = TEAM_SUMMARY_PATH.match(parts.path)
+        if not m:
+            return None
+        team_id, year = m.group(1), m.group(2)
+        view = (parse_qs(parts.query).get("view") or ["men"])[0]
+        suffix = {"women": "_women", "relays": "_relays"}.get(view, "")
+        path = os.path.join(self.fixtures_dir, f"team_summary_{team_id}_{year}{suffix}.html")
+        try:
+            with open(path, "rb") as f:
+                return 200, "text/html; charset=utf-8", f.read()
+        except OSError:
+            return None
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    server_version = "ReplayServer/1.0"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, fmt, *args):
+        if self.server.verbose:
+            super().log_message(fmt, *args)
+
+    def _send(self, status, body=b"", content_type="text/plain; charset=utf-8", headers=None):
+        self.server.state.counts[status] += 1
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        if body and self.command != "HEAD":
+            self.wfile.write(body)
+
+    def do_GET(self):
+        state = self.server.state
+        if self.path == "/__replay/stats":
+            body = json.dumps({str(k): v for k, v in sorted(state.counts.items())}).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        fault = state.fault()
+        if fault:
+            status, retry_after = fault
+            self._send(status, b"injected fault", headers={"Retry-After": str(retry_after)} if retry_after else None)
+            return
+        found = state.lookup(self.path)
+        if not found:
+            self._send(404, b"not recorded")
+            return
+        status, content_type, body = found
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        if self.headers.get("If-None-Match") == etag:
+            self._send(304, headers={"ETag": etag})
+            return
+        self._send(status, body, content_type, headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+    do_HEAD = do_GET
+
+
+def start_in_thread(host: str = "127.0.0.1", port: int = 0, verbose: bool = False, **state_kwargs):
+    """Start a replay server on a background thread. Returns (server, base_url); call server.shutdown()."""
+    server = ThreadingHTTPServer((host, port), ReplayHandler)
+    server.daemon_threads = True
+    server.state = ReplayState(**state_kwargs)
+    server.verbose = verbose
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def add_fault_arguments(parser):
+    parser.add_argument("--fixtures", default=DEFAULT_FIXTURES_DIR, help="saved team-summary HTML directory")
+    parser.add_argument("--har", action="append", default=[], help="Playwright HAR recording to replay (repeatable)")
+    parser.add_argument("--latency-ms", type=float, default=0, help="added latency per response (default: 0)")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="+/- random latency (default: 0)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered 503 (default: 0)")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="requests/second before 429 (default: off)")
+    parser.add_argument("--seed", type=int, default=None, help="random seed for reproducible faults")
+
+
+def state_kwargs_from_args(args) -> dict:
+    return {
+        "fixtures_dir": args.fixtures,
+        "har_paths": args.har,
+        "latency_ms": args.latency_ms,
+        "jitter_ms": args.jitter_ms,
+        "error_rate": args.error_rate,
+        "rate_limit": args.rate_limit,
+        "seed": args.seed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded athletic.net pages with configurable faults.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    add_fault_arguments(parser)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer((args.host, args.port), ReplayHandler)
+    server.daemon_threads = True
+    server.state = ReplayState(**state_kwargs_from_args(args))
+    server.verbose = args.verbose
+    print(
+        f"Replaying {len(server.state.recorded)} recorded response(s) + fixtures from {args.fixtures} "
+        f"on http://{args.host}:{args.port}"
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print("Requests by status:", dict(server.state.counts))
+
+
+if __name__ == "__main__":
+    main()
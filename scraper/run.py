@@ -3,6 +3,10 @@
 Conference Leaderboard scraper.
 Fetches athletic.net Team Summary per school (men's + women's), parses athletes/marks, upserts to Neon.
 Rate limit: 10–15 s between school requests. User-Agent: ConferenceLeaderboard/1.0.
+
+Every helper script imports this module, so it keeps import-time work to the standard library:
+requests, bs4, psycopg2 and dotenv are imported by the functions that use them
+(startup_budget.py checks the import cost of each tool).
 """
 import os
 import re
@@ -10,39 +14,61 @@ import time
 from datetime import date, datetime
 from pathlib import Path
 
-import requests
-from bs4 import BeautifulSoup
-
-# Load .env and .env.local from project root so DATABASE_URL is set when run from CLI
 _project_root = Path(__file__).resolve().parent.parent
-try:
-    from dotenv import load_dotenv
-    load_dotenv(_project_root / ".env")
-    load_dotenv(_project_root / ".env.local", override=True)
-except ImportError:
-    pass
-
-# Optional: use psycopg2 for local/cron runs; or switch to neon serverless driver if needed
-try:
-    import psycopg2
-    from psycopg2.extras import execute_values
-except ImportError:
-    psycopg2 = None
+_env_loaded = False
+
+
+def load_env():
+    """Load .env and .env.local from project root (once) so DATABASE_URL is set when run from CLI."""
+    global _env_loaded
+    if _env_loaded:
+        return
+    _env_loaded = True
+    try:
+        from dotenv import load_dotenv
+        load_dotenv(_project_root / ".env")
+        load_dotenv(_project_root / ".env.local", override=True)
+    except ImportError:
+        pass
 
 USER_AGENT = "ConferenceLeaderboard/1.0 (school use; contact for removal)"
-RATE_LIMIT_SEC = 12
-BASE_URL = "https://www.athletic.net/team/{team_id}/track-and-field-outdoor/{year}/team-summary"
+RATE_LIMIT_SEC = 12  # starting delay between requests; rate_limit.py adapts it to the site
+# Origin is overridable (ATHLETIC_NET_BASE_URL / set_base_url) to point fetches at replay_server.py
+DEFAULT_BASE_URL = "https://www.athletic.net"
+_base_url_override = None
+BASE_URL = "{base_url}/team/{team_id}/track-and-field-outdoor/{year}/team-summary"
+
+DEFAULT_SEASON_YEAR = 2026
+# Bump when parser output changes in a way the source hash would not show (parse_cache.py keys on both)
+PARSER_VERSION = 1
+
+
+def season_window(season_year: int) -> tuple[date, date]:
+    """Calendar window (inclusive start, exclusive end) for marks stored for a season year."""
+    return date(season_year, 1, 1), date(season_year + 1, 1, 1)
+
 
 # Calendar window stored in Neon / shown on leaderboard (see lib/leaderboardSeason.ts)
-SEASON_MARK_MIN = date(2026, 1, 1)
-SEASON_MARK_MAX_EXCLUSIVE = date(2027, 1, 1)
+SEASON_MARK_MIN, SEASON_MARK_MAX_EXCLUSIVE = season_window(DEFAULT_SEASON_YEAR)
 
 
-def _mark_in_leaderboard_season(mark_dt) -> bool:
-    """Only persist meets dated inside the leaderboard year (drops prior-season rows from team summary HTML)."""
-    if mark_dt is None:
-        return False
-    return SEASON_MARK_MIN <= mark_dt < SEASON_MARK_MAX_EXCLUSIVE
+def set_base_url(base_url: str | None):
+    """Override the athletic.net origin for this process (e.g. http://127.0.0.1:8765 for the replay server)."""
+    global _base_url_override
+    if base_url:
+        _base_url_override = base_url.rstrip("/")
+
+
+def athletic_net_base_url() -> str:
+    """set_base_url override, else ATHLETIC_NET_BASE_URL, else the live site."""
+    if _base_url_override:
+        return _base_url_override
+    load_env()
+    return os.environ.get("ATHLETIC_NET_BASE_URL", DEFAULT_BASE_URL).rstrip("/")
+
+
+def team_summary_url(team_id, year) -> str:
+    return BASE_URL.format(base_url=athletic_net_base_url(), team_id=team_id, year=year)
 
 # Event label (from athletic.net) -> our events.slug (must match events table: 100m–3200m, 110h/100h/300h/60h, 4x100/4x200/4x400/4x800, hj/lj/tj/sp/discus/pv)
 EVENT_TO_SLUG = {
@@ -89,10 +115,14 @@ TIME_RANGE_SEC = {
 
 
 def get_db():
+    load_env()
     url = os.environ.get("DATABASE_URL")
     if not url:
         raise SystemExit("DATABASE_URL is not set")
-    if not psycopg2:
+    # Optional: use psycopg2 for local/cron runs; or switch to neon serverless driver if needed
+    try:
+        import psycopg2
+    except ImportError:
         raise SystemExit("Install psycopg2-binary for scraper DB access")
     return psycopg2.connect(url)
 
@@ -106,15 +136,108 @@ def fetch_schools(conn, conference_id=1):
         return cur.fetchall()
 
 
-def start_run(conn):
+def fetch_conference_season_year(conn, conference_id) -> int | None:
+    with conn.cursor() as cur:
+        cur.execute("SELECT season_year FROM conferences WHERE id = %s", (conference_id,))
+        row = cur.fetchone()
+        return row[0] if row else None
+
+
+def start_run(conn, target: str | None = None):
     with conn.cursor() as cur:
         cur.execute(
-            "INSERT INTO scrape_runs (started_at, status) VALUES (%s, 'running') RETURNING id",
-            (datetime.utcnow(),),
+            "INSERT INTO scrape_runs (started_at, status, target) VALUES (%s, 'running', %s) RETURNING id",
+            (datetime.utcnow(), target),
         )
         return cur.fetchone()[0]
 
 
+def find_resumable_run(conn, target: str):
+    """
+    Latest run for target if it did not finish successfully (failed, or still 'running' after a crash).
+    The run is reopened as 'running' and its id returned; None when there is nothing to resume.
+    """
+    with conn.cursor() as cur:
+        cur.execute(
+            "SELECT id, status FROM scrape_runs WHERE target = %s ORDER BY started_at DESC, id DESC LIMIT 1",
+            (target,),
+        )
+        row = cur.fetchone()
+        if not row or row[1] == "success":
+            return None
+        cur.execute(
+            "UPDATE scrape_runs SET status = 'running', finished_at = NULL, error_message = NULL WHERE id = %s",
+            (row[0],),
+        )
+    conn.commit()
+    return row[0]
+
+
+def completed_steps(conn, run_id) -> set:
+    """(school_id, season_year, view) steps already checkpointed for run_id."""
+    with conn.cursor() as cur:
+        cur.execute(
+            "SELECT school_id, season_year, view FROM scrape_run_steps WHERE run_id = %s",
+            (run_id,),
+        )
+        return set(cur.fetchall())
+
+
+def record_step(conn, run_id, school_id: int, season_year: int, view: str):
+    """Checkpoint one finished (school, season, view) step. Caller commits."""
+    with conn.cursor() as cur:
+        cur.execute(
+            """INSERT INTO scrape_run_steps (run_id, school_id, season_year, view)
+               VALUES (%s, %s, %s, %s) ON CONFLICT DO NOTHING""",
+            (run_id, school_id, season_year, view),
+        )
+
+
+def record_fetch_stat(conn, run_id, school_id: int, season_year: int, view: str, tier: str, fetch_ms: int, parse_ms: int):
+    """Log which fetch tier produced a (school, view) and how long fetch/parse took. Caller commits."""
+    with conn.cursor() as cur:
+        cur.execute(
+            """INSERT INTO school_fetch_stats (run_id, school_id, season_year, view, tier, fetch_ms, parse_ms)
+               VALUES (%s, %s, %s, %s, %s, %s, %s)""",
+            (run_id, school_id, season_year, view, tier, fetch_ms, parse_ms),
+        )
+
+
+def fetch_preferred_tiers(conn, max_age_days: int = 7) -> dict:
+    """
+    {(school_id, view): tier} from each pair's most recent fetch within max_age_days.
+    Lets the tiered fetcher go straight to the browser for teams that recently needed it.
+    """
+    with conn.cursor() as cur:
+        cur.execute(
+            """SELECT DISTINCT ON (school_id, view) school_id, view, tier
+               FROM school_fetch_stats
+               WHERE fetched_at >= NOW() - make_interval(days => %s)
+               ORDER BY school_id, view, fetched_at DESC""",
+            (max_age_days,),
+        )
+        return {(school_id, view): tier for school_id, view, tier in cur.fetchall()}
+
+
+def with_retries(fn, attempts: int = 3, base_delay: float = 5.0, on_retry=None):
+    """
+    Call fn() up to `attempts` times with exponential backoff (base_delay, 2x, 4x, ...).
+    on_retry(exc, attempt) runs before each new attempt (e.g. to roll back a failed transaction).
+    The last exception is re-raised.
+    """
+    for attempt in range(1, attempts + 1):
+        try:
+            return fn()
+        except Exception as e:
+            if attempt == attempts:
+                raise
+            delay = base_delay * (2 ** (attempt - 1))
+            if on_retry:
+                on_retry(e, attempt)
+            print(f"  Retry {attempt}/{attempts - 1} in {delay:.0f}s after error: {e}")
+            time.sleep(delay)
+
+
 def finish_run(conn, run_id, status, schools_processed, error_message=None):
     with conn.cursor() as cur:
         cur.execute(
@@ -125,13 +248,44 @@ def finish_run(conn, run_id, status, schools_processed, error_message=None):
     conn.commit()
 
 
+_http_session = None
+
+
+def http_session():
+    """Process-wide keep-alive requests.Session (connection pooling; gzip/deflate accepted)."""
+    global _http_session
+    if _http_session is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        session = requests.Session()
+        session.headers.update({"User-Agent": USER_AGENT, "Accept-Encoding": "gzip, deflate"})
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        _http_session = session
+    return _http_session
+
+
+def http_get(url: str, headers: dict | None = None, timeout: int = 30):
+    """GET through the shared session, paced by the process-wide rate limiter (rate_limit.py)."""
+    from rate_limit import limiter
+
+    lim = limiter()
+    lim.wait()
+    t0 = time.perf_counter()
+    try:
+        resp = http_session().get(url, headers=headers, timeout=timeout)
+    except Exception:
+        lim.record(error=True, elapsed=time.perf_counter() - t0)
+        raise
+    lim.record(resp.status_code, time.perf_counter() - t0, resp.headers.get("Retry-After"))
+    return resp
+
+
 def fetch_page(team_id: str, year: int, gender: str) -> str:
-    url = BASE_URL.format(team_id=team_id, year=year)
-    resp = requests.get(
-        url,
-        headers={"User-Agent": USER_AGENT},
-        timeout=30,
-    )
+    url = team_summary_url(team_id, year)
+    resp = http_get(url)
     resp.raise_for_status()
     return resp.text
 
@@ -322,42 +476,42 @@ def _parse_relay_meet_date(cell, default_year: int = 2026):
 
 
 RELAY_SLUGS = {"4x100", "4x200", "4x400", "4x800"}
-# When a relay row lists "Relay Team" instead of athlete names, we still store the mark under this placeholder
-RELAY_TEAM_PLACEHOLDER_NAME = "Relay Team"
+_RELAY_HEADING = {
+    "men": re.compile(r"\bmen'?s?\b.*\brelays?\b", re.I),
+    "women": re.compile(r"\bwomen'?s?\b.*\brelays?\b", re.I),
+}
 
 
-def _parse_athletic_net_relays(soup, gender: str):
+def _soup(markup):
+    from bs4 import BeautifulSoup
+
+    return BeautifulSoup(markup, "lxml")
+
+
+def _find_relay_section(soup, gender: str):
+    """Heading of the "Men's Relays" / "Women's Relays" section on the Relays tab, or None."""
+    pattern = _RELAY_HEADING["men" if gender == "men" else "women"]
+    for tag in ("h4", "h3", "h2"):
+        for el in soup.find_all(tag):
+            if pattern.search((el.get_text() or "").strip()):
+                return el
+    return None
+
+
+def _parse_athletic_net_relays(soup, gender: str, season_year: int | None = None, rejects: list | None = None):
     """
     Parse athletic.net Relays tab: sections "Men's Relays" / "Women's Relays",
     each with tables per event (4x100, 4x200, etc.), rows have Place, Result, Round, Members, Meet.
-    Returns list of (athlete_name, grade, events_marks). When Members lists four names, each
-    athlete gets that mark; when it says "Relay Team" (meet didn't list participants), the
-    mark is attributed to a single placeholder athlete "Relay Team" so the time is still stored.
-    """
-    athletes = []  # (name, grade, events_marks)
-    if gender == "men":
-        section_label = "Men's Relays"
-    else:
-        section_label = "Women's Relays"
-    section_heading = None
-    for tag in ("h4", "h3", "h2"):
-        for el in soup.find_all(tag):
-            text = (el.get_text() or "").strip().lower()
-            if section_label.lower() in text:
-                section_heading = el
-                break
-            if gender == "men" and "men" in text and "relay" in text:
-                section_heading = el
-                break
-            if gender == "women" and "women" in text and "relay" in text:
-                section_heading = el
-                break
-        if section_heading:
-            break
+    Returns list of (event_slug, value, mark_date, meet_name, members): one entry per relay run,
+    members in leg order (empty when the meet only listed "Relay Team").
+    Meet cells carry no year; it is read from the page heading, else season_year.
+    """
+    results = []
+    section_heading = _find_relay_section(soup, gender)
     if not section_heading:
-        return athletes
+        return results
     # Infer season year from page (e.g. h2 "2026 Event Progress")
-    default_year = 2026
+    default_year = season_year or DEFAULT_SEASON_YEAR
     for el in soup.find_all(["h2", "h3"]):
         txt = (el.get_text() or "") or ""
         ym = re.search(r"\b(20\d{2})\b", txt)
@@ -393,35 +547,43 @@ def _parse_athletic_net_relays(soup, gender: str):
             result_text = (cells[result_col].get_text() or "").strip()
             value = _parse_mark_value(result_text, slug)
             if value is None:
+                if rejects is not None and result_text:
+                    rejects.append(("unparsable", None, slug, result_text))
                 continue
             # Members cell (index 3): "Name1\nName2\nName3\nName4" or "Relay Team" (when meet didn't list names)
-            members_cell = cells[3]
-            names = []
-            for br in members_cell.find_all("br"):
-                br.replace_with("\n")
-            raw = (members_cell.get_text() or "").strip()
-            for part in raw.split("\n"):
-                name = part.strip()
-                if name and name.lower() != "relay team":
-                    names.append(name)
-            # When no athletes are listed, attribute the mark to a placeholder so we still store it
-            if not names:
-                names = [RELAY_TEAM_PLACEHOLDER_NAME]
+            members = []
+            if len(cells) > 3:
+                members_cell = cells[3]
+                for br in members_cell.find_all("br"):
+                    br.replace_with("\n")
+                raw = (members_cell.get_text() or "").strip()
+                for part in raw.split("\n"):
+                    name = part.strip()
+                    if name and name.lower() != "relay team":
+                        members.append(name)
             mark_date = None
             meet_name = None
             if len(cells) >= 5:
                 meet_name, date_tup = _parse_relay_meet_date(cells[4], default_year)
                 if date_tup:
                     mark_date = datetime(*date_tup).date()
-            for name in names:
-                athletes.append((name, None, [(slug, value, mark_date, meet_name)]))
-    # Merge by athlete name so we return one (name, grade, events_marks) per person
-    by_name = {}
-    for name, grade, events_marks in athletes:
-        if name not in by_name:
-            by_name[name] = (name, grade, [])
-        by_name[name][2].extend(events_marks)
-    return list(by_name.values())
+            results.append((slug, value, mark_date, meet_name, members))
+    return results
+
+
+def parse_relay_results(html: str, gender: str, season_year: int | None = None, rejects: list | None = None):
+    """
+    Parse the Relays tab for one gender. Returns list of (event_slug, value, mark_date, meet_name, members);
+    each relay run appears once (see upsert_relay_results).
+    """
+    return _parse_athletic_net_relays(_soup(html), gender, season_year, rejects)
+
+
+def parse_view(html: str, view: str, gender: str, season_year: int | None = None, rejects: list | None = None):
+    """Parsed rows for one team-summary tab: relay results for "relays", else parse_team_summary athletes."""
+    if view == "relays":
+        return parse_relay_results(html, gender, season_year, rejects)
+    return parse_team_summary(html, 0, gender, season_year, rejects)
 
 
 def _is_marks_table(table) -> bool:
@@ -506,11 +668,12 @@ def _pick_table_for_event(tables):
     return tables[0] if tables else None
 
 
-def _dedupe_event_marks(events_marks: list) -> list:
+def _dedupe_event_marks(events_marks: list, season_year: int | None = None) -> list:
     """
     athletic.net repeats event headers (marks table + summary). Same mark can appear twice;
     keep the row with a meet name / non-placeholder date when possible.
     """
+    placeholder_date = date(season_year or DEFAULT_SEASON_YEAR, 4, 1)
     best = {}
     for tup in events_marks:
         slug = tup[0]
@@ -522,7 +685,7 @@ def _dedupe_event_marks(events_marks: list) -> list:
         def score(item):
             t_d = item[2] if len(item) > 2 else None
             t_mn = item[3] if len(item) > 3 else None
-            ph = t_d == SEASON_MARK_MIN.replace(month=4, day=1) and not t_mn
+            ph = t_d == placeholder_date and not t_mn
             return (0 if ph else 1, 1 if t_mn else 0, t_d or date.min)
 
         if key not in best or score(tup) > score(best[key]):
@@ -530,120 +693,197 @@ def _dedupe_event_marks(events_marks: list) -> list:
     return list(best.values())
 
 
-def _parse_athletic_net_angular(soup):
+def _is_athlete_block(tag) -> bool:
+    return tag.name == "div" and "athlete" in (tag.get("class") or [])
+
+
+def _parse_athlete_block(block, season_year: int | None = None, rejects: list | None = None):
     """
-    Parse athletic.net full-season team page: one div.athlete per athlete,
-    each with athlete-header (name, grade) and per-event tables (Place, Result, Date, Meet).
-    Returns list of (athlete_name, grade, events_marks).
+    Parse one div.athlete: athlete-header (name, grade) and per-event tables (Place, Result, Date, Meet).
+    Returns (athlete_name, grade, events_marks), or None when the block has no name or no usable marks.
+    Skipped cells are appended to rejects (if given) as (reason, athlete_name, event, raw_text) tuples.
     """
-    athletes = []
-    # Angular: div with class "athlete" containing athlete-header + event sections with tables
-    athlete_blocks = soup.find_all("div", class_=lambda c: c and "athlete" in c.split())
-    for block in athlete_blocks:
-        header = block.find("div", class_=lambda c: c and "athlete-header" in c.split())
-        if not header:
+    season_year = season_year or DEFAULT_SEASON_YEAR
+    header = block.find("div", class_=lambda c: c and "athlete-header" in c.split())
+    if not header:
+        return None
+    link = header.find("a", href=re.compile(r"/athlete/"))
+    name = (link.get_text(strip=True) if link else header.get_text(strip=True)) or ""
+    if not name:
+        return None
+    small = header.find("small")
+    grade_text = (small.get_text(strip=True) if small else "") or ""
+    grade = _parse_grade(grade_text)
+    events_marks = []
+    event_headers_list = block.find_all("div", class_=lambda c: c and "event-header" in (c or "").split())
+    for idx, event_header in enumerate(event_headers_list):
+        event_label_el = event_header.find(["strong", "span", "a"])
+        event_label = (event_header.get_text() or event_label_el.get_text() if event_label_el else "") or ""
+        slug = _event_label_to_slug(event_label)
+        if not slug:
+            if rejects is not None:
+                rejects.append(("unknown_event", name, " ".join(event_label.split()), None))
             continue
-        link = header.find("a", href=re.compile(r"/athlete/"))
-        name = (link.get_text(strip=True) if link else header.get_text(strip=True)) or ""
-        if not name:
+        # Prefer per-meet marks table over Season/Grade/Best summary (summary has no meet dates).
+        section_tables = _tables_for_event_header(event_header)
+        table = _pick_table_for_event(section_tables)
+        if not table:
+            tables_in_block = [
+                t
+                for t in block.find_all("table")
+                if t.find("tbody") and (_is_marks_table(t) or _is_summary_best_table(t))
+            ]
+            if idx < len(tables_in_block):
+                table = tables_in_block[idx]
+                if table and _is_summary_best_table(table):
+                    alt = [x for x in tables_in_block if _is_marks_table(x)]
+                    if alt:
+                        table = alt[0]
+        if not table:
             continue
-        small = header.find("small")
-        grade_text = (small.get_text(strip=True) if small else "") or ""
-        grade = _parse_grade(grade_text)
-        events_marks = []
-        event_headers_list = block.find_all("div", class_=lambda c: c and "event-header" in (c or "").split())
-        for idx, event_header in enumerate(event_headers_list):
-            event_label_el = event_header.find(["strong", "span", "a"])
-            event_label = (event_header.get_text() or event_label_el.get_text() if event_label_el else "") or ""
-            slug = _event_label_to_slug(event_label)
-            if not slug:
-                continue
-            # Prefer per-meet marks table over Season/Grade/Best summary (summary has no meet dates).
-            section_tables = _tables_for_event_header(event_header)
-            table = _pick_table_for_event(section_tables)
-            if not table:
-                tables_in_block = [
-                    t
-                    for t in block.find_all("table")
-                    if t.find("tbody") and (_is_marks_table(t) or _is_summary_best_table(t))
-                ]
-                if idx < len(tables_in_block):
-                    table = tables_in_block[idx]
-                    if table and _is_summary_best_table(table):
-                        alt = [x for x in tables_in_block if _is_marks_table(x)]
-                        if alt:
-                            table = alt[0]
-            if not table:
+        tbody = table.find("tbody")
+        if not tbody:
+            continue
+        result_col = _result_column_index(table) if not _is_summary_best_table(table) else 2
+        # Columns: 6-col = Place, Result, Wind, Round, Date, Meet (0-5); 4-col = Place, Result, Date, Meet (0-3); 3-col summary = Season, Grade, Best Result (col 2)
+        for tr in tbody.find_all("tr"):
+            cells = tr.find_all(["td", "th"])
+            if len(cells) <= result_col:
                 continue
-            tbody = table.find("tbody")
-            if not tbody:
+            result_text = (cells[result_col].get_text() or "").strip()
+            value = _parse_mark_value(result_text, slug)
+            if value is None:
+                if rejects is not None and result_text:
+                    rejects.append(("unparsable", name, slug, result_text))
                 continue
-            result_col = _result_column_index(table) if not _is_summary_best_table(table) else 2
-            # Columns: 6-col = Place, Result, Wind, Round, Date, Meet (0-5); 4-col = Place, Result, Date, Meet (0-3); 3-col summary = Season, Grade, Best Result (col 2)
-            for tr in tbody.find_all("tr"):
-                cells = tr.find_all(["td", "th"])
-                if len(cells) <= result_col:
+            # Plausibility (DISTANCE_*_METERS, TIME_RANGE_SEC) and season are checked per batch in validate.py
+            if _is_summary_best_table(table):
+                season_text = (cells[0].get_text() or "").strip() if len(cells) > 0 else ""
+                y_m = re.search(r"\b(20\d{2})\b", season_text)
+                if not y_m:
                     continue
-                result_text = (cells[result_col].get_text() or "").strip()
-                value = _parse_mark_value(result_text, slug)
-                if value is None:
+                row_season = int(y_m.group(1))
+                if row_season != season_year:
                     continue
-                if slug in DISTANCE_SLUGS:
-                    max_m = DISTANCE_MAX_METERS.get(slug)
-                    if max_m is not None and value > max_m:
-                        continue
-                    min_m = DISTANCE_MIN_METERS.get(slug)
-                    if min_m is not None and value < min_m:
-                        continue
-                if slug in TIME_RANGE_SEC:
-                    lo, hi = TIME_RANGE_SEC[slug]
-                    if value < lo or value > hi:
-                        continue
-                if _is_summary_best_table(table):
-                    season_text = (cells[0].get_text() or "").strip() if len(cells) > 0 else ""
-                    y_m = re.search(r"\b(20\d{2})\b", season_text)
-                    if not y_m:
-                        continue
-                    season_year = int(y_m.group(1))
-                    if season_year != SEASON_MARK_MIN.year:
-                        continue
-                    mark_date = date(season_year, 4, 1)
-                    meet_name = None
-                else:
-                    date_idx = 4 if len(cells) >= 6 else 2
-                    meet_idx = 5 if len(cells) >= 6 else 3
-                    date_tup = None
-                    if len(cells) > date_idx:
-                        date_tup = _parse_date_cell((cells[date_idx].get_text() or "").strip())
-                    mark_date = datetime(*date_tup).date() if date_tup else None
-                    meet_name = None
-                    if len(cells) > meet_idx:
-                        meet_cell = cells[meet_idx]
-                        link = meet_cell.find("a")
-                        meet_name = (link.get_text() or meet_cell.get_text() or "").strip() or None
-                events_marks.append((slug, value, mark_date, meet_name))
-        if events_marks:
-            athletes.append((name, grade, _dedupe_event_marks(events_marks)))
+                mark_date = date(row_season, 4, 1)
+                meet_name = None
+            else:
+                date_idx = 4 if len(cells) >= 6 else 2
+                meet_idx = 5 if len(cells) >= 6 else 3
+                date_tup = None
+                if len(cells) > date_idx:
+                    date_tup = _parse_date_cell((cells[date_idx].get_text() or "").strip())
+                mark_date = datetime(*date_tup).date() if date_tup else None
+                meet_name = None
+                if len(cells) > meet_idx:
+                    meet_cell = cells[meet_idx]
+                    link = meet_cell.find("a")
+                    meet_name = (link.get_text() or meet_cell.get_text() or "").strip() or None
+            events_marks.append((slug, value, mark_date, meet_name))
+    if not events_marks:
+        return None
+    return (name, grade, _dedupe_event_marks(events_marks, season_year))
+
+
+def _parse_athletic_net_angular(soup, season_year: int | None = None, rejects: list | None = None):
+    """
+    Parse athletic.net full-season team page: one div.athlete per athlete,
+    each with athlete-header (name, grade) and per-event tables (Place, Result, Date, Meet).
+    Returns list of (athlete_name, grade, events_marks).
+    """
+    athletes = []
+    # Angular: div with class "athlete" containing athlete-header + event sections with tables
+    for block in soup.find_all(_is_athlete_block):
+        parsed = _parse_athlete_block(block, season_year, rejects)
+        if parsed:
+            athletes.append(parsed)
     return athletes
 
 
-def parse_team_summary(html: str, school_id: int, gender: str):
+STREAM_CHUNK_BYTES = 64 * 1024
+
+
+def _iter_source_chunks(source, chunk_bytes: int = STREAM_CHUNK_BYTES):
+    """Byte chunks from HTML text/bytes, a file path, or a binary/text file object."""
+    if isinstance(source, (str, bytes)) and not (isinstance(source, str) and os.path.isfile(source)):
+        data = source.encode("utf-8") if isinstance(source, str) else source
+        for i in range(0, len(data), chunk_bytes):
+            yield data[i : i + chunk_bytes]
+        return
+    f = open(source, "rb") if isinstance(source, (str, os.PathLike)) else source
+    try:
+        while True:
+            chunk = f.read(chunk_bytes)
+            if not chunk:
+                break
+            yield chunk.encode("utf-8") if isinstance(chunk, str) else chunk
+    finally:
+        if f is not source:
+            f.close()
+
+
+def iter_team_summary(source, gender: str = "men", season_year: int | None = None, rejects: list | None = None):
+    """
+    Streaming parse_team_summary: yields (athlete_name, grade, events_marks) one div.athlete at a
+    time. source is HTML text/bytes, a file path or a file object, fed to an lxml HTMLPullParser
+    in STREAM_CHUNK_BYTES chunks. Each finished athlete block is parsed on its own and then
+    cleared from the tree, so memory is bounded by the largest block, not the page.
+
+    Pages without div.athlete blocks (single-table layout) fall back to parse_team_summary when
+    source can be read again (text, bytes or path); a file object yields nothing in that case.
+    """
+    from lxml import etree
+
+    parser = etree.HTMLPullParser(events=("end",), tag="div")
+    found = False
+    for chunk in _iter_source_chunks(source):
+        parser.feed(chunk)
+        for _event, el in parser.read_events():
+            if "athlete" not in (el.get("class") or "").split():
+                continue
+            found = True
+            block = _soup(etree.tostring(el, encoding="unicode")).find(_is_athlete_block)
+            parsed = _parse_athlete_block(block, season_year, rejects) if block else None
+            # Drop the finished block and everything before it
+            el.clear()
+            parent = el.getparent()
+            if parent is not None:
+                while el.getprevious() is not None:
+                    del parent[0]
+            if parsed:
+                yield parsed
+    parser.close()
+    if found:
+        return
+    if isinstance(source, bytes):
+        yield from parse_team_summary(source.decode("utf-8", "replace"), 0, gender, season_year, rejects)
+    elif isinstance(source, (str, os.PathLike)):
+        if isinstance(source, os.PathLike) or os.path.isfile(source):
+            with open(source, encoding="utf-8") as f:
+                source = f.read()
+        yield from parse_team_summary(source, 0, gender, season_year, rejects)
+
+
+def parse_team_summary(
+    html: str, school_id: int, gender: str, season_year: int | None = None, rejects: list | None = None
+):
     """
     Parse Team Summary HTML. Returns list of (athlete_name, grade, events_marks)
     where events_marks is list of (event_slug, value, mark_date).
     Supports (1) athletic.net Angular layout: div.athlete blocks with per-event tables;
     (2) single table with thead event columns and one row per athlete.
+    season_year (default DEFAULT_SEASON_YEAR) selects which Season/Grade/Best summary rows are kept.
+    rejects, if given, collects cells that were skipped (unknown event label, unparsable result).
     """
-    soup = BeautifulSoup(html, "lxml")
+    soup = _soup(html)
     # Try Angular layout first (athlete blocks with event-header + table per event)
-    athletes = _parse_athletic_net_angular(soup)
+    athletes = _parse_athletic_net_angular(soup, season_year, rejects)
     if athletes:
         return athletes
 
-    # Relays tab: Men's Relays / Women's Relays sections with tables per event (no div.athlete)
-    athletes = _parse_athletic_net_relays(soup, gender)
-    if athletes:
-        return athletes
+    # Relays tab: relay runs are team results, not athlete marks (see parse_relay_results)
+    if _find_relay_section(soup, gender) is not None:
+        return []
 
     # Fallback: single table with thead (event columns) and tbody (one row per athlete)
     tables = soup.find_all("table")
@@ -713,57 +953,278 @@ def parse_team_summary(html: str, school_id: int, gender: str):
     return athletes
 
 
-def upsert_athletes_marks(conn, school_id: int, gender: str, athletes: list):
-    if not athletes:
+_EVENT_IDS = {}  # dsn -> {slug: events.id}
+
+
+def fetch_event_ids(conn) -> dict:
+    """{slug: events.id}, loaded once per database; events are seeded by migrations, not by the scraper."""
+    key = getattr(conn, "dsn", None)
+    if key not in _EVENT_IDS:
+        with conn.cursor() as cur:
+            cur.execute("SELECT slug, id FROM events")
+            _EVENT_IDS[key] = dict(cur.fetchall())
+    return _EVENT_IDS[key]
+
+
+MARK_BATCH_SIZE = 1000
+
+
+def _flush_athlete_batch(
+    cur, grade_updates: dict, pending: list, event_ids: dict, season_year, rejected, quarantine=None, school_id=None, gender=None,
+    touched: set | None = None, feed=None,
+):
+    """
+    Validate pending (athlete_id, name, slug, value, mark_date, meet_name) rows as one batch and
+    write the kept marks; rejected rows go to quarantine (quarantine.Quarantine) when given.
+    The (athlete_id, event_id, season) keys written are added to touched (for athlete_stats.py),
+    and the written marks are compared with stored bests by feed (change_feed.ChangeFeed).
+    """
+    from psycopg2.extras import execute_values
+
+    from validate import RULES, classify_marks, count_rejections
+
+    if grade_updates:
+        execute_values(
+            cur,
+            """UPDATE athletes SET grade = v.grade FROM (VALUES %s) AS v(id, grade)
+               WHERE athletes.id = v.id""",
+            list(grade_updates.items()),
+        )
+        grade_updates.clear()
+    if not pending:
         return
+    athlete_ids, names, slugs, values, dates, meets = zip(*pending)
+    reasons = classify_marks(slugs, values, dates, season_year, known_slugs=event_ids)
+    keep = reasons < 0
+    rejected.update(count_rejections(reasons))
+    if quarantine is not None:
+        for i in (~keep).nonzero()[0]:
+            quarantine.add(
+                RULES[reasons[i]], school_id, gender, season_year, names[i], slugs[i],
+                value=values[i], mark_date=dates[i], meet_name=meets[i],
+            )
+    marks = {}  # natural key -> meet_name (one row per key or ON CONFLICT would hit it twice)
+    for i in keep.nonzero()[0]:
+        marks[(athlete_ids[i], event_ids[slugs[i]], dates[i], values[i])] = meets[i]
+    pending.clear()
+    if marks:
+        execute_values(
+            cur,
+            """INSERT INTO marks (athlete_id, event_id, mark_date, value, meet_name) VALUES %s
+               ON CONFLICT (athlete_id, event_id, mark_date, value) DO UPDATE SET meet_name = EXCLUDED.meet_name""",
+            [(*key, meet_name) for key, meet_name in marks.items()],
+            page_size=500,
+        )
+        if touched is not None:
+            touched.update((athlete_id, event_id, mark_date.year) for athlete_id, event_id, mark_date, _v in marks)
+        if feed is not None:
+            feed.observe(cur, school_id, "M" if gender == "men" else "F", [(*key, meet) for key, meet in marks.items()])
+
+
+def upsert_athletes_marks(
+    conn,
+    school_id: int,
+    gender: str,
+    athletes,
+    season_year: int | None = None,
+    batch_size: int = MARK_BATCH_SIZE,
+    quarantine=None,
+    feed=None,
+    commit: bool = True,
+):
+    """
+    Write parsed (name, grade, events_marks) for one school/gender. athletes may be a list or an
+    iterator (e.g. iter_team_summary); marks are validated (validate.classify_marks) and flushed
+    every batch_size rows, so memory stays flat for any page size, and everything is committed once
+    at the end. Names are resolved to existing athlete ids through identity.AthleteIndex (one
+    SELECT per call), so grade changes and relay name variants reuse the same athlete; new
+    athletes are inserted and grades only move up.
+    Rejected marks are added to quarantine (quarantine.Quarantine), which is flushed in the same
+    transaction, and athlete_event_stats is refreshed for the (athlete, event, season) keys written
+    (athlete_stats.refresh_keys). New PRs, school bests and top-N entries are added to feed
+    (change_feed.ChangeFeed) and flushed with the quarantine. With commit=False nothing is flushed
+    or committed (db_writer.py commits a whole school at once). Returns a Counter of rejected marks
+    per validation rule.
+    """
+    from collections import Counter
+
+    from athlete_stats import refresh_keys
+    from identity import AthleteIndex
+
     gender_char = "M" if gender == "men" else "F"
+    index = None
+    grade_updates = {}
+    pending = []
+    touched = set()
+    rejected = Counter()
     with conn.cursor() as cur:
         for name, grade, events_marks in athletes:
-            cur.execute(
-                """INSERT INTO athletes (school_id, name, grade, gender)
-                   VALUES (%s, %s, %s, %s)
-                   ON CONFLICT (school_id, name, grade, gender) DO UPDATE SET name = athletes.name
-                   RETURNING id""",
-                (school_id, name, grade or None, gender_char),
-            )
-            row = cur.fetchone()
-            if not row:
-                continue
-            athlete_id = row[0]
-            for item in events_marks:
-                if len(item) == 4:
-                    event_slug, value, mark_date, meet_name = item
-                else:
-                    event_slug, value, mark_date = item
-                    meet_name = None
-                cur.execute("SELECT id FROM events WHERE slug = %s", (event_slug,))
-                ev = cur.fetchone()
-                if not ev:
-                    continue
-                if event_slug in DISTANCE_SLUGS:
-                    max_m = DISTANCE_MAX_METERS.get(event_slug)
-                    if max_m is not None and float(value) > max_m:
-                        continue
-                if not _mark_in_leaderboard_season(mark_date):
-                    continue
-                event_id = ev[0]
+            if index is None:
+                event_ids = fetch_event_ids(conn)
+                index = AthleteIndex.load(conn, school_id, gender_char)
+            relay = bool(events_marks) and all(item[0] in RELAY_SLUGS for item in events_marks)
+            athlete_id = index.resolve(name, relay=relay)
+            if athlete_id is None:
                 cur.execute(
-                    """INSERT INTO marks (athlete_id, event_id, value, mark_date, meet_name)
-                       VALUES (%s, %s, %s, %s, %s)
-                       ON CONFLICT (athlete_id, event_id, mark_date, value) DO UPDATE SET meet_name = EXCLUDED.meet_name""",
-                    (athlete_id, event_id, value, mark_date, meet_name),
+                    """INSERT INTO athletes (school_id, name, grade, gender)
+                       VALUES (%s, %s, %s, %s)
+                       ON CONFLICT (school_id, gender, (lower(btrim(name)))) DO UPDATE SET name = athletes.name
+                       RETURNING id""",
+                    (school_id, name, grade or None, gender_char),
                 )
-    conn.commit()
+                athlete_id = cur.fetchone()[0]
+                index.add(athlete_id, name, grade or None)
+            elif index.newer_grade(athlete_id, grade or None):
+                grade_updates[athlete_id] = grade
+            for item in events_marks:
+                meet_name = item[3] if len(item) == 4 else None
+                pending.append((athlete_id, name, item[0], item[1], item[2], meet_name))
+            if len(pending) >= batch_size:
+                _flush_athlete_batch(
+                    cur, grade_updates, pending, event_ids, season_year, rejected, quarantine, school_id, gender, touched, feed
+                )
+        if index is not None:
+            _flush_athlete_batch(
+                cur, grade_updates, pending, event_ids, season_year, rejected, quarantine, school_id, gender, touched, feed
+            )
+        if touched:
+            refresh_keys(cur, sorted(touched))
+    if commit:
+        if quarantine is not None:
+            quarantine.flush(conn)
+        if feed is not None:
+            feed.flush(conn)
+        conn.commit()
+    return rejected
+
+
+def upsert_relay_results(
+    conn, school_id: int, gender: str, results: list, season_year: int | None = None, quarantine=None,
+    commit: bool = True,
+):
+    """
+    Write parsed relay runs (see parse_relay_results) once each into relay_results, with the listed
+    members in relay_result_members (resolved through identity.AthleteIndex like individual marks).
+    A run's member list is replaced when the page lists members; runs without names keep any
+    members stored earlier. Rejected runs go to quarantine when given (flushed before the commit;
+    with commit=False neither happens). Returns a Counter of runs rejected per validation rule.
+    """
+    from collections import Counter
+
+    if not results:
+        if commit and quarantine is not None and quarantine.flush(conn):
+            conn.commit()
+        return Counter()
+    from psycopg2.extras import execute_values
+
+    from identity import AthleteIndex
+    from validate import RULES, classify_marks, count_rejections
+
+    gender_char = "M" if gender == "men" else "F"
+    event_ids = fetch_event_ids(conn)
+    slugs, values, dates = zip(*((r[0], r[1], r[2]) for r in results))
+    reasons = classify_marks(slugs, values, dates, season_year, known_slugs=event_ids)
+    keep = reasons < 0
+    rejected = count_rejections(reasons)
+    if quarantine is not None:
+        for i in (~keep).nonzero()[0]:
+            event_slug, value, mark_date, meet_name, members = results[i]
+            quarantine.add(
+                RULES[reasons[i]], school_id, gender, season_year, " / ".join(members) or None, event_slug,
+                value=value, mark_date=mark_date, meet_name=meet_name,
+            )
+    index = AthleteIndex.load(conn, school_id, gender_char)
+    runs = {}  # natural key -> (meet_name, members)
+    with conn.cursor() as cur:
+        for i in keep.nonzero()[0]:
+            event_slug, value, mark_date, meet_name, members = results[i]
+            event_id = event_ids[event_slug]
+            member_ids = []
+            for name in members:
+                athlete_id = index.resolve(name, relay=True)
+                if athlete_id is None:
+                    cur.execute(
+                        """INSERT INTO athletes (school_id, name, grade, gender)
+                           VALUES (%s, %s, NULL, %s)
+                           ON CONFLICT (school_id, gender, (lower(btrim(name)))) DO UPDATE SET name = athletes.name
+                           RETURNING id""",
+                        (school_id, name, gender_char),
+                    )
+                    athlete_id = cur.fetchone()[0]
+                    index.add(athlete_id, name)
+                if athlete_id not in member_ids:
+                    member_ids.append(athlete_id)
+            key = (event_id, mark_date, value)
+            if key not in runs or member_ids:
+                runs[key] = (meet_name, member_ids)
+        if not runs:
+            if commit:
+                if quarantine is not None:
+                    quarantine.flush(conn)
+                conn.commit()
+            return rejected
+        rows = execute_values(
+            cur,
+            """INSERT INTO relay_results (school_id, gender, event_id, mark_date, value, meet_name) VALUES %s
+               ON CONFLICT (school_id, gender, event_id, mark_date, value) DO UPDATE SET meet_name = EXCLUDED.meet_name
+               RETURNING id, event_id, mark_date, value""",
+            [(school_id, gender_char, *key, meet_name) for key, (meet_name, _m) in runs.items()],
+            fetch=True,
+        )
+        result_ids = {(event_id, mark_date, float(value)): rid for rid, event_id, mark_date, value in rows}
+        members = []
+        for (event_id, mark_date, value), (_meet, member_ids) in runs.items():
+            rid = result_ids.get((event_id, mark_date, float(value)))
+            if rid is not None:
+                members.extend((rid, athlete_id, leg) for leg, athlete_id in enumerate(member_ids, start=1))
+        replaced = sorted({rid for rid, _a, _l in members})
+        if replaced:
+            cur.execute("DELETE FROM relay_result_members WHERE relay_result_id = ANY(%s)", (replaced,))
+            execute_values(
+                cur,
+                "INSERT INTO relay_result_members (relay_result_id, athlete_id, leg) VALUES %s ON CONFLICT DO NOTHING",
+                members,
+            )
+    if commit:
+        if quarantine is not None:
+            quarantine.flush(conn)
+        conn.commit()
+    return rejected
+
+
+def upsert_view(
+    conn, school_id: int, view: str, gender: str, rows: list, season_year: int | None = None, quarantine=None,
+    feed=None, commit: bool = True,
+):
+    """
+    Write rows from parse_view: relay results for "relays", else athletes and marks (compared
+    against stored bests by feed when given). Returns rejection counts.
+    """
+    if view == "relays":
+        return upsert_relay_results(conn, school_id, gender, rows, season_year, quarantine=quarantine, commit=commit)
+    return upsert_athletes_marks(
+        conn, school_id, gender, rows, season_year, quarantine=quarantine, feed=feed, commit=commit
+    )
 
 
 def main():
-    year = int(os.environ.get("SEASON_YEAR", "2026"))
+    load_env()
+    year = int(os.environ.get("SEASON_YEAR", str(DEFAULT_SEASON_YEAR)))
     conference_id = int(os.environ.get("CONFERENCE_ID", "1"))
 
     conn = get_db()
     run_id = start_run(conn)
     conn.commit()
 
+    from tiered_fetch import TieredFetcher
+
+    # Plain HTTP first; Chromium is only started for teams whose HTTP page is the Angular shell
+    fetcher = TieredFetcher(mode=os.environ.get("FETCH_TIER", "auto"), preferred=fetch_preferred_tiers(conn))
+    from change_feed import ChangeFeed
+    from quarantine import Quarantine
+
+    quarantine = Quarantine(os.environ.get("QUARANTINE", "db"), run_id)
+    feed = ChangeFeed(os.environ.get("CHANGE_FEED", "both"), run_id)
     schools = fetch_schools(conn, conference_id)
     processed = 0
     err_msg = None
@@ -771,19 +1232,28 @@ def main():
         for school_id, team_id, name in schools:
             for gender in ("men", "women"):
                 try:
-                    html = fetch_page(team_id, year, gender)
-                    athletes = parse_team_summary(html, school_id, gender)
-                    upsert_athletes_marks(conn, school_id, gender, athletes)
+                    result = fetcher.fetch(team_id, year, gender, [gender], school_id=school_id)
+                    quarantine.add_parse_rejects(result.rejects.get(gender, []), school_id, gender, year)
+                    upsert_athletes_marks(conn, school_id, gender, result.parsed[gender], year, quarantine=quarantine, feed=feed)
+                    record_fetch_stat(conn, run_id, school_id, year, gender, result.tier, result.fetch_ms, result.parse_ms)
+                    conn.commit()
                 except Exception as e:
+                    conn.rollback()
+                    fetcher.invalidate()
+                    quarantine.discard()
+                    feed.discard()
                     err_msg = str(e)
                     # continue with next school/gender
-                time.sleep(RATE_LIMIT_SEC)
             processed += 1
         finish_run(conn, run_id, "success", processed)
+        from rate_limit import limiter
+
+        print(limiter().summary())
     except Exception as e:
         finish_run(conn, run_id, "failed", processed, str(e))
         raise
     finally:
+        fetcher.close()
         conn.close()
 
 
@@ -0,0 +1,494 @@
+#!/usr/bin/env python3
+"""
+Virtual-meet scoring: project places and team points for every event of a conference meet from
+the current in-season marks, in one pass instead of one /api/leaderboard call per event.
+
+ConferenceMarks.load() reads the conference's marks and relay results once and reduces them to
+one row per (athlete or relay school, event) holding both the season best (PR) and the average
+of the three most recent marks (avg3, like the leaderboard's avg3 mode). project() then ranks
+every event and gender at once with NumPy:
+
+  - entries per school are capped (--entries), keeping each school's best; relays are stored
+    per school, so each school enters its best relay
+  - places score from a configurable table (SCORING_TABLES, or --table 10,8,6,...)
+  - ties share the points of the places they occupy
+  - "what-if" scratches drop athletes (everywhere, or in one event) and relay teams
+
+store_projection() replaces the stored projection for (conference, season, mode) in
+meet_projections / meet_projection_teams (migrations/013_meet_projections.sql);
+sync_conference.py and sync_orchestrator.py refresh it after each successful sync.
+
+Usage (from project root; DATABASE_URL in .env.local):
+  python scraper/scoring.py [--conference-id 1] [--year YEAR] [--mode pr|avg3] [--table 8-place]
+                            [--entries 3] [--scratch ATHLETE_ID[:EVENT]] [--scratch-relay SCHOOL_ID:EVENT]
+                            [--events] [--store] [--bench N]
+
+Example:
+  python scraper/scoring.py --mode avg3 --events
+  python scraper/scoring.py --scratch 412 --scratch 388:1600m --scratch-relay 3:4x400
+"""
+import argparse
+import sys
+import time
+from collections import namedtuple
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+
+if str(SCRIPT_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPT_DIR))
+
+MODES = ("pr", "avg3")
+GENDERS = ("men", "women")  # index 0 / 1 in the arrays (athletes.gender 'M' / 'F')
+
+# Points by place; relays use the same table unless Scoring.relay_table is set
+SCORING_TABLES = {
+    "8-place": (10, 8, 6, 5, 4, 3, 2, 1),
+    "6-place": (10, 8, 6, 4, 2, 1),
+    "dual": (5, 3, 1),
+}
+
+
+class Scoring:
+    def __init__(self, table: tuple = SCORING_TABLES["8-place"], relay_table: tuple | None = None,
+                 entries_per_school: int = 3):
+        self.table = table
+        self.relay_table = relay_table
+        self.entries_per_school = entries_per_school
+
+
+def parse_table(text: str) -> tuple:
+    """SCORING_TABLES name or comma-separated points, e.g. '10,8,6,4,2,1'."""
+    if text in SCORING_TABLES:
+        return SCORING_TABLES[text]
+    try:
+        points = tuple(float(p) for p in text.split(","))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"table must be one of {sorted(SCORING_TABLES)} or points like 10,8,6")
+    return tuple(int(p) if p.is_integer() else p for p in points)
+
+
+class Entries(namedtuple("Entries", "entrant school event gender pr avg3")):
+    """
+    One row per (entrant, event, gender), as parallel arrays: entrant is an athlete id, or a school
+    id for relays; event indexes ConferenceMarks.events; gender is 0 men, 1 women.
+    """
+
+    __slots__ = ()
+
+    @property
+    def size(self) -> int:
+        return len(self.entrant)
+
+
+def _reduce_marks(entrant, school, event, gender, value, ordinal, mark_id, higher) -> Entries:
+    """
+    Per (entrant, event, gender): best value (higher is better where `higher[event]`) and the mean
+    of the three most recent marks (by date, then id, as in the leaderboard's avg3).
+    """
+    import numpy as np
+
+    entrant = np.asarray(entrant, dtype=np.int64)
+    event = np.asarray(event, dtype=np.int64)
+    gender = np.asarray(gender, dtype=np.int64)
+    if len(entrant) == 0:
+        empty_i, empty_f = np.zeros(0, dtype=np.int64), np.zeros(0)
+        return Entries(empty_i, empty_i, empty_i, empty_i, empty_f, empty_f)
+    key = (entrant * (len(higher) + 1) + event) * 2 + gender
+    order = np.lexsort((-np.asarray(mark_id), -np.asarray(ordinal), key))
+    key_sorted = key[order]
+    value_sorted = np.asarray(value, dtype=np.float64)[order]
+    starts = np.flatnonzero(np.r_[True, key_sorted[1:] != key_sorted[:-1]])
+    group = np.cumsum(np.r_[True, key_sorted[1:] != key_sorted[:-1]]) - 1
+    rank_in_group = np.arange(len(order)) - starts[group]
+
+    first = order[starts]
+    event_first = event[first]
+    # Best = minimum of sign * value (sign -1 turns "higher is better" into a minimum)
+    sign = np.where(np.asarray(higher)[event[order]], -1.0, 1.0)
+    best = np.minimum.reduceat(value_sorted * sign, starts) * sign[starts]
+    recent = (rank_in_group < 3).astype(np.float64)
+    avg3 = np.bincount(group, weights=value_sorted * recent) / np.bincount(group, weights=recent)
+    return Entries(
+        entrant=entrant[first],
+        school=np.asarray(school, dtype=np.int64)[first],
+        event=event_first,
+        gender=gender[first],
+        pr=best,
+        avg3=avg3,
+    )
+
+
+class ConferenceMarks:
+    """In-season marks for one conference, reduced to per-entrant PR and avg3 arrays."""
+
+    def __init__(self, events, higher, individual: Entries, relays: Entries, athletes=None, schools=None):
+        import numpy as np
+
+        self.events = list(events)  # slugs; index = event code
+        self.higher = np.asarray(higher, dtype=bool)
+        self.individual = individual
+        self.relays = relays
+        self.athletes = athletes or {}  # athlete id -> (name, grade)
+        self.schools = schools or {}  # school id -> name
+
+    @classmethod
+    def from_rows(cls, events, mark_rows, relay_rows, athletes=None, schools=None):
+        """
+        events: [(slug, better_direction)]; mark_rows: (mark_id, slug, gender 'M'/'F', athlete_id,
+        school_id, value, mark_date); relay_rows: (relay_result_id, slug, gender, school_id, value, mark_date).
+        """
+        slugs = [slug for slug, _d in events]
+        code = {slug: i for i, slug in enumerate(slugs)}
+        higher = [direction == "higher" for _s, direction in events]
+
+        def columns(rows, entrant_col, school_col):
+            rows = [r for r in rows if r[1] in code]
+            if not rows:
+                return ([],) * 7
+            cols = list(zip(*rows))
+            return (
+                cols[entrant_col],
+                cols[school_col],
+                [code[s] for s in cols[1]],
+                [0 if g == "M" else 1 for g in cols[2]],
+                [float(v) for v in cols[-2]],
+                [d.toordinal() if d else 0 for d in cols[-1]],
+                cols[0],
+            )
+
+        individual = _reduce_marks(*columns(mark_rows, 3, 4), higher)
+        relays = _reduce_marks(*columns(relay_rows, 3, 3), higher)
+        return cls(slugs, higher, individual, relays, athletes, schools)
+
+    @classmethod
+    def load(cls, conn, conference_id: int, season_year: int):
+        """One query each for events, marks, relay results, athletes and schools of the conference."""
+        from run import season_window
+
+        lo, hi = season_window(season_year)
+        with conn.cursor() as cur:
+            cur.execute("SELECT slug, better_direction FROM events ORDER BY id")
+            events = cur.fetchall()
+            cur.execute(
+                """SELECT m.id, e.slug, a.gender, a.id, a.school_id, m.value, m.mark_date
+                   FROM marks m
+                   JOIN athletes a ON a.id = m.athlete_id
+                   JOIN schools s ON s.id = a.school_id
+                   JOIN events e ON e.id = m.event_id
+                   WHERE s.conference_id = %s AND m.mark_date >= %s AND m.mark_date < %s""",
+                (conference_id, lo, hi),
+            )
+            mark_rows = cur.fetchall()
+            cur.execute(
+                """SELECT r.id, e.slug, r.gender, r.school_id, r.value, r.mark_date
+                   FROM relay_results r
+                   JOIN schools s ON s.id = r.school_id
+                   JOIN events e ON e.id = r.event_id
+                   WHERE s.conference_id = %s AND r.mark_date >= %s AND r.mark_date < %s""",
+                (conference_id, lo, hi),
+            )
+            relay_rows = cur.fetchall()
+            cur.execute(
+                """SELECT a.id, a.name, a.grade FROM athletes a JOIN schools s ON s.id = a.school_id
+                   WHERE s.conference_id = %s""",
+                (conference_id,),
+            )
+            athletes = {aid: (name, grade) for aid, name, grade in cur.fetchall()}
+            cur.execute("SELECT id, name FROM schools WHERE conference_id = %s", (conference_id,))
+            schools = dict(cur.fetchall())
+        return cls.from_rows(events, mark_rows, relay_rows, athletes, schools)
+
+
+class Placings(namedtuple("Placings", "entrant school event gender relay value place points")):
+    """Scoring rows of one projection (individual and relay together), ordered by event, gender, place."""
+
+    __slots__ = ()
+
+
+class Projection:
+    def __init__(self, marks: ConferenceMarks, mode: str, placings: Placings, team_points: dict | None = None):
+        self.marks = marks
+        self.mode = mode
+        self.placings = placings
+        self.team_points = team_points or {}  # gender -> {school_id: points}
+
+    def event_rows(self, slug: str, gender: str) -> list[tuple]:
+        """[(place, entrant id, school id, value, points, relay)] for one event and gender."""
+        import numpy as np
+
+        p = self.placings
+        code = self.marks.events.index(slug)
+        sel = np.flatnonzero((p.event == code) & (p.gender == GENDERS.index(gender)))
+        return [
+            (int(p.place[i]), int(p.entrant[i]), int(p.school[i]), float(p.value[i]), float(p.points[i]), bool(p.relay[i]))
+            for i in sel
+        ]
+
+    def standings(self, gender: str) -> list[tuple[int, float]]:
+        """[(school id, points)] best first; schools without points are listed with 0."""
+        points = self.team_points.get(gender, {})
+        ids = set(self.marks.schools) | set(points)
+        return sorted(((sid, points.get(sid, 0.0)) for sid in ids), key=lambda sp: (-sp[1], sp[0]))
+
+
+def _score(entries: Entries, values, higher, table, limit: int, keep) -> tuple:
+    """Indices into entries, places and points of the scoring rows for every event/gender at once."""
+    import numpy as np
+
+    idx = np.flatnonzero(keep & ~np.isnan(values))
+    if len(idx) == 0 or not table:
+        return idx[:0], idx[:0], np.zeros(0)
+    event, gender, school = entries.event[idx], entries.gender[idx], entries.school[idx]
+    score = np.where(higher[event], -values[idx], values[idx])
+    group = event * 2 + gender
+
+    # Entry limit: each school's best `limit` entrants per event
+    order = np.lexsort((entries.entrant[idx], score, school, group))
+    g_s = (group * (school.max() + 1) + school)[order]
+    new = np.r_[True, g_s[1:] != g_s[:-1]]
+    starts = np.flatnonzero(new)
+    rank = np.arange(len(order)) - starts[np.cumsum(new) - 1]
+    idx = idx[order[rank < limit]]
+    event, gender = entries.event[idx], entries.gender[idx]
+    score = np.where(higher[event], -values[idx], values[idx])
+    group = event * 2 + gender
+
+    # Places within each event/gender; ties (equal group and score) share their places' points
+    order = np.lexsort((entries.entrant[idx], score, group))
+    idx, group, score = idx[order], group[order], score[order]
+    new_group = np.r_[True, group[1:] != group[:-1]]
+    group_start = np.flatnonzero(new_group)
+    position = np.arange(len(idx)) - group_start[np.cumsum(new_group) - 1]  # 0-based
+    padded = np.zeros(len(idx) + 1)
+    padded[: min(len(table), len(idx))] = table[: len(idx)]
+    raw = padded[np.minimum(position, len(idx))]
+    new_tie = new_group | np.r_[True, score[1:] != score[:-1]]
+    tie = np.cumsum(new_tie) - 1
+    tie_start = np.flatnonzero(new_tie)
+    points = (np.bincount(tie, weights=raw) / np.bincount(tie))[tie]
+    place = position[tie_start][tie] + 1
+    scoring = place <= len(table)
+    return idx[scoring], place[scoring], points[scoring]
+
+
+def project(
+    marks: ConferenceMarks,
+    mode: str = "pr",
+    scoring: Scoring | None = None,
+    scratches=(),
+    relay_scratches=(),
+) -> Projection:
+    """
+    Projected placings and team points for every event and gender.
+    scratches: athlete ids (out of the meet) or (athlete id, slug) pairs (out of one event).
+    relay_scratches: (school id, slug) pairs.
+    """
+    import numpy as np
+
+    if mode not in MODES:
+        raise ValueError(f"mode must be one of {MODES}")
+    scoring = scoring or Scoring()
+    n_events = len(marks.events) + 1
+    code = {slug: i for i, slug in enumerate(marks.events)}
+
+    def keep_mask(entries: Entries, items):
+        whole = [x for x in items if not isinstance(x, tuple)]
+        pairs = [x[0] * n_events + code[x[1]] for x in items if isinstance(x, tuple) and x[1] in code]
+        keep = np.ones(entries.size, dtype=bool)
+        if whole:
+            keep &= ~np.isin(entries.entrant, whole)
+        if pairs:
+            keep &= ~np.isin(entries.entrant * n_events + entries.event, pairs)
+        return keep
+
+    parts = []
+    for entries, table, limit, items, relay in (
+        (marks.individual, scoring.table, scoring.entries_per_school, scratches, False),
+        # relay_results has no team letter, so a school's relay marks are one entrant
+        (marks.relays, scoring.relay_table or scoring.table, 1, relay_scratches, True),
+    ):
+        values = entries.pr if mode == "pr" else entries.avg3
+        idx, place, points = _score(entries, values, marks.higher, tuple(table), limit, keep_mask(entries, list(items)))
+        parts.append((entries, values, idx, place, points, relay))
+
+    def cat(fn):
+        return np.concatenate([fn(*part) for part in parts])
+
+    placings = Placings(
+        entrant=cat(lambda e, v, i, pl, pt, r: e.entrant[i]),
+        school=cat(lambda e, v, i, pl, pt, r: e.school[i]),
+        event=cat(lambda e, v, i, pl, pt, r: e.event[i]),
+        gender=cat(lambda e, v, i, pl, pt, r: e.gender[i]),
+        relay=cat(lambda e, v, i, pl, pt, r: np.full(len(i), r)),
+        value=cat(lambda e, v, i, pl, pt, r: v[i]),
+        place=cat(lambda e, v, i, pl, pt, r: pl),
+        points=cat(lambda e, v, i, pl, pt, r: pt),
+    )
+    order = np.lexsort((placings.place, placings.gender, placings.event))
+    placings = Placings._make(column[order] for column in placings)
+
+    team_points = {}
+    for g, gender in enumerate(GENDERS):
+        sel = placings.gender == g
+        schools, inverse = np.unique(placings.school[sel], return_inverse=True)
+        totals = np.bincount(inverse, weights=placings.points[sel], minlength=len(schools))
+        team_points[gender] = {int(s): float(t) for s, t in zip(schools, totals)}
+    return Projection(marks, mode, placings, team_points)
+
+
+def store_projection(conn, conference_id: int, season_year: int, projection: Projection, run_id=None):
+    """Replace the stored projection for (conference, season, mode); the caller commits."""
+    from psycopg2.extras import execute_values
+
+    p = projection.placings
+    marks = projection.marks
+    with conn.cursor() as cur:
+        cur.execute("SELECT slug, id FROM events")
+        event_ids = dict(cur.fetchall())
+        key = (conference_id, season_year, projection.mode)
+        cur.execute("DELETE FROM meet_projections WHERE conference_id = %s AND season_year = %s AND mode = %s", key)
+        cur.execute("DELETE FROM meet_projection_teams WHERE conference_id = %s AND season_year = %s AND mode = %s", key)
+        rows = [
+            (
+                *key,
+                run_id,
+                "M" if p.gender[i] == 0 else "F",
+                event_ids[marks.events[p.event[i]]],
+                int(p.place[i]),
+                None if p.relay[i] else int(p.entrant[i]),
+                int(p.school[i]),
+                round(float(p.value[i]), 4),
+                float(p.points[i]),
+            )
+            for i in range(len(p.place))
+        ]
+        if rows:
+            execute_values(
+                cur,
+                """INSERT INTO meet_projections
+                   (conference_id, season_year, mode, run_id, gender, event_id, place, athlete_id, school_id, value, points)
+                   VALUES %s""",
+                rows,
+                page_size=1000,
+            )
+        teams = [
+            (*key, run_id, "M" if gender == "men" else "F", school_id, points, rank)
+            for gender in GENDERS
+            for rank, (school_id, points) in enumerate(projection.standings(gender), start=1)
+        ]
+        if teams:
+            execute_values(
+                cur,
+                """INSERT INTO meet_projection_teams
+                   (conference_id, season_year, mode, run_id, gender, school_id, points, rank) VALUES %s""",
+                teams,
+            )
+    return len(rows)
+
+
+def refresh_projections(conn, conference_id: int, season_year: int, run_id=None, scoring: Scoring | None = None):
+    """Recompute and store both modes from the current marks (after a sync). Commits."""
+    marks = ConferenceMarks.load(conn, conference_id, season_year)
+    for mode in MODES:
+        store_projection(conn, conference_id, season_year, project(marks, mode, scoring), run_id)
+    conn.commit()
+
+
+def _parse_scratch(text: str):
+    athlete, _, slug = text.partition(":")
+    try:
+        return (int(athlete), slug) if slug else int(athlete)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"scratch must be ATHLETE_ID or ATHLETE_ID:EVENT, got {text!r}")
+
+
+def _parse_relay_scratch(text: str):
+    school, _, slug = text.partition(":")
+    try:
+        return int(school), slug
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"relay scratch must be SCHOOL_ID:EVENT, got {text!r}")
+
+
+def _format_value(slug_higher: bool, value: float) -> str:
+    return f"{value:.2f}m" if slug_higher else f"{value:.2f}s"
+
+
+def print_projection(projection: Projection, events: bool = False):
+    marks = projection.marks
+    for gender in GENDERS:
+        print(f"=== Projected team scores: {gender} ({projection.mode}) ===")
+        for rank, (school_id, points) in enumerate(projection.standings(gender), start=1):
+            print(f"  {rank:2d}. {marks.schools.get(school_id, school_id)!s:<34} {points:6.1f}")
+        if events:
+            for slug in marks.events:
+                rows = projection.event_rows(slug, gender)
+                if not rows:
+                    continue
+                print(f"  {slug}:")
+                for place, entrant, school_id, value, points, relay in rows:
+                    who = "Relay" if relay else marks.athletes.get(entrant, (str(entrant), None))[0]
+                    school = marks.schools.get(school_id, school_id)
+                    higher = marks.higher[marks.events.index(slug)]
+                    print(f"    {place:2d}. {who:<26} {school!s:<28} {_format_value(higher, value):>9} {points:5.1f}")
+        print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Project conference-meet places and team points from current marks.")
+    parser.add_argument("--conference-id", type=int, default=1, help="conference id (default: 1)")
+    parser.add_argument("--year", type=int, default=None, help="season year (default: the conference's season_year)")
+    parser.add_argument("--mode", choices=MODES, default="pr", help="rank by season best (pr) or avg of last 3 (avg3)")
+    parser.add_argument("--table", type=parse_table, default=SCORING_TABLES["8-place"], help="scoring table name or points, e.g. 10,8,6,4,2,1")
+    parser.add_argument("--relay-table", type=parse_table, default=None, help="relay scoring table (default: --table)")
+    parser.add_argument("--entries", type=int, default=3, help="scoring entries per school per event (default: 3)")
+    parser.add_argument("--scratch", action="append", type=_parse_scratch, default=[], help="ATHLETE_ID or ATHLETE_ID:EVENT to leave out (repeatable)")
+    parser.add_argument("--scratch-relay", action="append", type=_parse_relay_scratch, default=[], help="SCHOOL_ID:EVENT relay to leave out (repeatable)")
+    parser.add_argument("--events", action="store_true", help="print placings for every event")
+    parser.add_argument("--store", action="store_true", help="save the projection to meet_projections (migrations/013)")
+    parser.add_argument("--bench", type=int, default=0, help="time N projections and report the median")
+    args = parser.parse_args()
+
+    import numpy as np  # after --help, which stays within the startup budget
+
+    from run import fetch_conference_season_year, get_db
+
+    conn = get_db()
+    try:
+        year = args.year or fetch_conference_season_year(conn, args.conference_id)
+        if year is None:
+            print(f"Conference {args.conference_id} not found.")
+            sys.exit(1)
+        t0 = time.perf_counter()
+        marks = ConferenceMarks.load(conn, args.conference_id, year)
+        load_ms = (time.perf_counter() - t0) * 1000
+        scoring = Scoring(args.table, args.relay_table, args.entries)
+        t0 = time.perf_counter()
+        projection = project(marks, args.mode, scoring, args.scratch, args.scratch_relay)
+        project_ms = (time.perf_counter() - t0) * 1000
+        print_projection(projection, args.events)
+        print(
+            f"{marks.individual.size} athlete-event and {marks.relays.size} relay entries; "
+            f"load {load_ms:.0f} ms, projection {project_ms:.1f} ms"
+        )
+        if args.bench:
+            times = []
+            for _ in range(args.bench):
+                t0 = time.perf_counter()
+                project(marks, args.mode, scoring, args.scratch, args.scratch_relay)
+                times.append((time.perf_counter() - t0) * 1000)
+            print(f"Projection over {args.bench} run(s): median {float(np.median(times)):.2f} ms")
+        if args.store:
+            if args.scratch or args.scratch_relay:
+                print("Not storing a what-if projection (scratches given); stored projections use the full entry lists.")
+            else:
+                n = store_projection(conn, args.conference_id, year, projection)
+                conn.commit()
+                print(f"Stored {n} placing(s) for conference {args.conference_id}, {year} ({args.mode}).")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+Manage season partitions of the marks table (see migrations/007_partition_marks_by_season.sql).
+
+Each season year lives in its own partition marks_y<YEAR> (mark_date from Jan 1 to the next Jan 1).
+Rolling over to a new season is a metadata operation: create the new partition, then detach,
+archive or drop whole older partitions instead of deleting marks row by row.
+
+  create   add the partition for a year (moves matching rows out of marks_default first)
+  detach   detach a year from marks; the table stays in public and can be re-attached
+  attach   re-attach a detached or archived year
+  archive  detach a year and move it to the marks_archive schema (kept, off the leaderboard)
+  drop     detach and drop a year (data is gone)
+  rollover create the new season's partition and archive (or drop) every older season
+
+Archived and detached partitions keep their athlete foreign keys (ON DELETE CASCADE), so
+prune_orphan_athletes (rollover --drop --prune-athletes, clear_marks_before_year.py) keeps every
+athlete still referenced by one of them; deleting those would cascade into the archive.
+
+Usage (from project root; DATABASE_URL in .env / .env.local):
+  python scraper/season_partitions.py list
+  python scraper/season_partitions.py create 2027
+  python scraper/season_partitions.py archive 2025
+  python scraper/season_partitions.py rollover --year 2027 [--keep 1] [--drop] [--prune-athletes]
+"""
+import argparse
+import re
+import sys
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+if str(SCRIPT_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPT_DIR))
+
+try:
+    from dotenv import load_dotenv
+    load_dotenv(PROJECT_ROOT / ".env")
+    load_dotenv(PROJECT_ROOT / ".env.local", override=True)
+except ImportError:
+    pass
+
+from run import get_db  # noqa: E402
+
+PARENT_TABLE = "marks"
+DEFAULT_PARTITION = "marks_default"
+ARCHIVE_SCHEMA = "marks_archive"
+_PARTITION_RE = re.compile(r"^marks_y(\d{4})$")
+
+
+def partition_name(year: int) -> str:
+    return f"marks_y{int(year)}"
+
+
+def _bounds(year: int) -> tuple[str, str]:
+    """Partition bounds for a season year: same calendar window as SEASON_MARK_MIN/MAX in run.py."""
+    return f"{int(year)}-01-01", f"{int(year) + 1}-01-01"
+
+
+def _table_schema(cur, name: str) -> str | None:
+    """Schema holding marks_y<YEAR> (public or marks_archive), or None if the table does not exist."""
+    cur.execute(
+        """SELECT n.nspname FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace
+           WHERE c.relname = %s AND n.nspname IN ('public', %s)""",
+        (name, ARCHIVE_SCHEMA),
+    )
+    row = cur.fetchone()
+    return row[0] if row else None
+
+
+def _is_attached(cur, name: str) -> bool:
+    cur.execute(
+        """SELECT 1 FROM pg_inherits i
+           JOIN pg_class c ON c.oid = i.inhrelid
+           JOIN pg_class p ON p.oid = i.inhparent
+           WHERE p.relname = %s AND c.relname = %s""",
+        (PARENT_TABLE, name),
+    )
+    return cur.fetchone() is not None
+
+
+def list_partitions(conn):
+    """
+    Return (year, schema, attached, approx_rows) for every season partition, attached or not.
+    Row counts are planner estimates (pg_class.reltuples) so listing never scans marks.
+    """
+    with conn.cursor() as cur:
+        cur.execute(
+            """SELECT c.relname, n.nspname, c.reltuples::bigint,
+                      EXISTS (SELECT 1 FROM pg_inherits i WHERE i.inhrelid = c.oid) AS attached
+               FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace
+               WHERE c.relkind = 'r' AND c.relname LIKE 'marks\\_y%%'
+                 AND n.nspname IN ('public', %s)""",
+            (ARCHIVE_SCHEMA,),
+        )
+        rows = cur.fetchall()
+    partitions = []
+    for relname, schema, approx_rows, attached in rows:
+        m = _PARTITION_RE.match(relname)
+        if not m:
+            continue
+        partitions.append((int(m.group(1)), schema, attached, max(approx_rows, 0)))
+    return sorted(partitions)
+
+
+def create_season_partition(conn, year: int) -> bool:
+    """
+    Create marks_y<YEAR> as a partition of marks. Rows for that year already sitting in
+    marks_default are moved into it (Postgres refuses to create the partition otherwise).
+    Returns False if the partition already exists.
+    """
+    from psycopg2 import sql
+
+    name = partition_name(year)
+    lo, hi = _bounds(year)
+    with conn.cursor() as cur:
+        if _table_schema(cur, name):
+            return False
+        cur.execute(
+            "CREATE TEMP TABLE _season_rows (LIKE marks INCLUDING DEFAULTS) ON COMMIT DROP"
+        )
+        cur.execute(
+            sql.SQL(
+                """WITH moved AS (
+                     DELETE FROM {default} WHERE mark_date >= %s::date AND mark_date < %s::date RETURNING *
+                   )
+                   INSERT INTO _season_rows SELECT * FROM moved"""
+            ).format(default=sql.Identifier(DEFAULT_PARTITION)),
+            (lo, hi),
+        )
+        cur.execute(
+            sql.SQL("CREATE TABLE {part} PARTITION OF {parent} FOR VALUES FROM (%s) TO (%s)").format(
+                part=sql.Identifier(name), parent=sql.Identifier(PARENT_TABLE)
+            ),
+            (lo, hi),
+        )
+        cur.execute("INSERT INTO marks SELECT * FROM _season_rows")
+    conn.commit()
+    return True
+
+
+def detach_season_partition(conn, year: int) -> bool:
+    """
+    Detach marks_y<YEAR> from marks (table and rows are kept) and clear its athlete_event_stats.
+    Returns False if not attached.
+    """
+    from psycopg2 import sql
+
+    from athlete_stats import clear_season
+
+    name = partition_name(year)
+    with conn.cursor() as cur:
+        if not _is_attached(cur, name):
+            return False
+        cur.execute(
+            sql.SQL("ALTER TABLE {parent} DETACH PARTITION {part}").format(
+                parent=sql.Identifier(PARENT_TABLE), part=sql.Identifier(name)
+            )
+        )
+        clear_season(cur, year)
+    conn.commit()
+    return True
+
+
+def attach_season_partition(conn, year: int) -> bool:
+    """
+    Re-attach a detached or archived marks_y<YEAR> and rebuild its athlete_event_stats.
+    Returns False if missing or already attached.
+    """
+    from psycopg2 import sql
+
+    from athlete_stats import rebuild
+
+    name = partition_name(year)
+    lo, hi = _bounds(year)
+    with conn.cursor() as cur:
+        schema = _table_schema(cur, name)
+        if not schema or _is_attached(cur, name):
+            return False
+        if schema == ARCHIVE_SCHEMA:
+            cur.execute(
+                sql.SQL("ALTER TABLE {part} SET SCHEMA public").format(
+                    part=sql.Identifier(ARCHIVE_SCHEMA, name)
+                )
+            )
+        cur.execute(
+            sql.SQL("ALTER TABLE {parent} ATTACH PARTITION {part} FOR VALUES FROM (%s) TO (%s)").format(
+                parent=sql.Identifier(PARENT_TABLE), part=sql.Identifier(name)
+            ),
+            (lo, hi),
+        )
+    conn.commit()
+    rebuild(conn, year)
+    return True
+
+
+def archive_season_partition(conn, year: int) -> bool:
+    """
+    Detach marks_y<YEAR>, move it into the marks_archive schema and clear its athlete_event_stats.
+    Returns False if missing or already archived.
+    """
+    from psycopg2 import sql
+
+    from athlete_stats import clear_season
+
+    name = partition_name(year)
+    with conn.cursor() as cur:
+        schema = _table_schema(cur, name)
+        if schema != "public":
+            return False
+        cur.execute(sql.SQL("CREATE SCHEMA IF NOT EXISTS {}").format(sql.Identifier(ARCHIVE_SCHEMA)))
+        if _is_attached(cur, name):
+            cur.execute(
+                sql.SQL("ALTER TABLE {parent} DETACH PARTITION {part}").format(
+                    parent=sql.Identifier(PARENT_TABLE), part=sql.Identifier(name)
+                )
+            )
+        cur.execute(
+            sql.SQL("ALTER TABLE {part} SET SCHEMA {schema}").format(
+                part=sql.Identifier(name), schema=sql.Identifier(ARCHIVE_SCHEMA)
+            )
+        )
+        clear_season(cur, year)
+    conn.commit()
+    return True
+
+
+def drop_season_partition(conn, year: int) -> bool:
+    """
+    Detach (if needed) and drop marks_y<YEAR>, wherever it lives, plus that season's relay_results
+    and athlete_event_stats. Returns False if the partition is missing.
+    """
+    from psycopg2 import sql
+
+    from athlete_stats import clear_season
+
+    name = partition_name(year)
+    with conn.cursor() as cur:
+        schema = _table_schema(cur, name)
+        if not schema:
+            return False
+        if _is_attached(cur, name):
+            cur.execute(
+                sql.SQL("ALTER TABLE {parent} DETACH PARTITION {part}").format(
+                    parent=sql.Identifier(PARENT_TABLE), part=sql.Identifier(name)
+                )
+            )
+        cur.execute(sql.SQL("DROP TABLE {}").format(sql.Identifier(schema, name)))
+        cur.execute(
+            "DELETE FROM relay_results WHERE mark_date >= %s::date AND mark_date < %s::date", _bounds(year)
+        )
+        clear_season(cur, year)
+    conn.commit()
+    return True
+
+
+def prune_orphan_athletes(conn) -> int:
+    """
+    Delete athletes with no marks or relay runs left, counting the marks in detached and archived
+    partitions too: they still reference athletes(id) ON DELETE CASCADE, so pruning an athlete
+    that only appears there would delete its archived marks.
+    """
+    # Names come from list_partitions (marks_y<YEAR> in public or marks_archive), safe to quote here
+    kept = [f'"{schema}"."{partition_name(y)}"' for y, schema, attached, _rows in list_partitions(conn) if not attached]
+    archived = "".join(
+        f"\n                 AND NOT EXISTS (SELECT 1 FROM {table} p WHERE p.athlete_id = a.id)" for table in kept
+    )
+    with conn.cursor() as cur:
+        cur.execute(
+            """DELETE FROM athletes a
+               WHERE NOT EXISTS (SELECT 1 FROM marks m WHERE m.athlete_id = a.id)
+                 AND NOT EXISTS (SELECT 1 FROM relay_result_members r WHERE r.athlete_id = a.id)"""
+            + archived
+        )
+        deleted = cur.rowcount
+    conn.commit()
+    return deleted
+
+
+def rollover(conn, year: int, keep: int = 1, drop: bool = False) -> list[tuple[str, int]]:
+    """
+    Make `year` the live season: ensure its partition (and next year's) exist, then archive
+    (or drop) every attached season older than the newest `keep` seasons ending at `year`.
+    Returns the actions taken as (action, year) pairs.
+    """
+    actions = []
+    for y in (year, year + 1):
+        if create_season_partition(conn, y):
+            actions.append(("created", y))
+    oldest_kept = year - max(keep, 1) + 1
+    for y, schema, attached, _rows in list_partitions(conn):
+        if y >= oldest_kept or not attached:
+            continue
+        if drop:
+            drop_season_partition(conn, y)
+            actions.append(("dropped", y))
+        else:
+            archive_season_partition(conn, y)
+            actions.append(("archived", y))
+    return actions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage season partitions of the marks table.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="list season partitions and whether they are attached")
+    for cmd, help_text in (
+        ("create", "create the partition for a season year"),
+        ("detach", "detach a season year from marks (keeps the table)"),
+        ("attach", "re-attach a detached or archived season year"),
+        ("archive", "detach a season year and move it to the marks_archive schema"),
+        ("drop", "detach and drop a season year"),
+    ):
+        p = sub.add_parser(cmd, help=help_text)
+        p.add_argument("year", type=int)
+    p = sub.add_parser("rollover", help="start a new season: create its partition, archive older ones")
+    p.add_argument("--year", type=int, required=True, help="new live season year")
+    p.add_argument("--keep", type=int, default=1, help="number of seasons to keep attached (default: 1)")
+    p.add_argument("--drop", action="store_true", help="drop older seasons instead of archiving them")
+    p.add_argument(
+        "--prune-athletes",
+        action="store_true",
+        help="with --drop: delete athletes left with no marks",
+    )
+    args = parser.parse_args()
+
+    if args.command == "rollover" and args.prune_athletes and not args.drop:
+        print("--prune-athletes requires --drop (archived seasons still reference their athletes)")
+        sys.exit(1)
+
+    conn = get_db()
+    try:
+        if args.command == "list":
+            parts = list_partitions(conn)
+            if not parts:
+                print("No season partitions found. Run migrations/007_partition_marks_by_season.sql first.")
+            for y, schema, attached, approx_rows in parts:
+                state = "attached" if attached else ("archived" if schema == ARCHIVE_SCHEMA else "detached")
+                print(f"  {y}: {schema}.{partition_name(y)} {state} (~{approx_rows} rows)")
+        elif args.command == "rollover":
+            actions = rollover(conn, args.year, keep=args.keep, drop=args.drop)
+            for action, y in actions:
+                print(f"  {action} {partition_name(y)}")
+            if not actions:
+                print("Nothing to do.")
+            if args.prune_athletes:
+                print(f"Deleted {prune_orphan_athletes(conn)} athlete row(s) with no marks remaining.")
+        else:
+            fn = {
+                "create": create_season_partition,
+                "detach": detach_season_partition,
+                "attach": attach_season_partition,
+                "archive": archive_season_partition,
+                "drop": drop_season_partition,
+            }[args.command]
+            done = fn(conn, args.year)
+            print(f"{args.command} {partition_name(args.year)}: {'done' if done else 'nothing to do'}")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Sharded conference syncs: split a conference's schools across several processes or CI runners
+that write into one shared scrape run.
+
+  1. sync_conference.py --start-run            creates the run and prints RUN_ID=<id>
+  2. sync_conference.py --run-id ID --shard i/N  (N of them, anywhere) each syncs its schools
+  3. sync_conference.py --run-id ID --finalize   marks the run complete once every shard has
+                                                 reported success, then refreshes derived tables
+
+Schools are partitioned deterministically: each school is weighted by its average fetch + parse
+time per view in school_fetch_stats (the last LOOKBACK_DAYS before the run started, so shards
+that start later still see the same weights; schools without history get the median), then
+assigned heaviest first to the least loaded shard (ties: lower school id, lower shard). Every
+shard computes the same split, so the shards never write the same school. Each shard records
+itself in scrape_run_shards (migrations/019_scrape_run_shards.sql); rerunning a shard skips the
+steps it already checkpointed in the shared run.
+"""
+import argparse
+
+LOOKBACK_DAYS = 30
+DEFAULT_COST_MS = 1000  # per school, when no school has fetch history yet
+
+
+def parse_shard(text: str) -> tuple[int, int]:
+    """'2/3' -> (2, 3); shards are numbered from 1."""
+    index, _, count = text.partition("/")
+    try:
+        index, count = int(index), int(count)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"shard must be I/N, e.g. 1/3, got {text!r}")
+    if not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(f"shard index must be between 1 and {count}, got {text!r}")
+    return index, count
+
+
+def load_costs(conn, run_id: int, school_ids, season_year: int) -> dict:
+    """{school_id: estimated ms} from fetch stats recorded before run_id started (views summed)."""
+    with conn.cursor() as cur:
+        cur.execute(
+            """SELECT f.school_id, SUM(f.avg_ms)::bigint FROM (
+                 SELECT school_id, view, AVG(COALESCE(fetch_ms, 0) + COALESCE(parse_ms, 0)) AS avg_ms
+                 FROM school_fetch_stats
+                 WHERE school_id = ANY(%s) AND season_year = %s
+                   AND fetched_at < (SELECT started_at FROM scrape_runs WHERE id = %s)
+                   AND fetched_at >= (SELECT started_at FROM scrape_runs WHERE id = %s) - make_interval(days => %s)
+                 GROUP BY school_id, view
+               ) f GROUP BY f.school_id""",
+            (list(school_ids), season_year, run_id, run_id, LOOKBACK_DAYS),
+        )
+        return {school_id: int(ms) for school_id, ms in cur.fetchall()}
+
+
+def partition(school_ids, costs: dict, count: int) -> tuple[list[list], list[int]]:
+    """Split school_ids into count shards of similar total cost: (shards, estimated ms per shard). Same input, same split."""
+    known = sorted(costs[s] for s in school_ids if s in costs)
+    default = known[len(known) // 2] if known else DEFAULT_COST_MS
+    weighted = sorted(((costs.get(s, default), s) for s in school_ids), key=lambda w: (-w[0], w[1]))
+    shards = [[] for _ in range(count)]
+    loads = [0] * count
+    for cost, school_id in weighted:
+        i = min(range(count), key=lambda k: (loads[k], k))
+        shards[i].append(school_id)
+        loads[i] += cost
+    return shards, loads
+
+
+def shard_schools(conn, run_id: int, schools, season_year: int, index: int, count: int):
+    """The (school_id, team_id, name) rows of shard index (1-based) of count, and the shard's estimated ms."""
+    costs = load_costs(conn, run_id, [s[0] for s in schools], season_year)
+    shards, loads = partition([s[0] for s in schools], costs, count)
+    mine = set(shards[index - 1])
+    return [s for s in schools if s[0] in mine], loads[index - 1]
+
+
+def record_shard(conn, run_id: int, index: int, count: int, status: str, schools: int = 0, processed: int = 0,
+                 est_cost_ms: int | None = None, error_message: str | None = None):
+    """Insert or update this shard's row in scrape_run_shards. Commits."""
+    with conn.cursor() as cur:
+        cur.execute(
+            """INSERT INTO scrape_run_shards
+                 (run_id, shard_index, shard_count, status, schools, schools_processed, est_cost_ms, error_message)
+               VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+               ON CONFLICT (run_id, shard_index) DO UPDATE SET
+                 shard_count = EXCLUDED.shard_count, status = EXCLUDED.status, schools = EXCLUDED.schools,
+                 schools_processed = EXCLUDED.schools_processed,
+                 est_cost_ms = COALESCE(EXCLUDED.est_cost_ms, scrape_run_shards.est_cost_ms),
+                 error_message = EXCLUDED.error_message,
+                 started_at = CASE WHEN EXCLUDED.status = 'running' THEN NOW() ELSE scrape_run_shards.started_at END,
+                 finished_at = CASE WHEN EXCLUDED.status = 'running' THEN NULL ELSE NOW() END""",
+            (run_id, index, count, status, schools, processed, est_cost_ms, error_message),
+        )
+    conn.commit()
+
+
+def shard_report(conn, run_id: int, expected: int | None = None) -> tuple[list[str], int]:
+    """
+    (problems, schools processed) for the run's shards: a problem for every shard that is missing,
+    still running or failed, or reported a different shard count. expected defaults to the count
+    the shards reported.
+    """
+    with conn.cursor() as cur:
+        cur.execute(
+            """SELECT shard_index, shard_count, status, schools_processed, error_message
+               FROM scrape_run_shards WHERE run_id = %s ORDER BY shard_index""",
+            (run_id,),
+        )
+        rows = cur.fetchall()
+    counts = {count for _i, count, *_rest in rows}
+    if expected is None:
+        if not rows:
+            return [f"no shard has reported for run {run_id}"], 0
+        expected = max(counts)
+    problems = [f"shards disagree on the shard count: {sorted(counts)}"] if len(counts) > 1 else []
+    by_index = {index: (status, processed, error) for index, _count, status, processed, error in rows}
+    for index in range(1, expected + 1):
+        if index not in by_index:
+            problems.append(f"shard {index}/{expected} has not reported")
+            continue
+        status, _processed, error = by_index[index]
+        if status != "success":
+            problems.append(f"shard {index}/{expected} is {status}" + (f": {error}" if error else ""))
+    return problems, sum(processed for _status, processed, _error in by_index.values())
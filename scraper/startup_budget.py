@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Startup budget for the scraper CLI tools: runs each tool with --help under `python -X importtime`
+and reports the time spent importing modules beyond a bare interpreter, with the heaviest
+top-level imports. Heavy dependencies (requests, bs4, lxml, numpy, psycopg2, playwright)
+should only load once a tool actually fetches, parses or writes, so --help must stay in budget.
+
+Usage (from project root):
+  python scraper/startup_budget.py [--runs 5] [--tool inspect_all_events.py ...] [--top 3]
+
+Exits 1 if any tool's median import time is over its budget.
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+
+# Tool -> import budget in ms for `<tool> --help` (on top of interpreter startup)
+BUDGETS_MS = {
+    "inspect_all_events.py": 30,
+    "inspect_event_headers.py": 30,
+    "diagnose_parser.py": 30,
+    "diagnostics.py": 30,
+    "clear_marks_before_year.py": 30,
+    "season_partitions.py": 30,
+    "benchmark_stats.py": 30,
+    "athlete_stats.py": 30,
+    "progressions.py": 30,
+    "meets.py": 30,
+    "golden.py": 30,
+    "sync_school.py": 40,
+    "sync_conference.py": 40,
+    "sync_orchestrator.py": 40,
+    "replay_server.py": 120,  # http.server (stdlib) is most of it
+    "bench_fetch.py": 200,
+    "scoring.py": 30,
+    "leaderboard.py": 30,
+}
+
+_IMPORTTIME = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)")
+
+
+def import_times(argv) -> list[tuple[str, int]]:
+    """(module, cumulative us) for each top-level import made while running argv."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *argv],
+        capture_output=True,
+        text=True,
+        cwd=SCRIPT_DIR.parent,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": ""},
+    )
+    out = []
+    for line in proc.stderr.splitlines():
+        m = _IMPORTTIME.match(line)
+        if m and len(m.group(3)) == 1:
+            out.append((m.group(4), int(m.group(2))))
+    return out
+
+
+def measure(tool: str, baseline: set, runs: int) -> tuple[float, list[tuple[str, float]]]:
+    """(median ms of imports beyond the baseline, heaviest imports from the last run)."""
+    totals, modules = [], []
+    for _ in range(runs):
+        modules = [(name, us / 1000) for name, us in import_times([str(SCRIPT_DIR / tool), "--help"]) if name not in baseline]
+        totals.append(sum(ms for _name, ms in modules))
+    return statistics.median(totals), sorted(modules, key=lambda m: -m[1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check import-time startup budgets of the scraper tools.")
+    parser.add_argument("--tool", action="append", choices=sorted(BUDGETS_MS), default=None, help="tool to measure (repeatable; default: all)")
+    parser.add_argument("--runs", type=int, default=5, help="runs per tool, median reported (default: 5)")
+    parser.add_argument("--top", type=int, default=3, help="heaviest imports to list per tool (default: 3)")
+    args = parser.parse_args()
+
+    # Modules the interpreter imports on its own (site, .pth hooks) are not charged to the tools
+    baseline = {name for name, _us in import_times(["-c", "pass"])}
+    # Byte-compile once so the first run does not pay for it
+    subprocess.run([sys.executable, "-m", "compileall", "-q", str(SCRIPT_DIR)], check=False)
+
+    over = 0
+    print(f"{'tool':<28} {'import ms':>10} {'budget':>7}  heaviest imports")
+    for tool in args.tool or list(BUDGETS_MS):
+        total, modules = measure(tool, baseline, args.runs)
+        budget = BUDGETS_MS[tool]
+        status = "" if total <= budget else "  OVER"
+        over += total > budget
+        heaviest = ", ".join(f"{name} {ms:.1f}" for name, ms in modules[: args.top])
+        print(f"{tool:<28} {total:>10.1f} {budget:>7}  {heaviest}{status}")
+    if over:
+        print(f"\n{over} tool(s) over their startup budget.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
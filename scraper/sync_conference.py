@@ -4,13 +4,39 @@ Fetch and load marks for all schools in the conference from the database.
 Uses Playwright (like sync_school.py) so Angular team-summary pages render correctly.
 Skips schools whose athletic_net_team_id starts with "PLACEHOLDER".
 
+Each (school, view) step is checkpointed in scrape_run_steps (migrations/008). Failed steps are
+retried with backoff; if the process dies or steps still fail, --resume continues that run from
+the first incomplete step instead of starting over at school 1. After a successful run the
+conference's benchmark_stats, stored meet projections and athlete progression series are brought
+up to date (benchmark_stats.py, scoring.py, progressions.py; --no-benchmarks / --no-projections /
+--no-progressions skip them), as is school_meets. With --incremental only schools with a meet
+since their last sync are fetched (meets.py); without it every school is re-fetched.
+
+One conference sync can be split across workers (shards.py): --start-run creates a shared run and
+prints its id, each worker runs --run-id ID --shard i/N for its deterministic, cost-balanced share
+of the schools, and --run-id ID --finalize marks the run complete (and refreshes the derived
+tables) only once every shard has reported success.
+
 Usage (from project root; DATABASE_URL in .env.local):
-  python scraper/sync_conference.py [--year YEAR] [--conference-id ID] [--gender GENDER] [--no-save-fixtures]
+  python scraper/sync_conference.py [--year YEAR] [--conference-id ID] [--gender GENDER] [--no-save-fixtures] [--resume]
+                                    [--quarantine db|jsonl|off] [--change-feed both|db|jsonl|off]
+                                    [--top-n N] [--write-queue N] [--no-projections] [--no-benchmarks]
+                                    [--no-progressions] [--min-interval SEC] [--max-interval SEC]
+                                    [--incremental [--settle-days N] [--max-age-days N] [--probe N]]
+                                    [--start-run | --run-id ID (--shard I/N | --finalize)]
 
 Example:
   python scraper/sync_conference.py
   python scraper/sync_conference.py --year 2026 --gender men
   python scraper/sync_conference.py --gender women --no-save-fixtures
+  python scraper/sync_conference.py --resume
+  python scraper/sync_conference.py --incremental
+  python scraper/sync_conference.py --start-run                 # prints RUN_ID=42
+  python scraper/sync_conference.py --run-id 42 --shard 1/3     # one per worker: 1/3, 2/3, 3/3
+  python scraper/sync_conference.py --run-id 42 --finalize
+
+To sync several conferences/seasons in one process see sync_orchestrator.py. To run against
+recorded pages instead of the live site, start replay_server.py and pass --base-url.
 
 Requires: pip install playwright && python -m playwright install chromium
 """
@@ -33,11 +59,235 @@ if str(SCRIPT_DIR) not in sys.path:
     sys.path.insert(0, str(SCRIPT_DIR))
 
 
+def real_schools(schools):
+    """Drop schools whose athletic_net_team_id is still a seed placeholder."""
+    return [
+        (school_id, team_id, name)
+        for school_id, team_id, name in schools
+        if not (str(team_id).upper().startswith("PLACEHOLDER"))
+    ]
+
+
+def views_for_gender(gender: str) -> tuple[str, ...]:
+    """Team-summary tabs to fetch for --gender (the Relays tab holds both genders)."""
+    if gender == "men":
+        return ("men", "relays")
+    if gender == "women":
+        return ("women", "relays")
+    return ("men", "women", "relays")
+
+
+# Parse/upsert steps per fetched view: (label, gender). The Relays tab holds both genders.
+VIEW_LOADS = {
+    "men": (("men", "men"),),
+    "women": (("women", "women"),),
+    "relays": (("relays (men)", "men"), ("relays (women)", "women")),
+}
+
+
+def sync_school_views(
+    fetcher,
+    conn,
+    school_ids,
+    team_id,
+    season_year: int,
+    gender: str,
+    run_id=None,
+    done=frozenset(),
+    save_fixtures: bool = True,
+    attempts: int = 3,
+    quarantine=None,
+    feed=None,
+    writer=None,
+    school_label: str = "",
+    on_result=None,
+):
+    """
+    Fetch, parse and upsert each team-summary view, one checkpointed step per view.
+    fetcher is a tiered_fetch.TieredFetcher: plain HTTP first, else one browser page load per
+    team with each tab read from it. The tier used is logged to school_fetch_stats.
+
+    Each parsed view is upserted for every school_id sharing the team page. Views already in
+    `done` as (school_id, season_year, view) for all school_ids are skipped. A step that still
+    fails after `attempts` tries (with backoff) is reported and left un-checkpointed for --resume.
+    Parser and validation rejects go to quarantine (quarantine.Quarantine) and new PRs, school
+    bests and top-N entries to feed (change_feed.ChangeFeed) when given.
+
+    With a writer (db_writer.BackgroundWriter) only fetching happens here: the fetched views go
+    to it as one SchoolWrite (labelled school_label) and are written and committed once on the
+    writer's connection while the caller fetches the next team. on_result(view, FetchResult) is
+    called for each view fetched (e.g. meets.MeetPlanner picking up new meets). Returns (views
+    fetched, views failed).
+    """
+    from db_writer import SchoolWrite, write_school
+    from fetch_rendered_html import fixture_path
+    from run import with_retries
+
+    fetched = failed = 0
+    job = SchoolWrite(school_label, list(school_ids), season_year, run_id)
+    for view in views_for_gender(gender):
+        if all((school_id, season_year, view) in done for school_id in school_ids):
+            continue
+
+        loads = [(label, g) for label, g in VIEW_LOADS[view] if gender == "all" or g == gender]
+
+        def step():
+            result = fetcher.fetch(team_id, season_year, view, [g for _label, g in loads], school_id=school_ids[0])
+            if save_fixtures:
+                with open(fixture_path(team_id, season_year, view), "w", encoding="utf-8") as f:
+                    f.write(result.html)
+            if on_result is not None:
+                on_result(view, result)
+            if writer is not None:
+                job.views.append((view, loads, result))
+            else:
+                write_school(
+                    conn, SchoolWrite("", job.school_ids, season_year, run_id, [(view, loads, result)]), quarantine, feed
+                )
+
+        def reset(*_args):
+            fetcher.invalidate()
+            if writer is not None:
+                return
+            conn.rollback()
+            if quarantine is not None:
+                quarantine.discard()
+            if feed is not None:
+                feed.discard()
+
+        fetched += 1
+        try:
+            with_retries(step, attempts=attempts, on_retry=reset)
+        except Exception as e:
+            reset()
+            failed += 1
+            print(f"  Warning: {view} failed after {attempts} attempt(s): {e}")
+    if writer is not None and job.views:
+        writer.submit(job)
+    return fetched, failed
+
+
+def start_or_resume_run(conn, target: str, resume: bool):
+    """Return (run_id, done_steps): the reopened unfinished run for target with --resume, else a new run."""
+    from run import completed_steps, find_resumable_run, start_run
+
+    if resume:
+        run_id = find_resumable_run(conn, target)
+        if run_id is not None:
+            done = completed_steps(conn, run_id)
+            print(f"Resuming run {run_id} ({target}): {len(done)} step(s) already complete.")
+            return run_id, done
+        print(f"No unfinished run for {target}; starting a new one.")
+    run_id = start_run(conn, target)
+    conn.commit()
+    return run_id, set()
+
+
+def format_failures(failed_steps: int, failed_writes: int) -> str:
+    """e.g. "2 failed step(s), 1 team page(s) not written": fetch steps and writer jobs are counted apart."""
+    parts = []
+    if failed_steps:
+        parts.append(f"{failed_steps} failed step(s)")
+    if failed_writes:
+        parts.append(f"{failed_writes} team page(s) not written")
+    return ", ".join(parts)
+
+
+def finish_run_safely(conn, run_id, status, processed, error_message=None):
+    """finish_run, tolerating a dead connection (the run then stays resumable as 'running')."""
+    from run import finish_run
+
+    try:
+        conn.rollback()
+        finish_run(conn, run_id, status, processed, error_message)
+    except Exception as e:
+        print(f"Warning: could not record run {run_id} as {status}: {e}")
+
+
+def finish_shard_safely(conn, run_id, shard, status, schools, processed, est_cost_ms, error_message=None):
+    """shards.record_shard, tolerating a dead connection (--finalize then reports the shard as still running)."""
+    from shards import record_shard
+
+    try:
+        conn.rollback()
+        record_shard(conn, run_id, *shard, status, schools, processed, est_cost_ms, error_message)
+    except Exception as e:
+        print(f"Warning: could not record shard {shard[0]}/{shard[1]} of run {run_id} as {status}: {e}")
+
+
+def finalize_sharded_run(conn, run_id, args) -> bool:
+    """Mark a sharded run complete if every shard reported success, then refresh derived tables."""
+    from shards import shard_report
+
+    problems, processed = shard_report(conn, run_id)
+    if problems:
+        for problem in problems:
+            print(f"  {problem}")
+        finish_run_safely(conn, run_id, "failed", processed, "; ".join(problems))
+        print(f"Run {run_id} is not complete; rerun the failed shards, then --finalize again.")
+        return False
+    finish_run_safely(conn, run_id, "success", processed)
+    print(f"Run {run_id}: all shards succeeded ({processed} school(s)).")
+    refresh_derived_safely(
+        conn,
+        [(args.conference_id, args.year)],
+        run_id,
+        not args.no_projections,
+        not args.no_benchmarks,
+        not args.no_progressions,
+    )
+    return True
+
+
+def refresh_derived_safely(conn, targets, run_id=None, projections=True, benchmarks=True, progressions=True):
+    """
+    After a successful sync, bring the tables derived from marks up to date for each
+    (conference_id, season): school_meets (meets.py), benchmark_stats (benchmark_stats.py, changed rows only), the
+    stored meet projections (scoring.py) and the progression series of athletes whose marks
+    changed (progressions.py). A failure is reported but does not fail the sync.
+    """
+    from meets import refresh_school_meets
+
+    steps = [("school meets", lambda conf, season: refresh_school_meets(conn, conf, season, run_id))]
+    if benchmarks:
+        from benchmark_stats import refresh_benchmark_stats
+
+        steps.append(("benchmarks", lambda conf, season: refresh_benchmark_stats(conn, conf, season)))
+    if projections:
+        from scoring import refresh_projections
+
+        steps.append(("meet projections", lambda conf, season: refresh_projections(conn, conf, season, run_id)))
+    if progressions:
+        from progressions import refresh_progressions
+
+        steps.append(("progressions", lambda conf, season: refresh_progressions(conn, conf, season)))
+    for conference_id, season in targets:
+        for label, step in steps:
+            t0 = time.perf_counter()
+            try:
+                step(conference_id, season)
+            except Exception as e:
+                try:
+                    conn.rollback()
+                except Exception:
+                    pass
+                print(f"Warning: could not refresh {label} for conference {conference_id}, {season}: {e}")
+                continue
+            print(f"Refreshed {label} for conference {conference_id}, {season} ({(time.perf_counter() - t0) * 1000:.0f} ms).")
+
+
 def main():
+    from change_feed import ChangeFeed, add_feed_arguments
+    from change_feed import format_counts as format_feed_counts
+    from quarantine import Quarantine, add_sink_argument, format_counts
+    from meets import MeetPlanner, add_meet_arguments
+    from rate_limit import add_rate_arguments, configure_from_args, limiter
+    from shards import parse_shard, shard_schools
+
     parser = argparse.ArgumentParser(
         description="Fetch and load all marks for every school in the conference (Playwright)."
     )
-    parser.add_argument("--year", default="2026", help="season year (default: 2026)")
+    parser.add_argument("--year", type=int, default=2026, help="season year (default: 2026)")
     parser.add_argument("--conference-id", type=int, default=1, help="conference id (default: 1)")
     parser.add_argument(
         "--gender",
@@ -50,94 +300,262 @@ def main():
         action="store_true",
         help="do not write HTML files to scraper/fixtures",
     )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="continue the last unfinished run for this conference/year, skipping completed steps",
+    )
+    parser.add_argument(
+        "--fetch-tier",
+        choices=("auto", "http", "browser"),
+        default="auto",
+        help="auto: plain HTTP first, browser when needed (default); http: never launch a browser; browser: always",
+    )
+    parser.add_argument(
+        "--browser-profile",
+        default=None,
+        help="Chromium profile dir to keep HTTP cache/service workers across runs (default: in-memory)",
+    )
+    parser.add_argument(
+        "--block-resources",
+        action="store_true",
+        help="abort image/font/media requests (routing every request turns off the browser HTTP cache)",
+    )
+    parser.add_argument(
+        "--attempts",
+        type=int,
+        default=3,
+        help="tries per (school, view) step before giving up, with exponential backoff (default: 3)",
+    )
+    parser.add_argument(
+        "--base-url",
+        default=None,
+        help="athletic.net origin to fetch from, e.g. a replay_server.py URL (default: ATHLETIC_NET_BASE_URL or live site)",
+    )
+    parser.add_argument(
+        "--no-projections",
+        action="store_true",
+        help="do not refresh meet_projections (scoring.py) after a successful sync",
+    )
+    parser.add_argument(
+        "--no-benchmarks",
+        action="store_true",
+        help="do not refresh benchmark_stats (benchmark_stats.py) after a successful sync",
+    )
+    parser.add_argument(
+        "--no-progressions",
+        action="store_true",
+        help="do not rebuild athlete_progressions (progressions.py) after a successful sync",
+    )
+    add_sink_argument(parser)
+    add_feed_arguments(parser)
+    add_rate_arguments(parser)
+    add_meet_arguments(parser)
+    parser.add_argument(
+        "--write-queue",
+        type=int,
+        default=2,
+        help="team pages that may wait for the background DB writer while the next is fetched; 0 writes inline (default: 2)",
+    )
+    parser.add_argument(
+        "--start-run",
+        action="store_true",
+        help="create a run for sharded workers to share, print RUN_ID=<id> and exit (see shards.py)",
+    )
+    parser.add_argument("--run-id", type=int, default=None, help="the shared run of --shard / --finalize")
+    parser.add_argument(
+        "--shard",
+        type=parse_shard,
+        default=None,
+        metavar="I/N",
+        help="sync only shard I of N of the conference's schools into --run-id (1-based, e.g. 2/3)",
+    )
+    parser.add_argument(
+        "--finalize",
+        action="store_true",
+        help="mark --run-id complete if every shard succeeded, then refresh derived tables",
+    )
     args = parser.parse_args()
+    if (args.shard or args.finalize) and args.run_id is None:
+        parser.error("--shard and --finalize need --run-id (create one with --start-run)")
+    if args.run_id is not None and not (args.shard or args.finalize):
+        parser.error("--run-id needs --shard or --finalize")
+    if sum((args.start_run, bool(args.shard), args.finalize)) > 1:
+        parser.error("--start-run, --shard and --finalize are separate steps")
+    if args.shard and args.resume:
+        parser.error("a rerun of --shard already skips the steps it completed; drop --resume")
 
-    try:
-        from playwright.sync_api import sync_playwright
-    except ImportError:
-        print("Install Playwright: pip install playwright && python -m playwright install chromium")
-        sys.exit(1)
+    if args.start_run or args.finalize:
+        from run import get_db, start_run
+
+        conn = get_db()
+        try:
+            if args.start_run:
+                run_id = start_run(conn, f"{args.conference_id}:{args.year}")
+                conn.commit()
+                print(f"RUN_ID={run_id}")
+            elif not finalize_sharded_run(conn, args.run_id, args):
+                sys.exit(1)
+        finally:
+            conn.close()
+        return
+
+    if args.fetch_tier != "http":
+        try:
+            import playwright.sync_api  # noqa: F401
+        except ImportError:
+            print("Install Playwright: pip install playwright && python -m playwright install chromium")
+            sys.exit(1)
 
-    from run import fetch_schools, parse_team_summary, upsert_athletes_marks, get_db, RATE_LIMIT_SEC
-    from fetch_rendered_html import fetch_one, FIXTURES_DIR
+    from run import completed_steps, fetch_preferred_tiers, set_base_url, fetch_schools, get_db, RATE_LIMIT_SEC
+    from browser_pool import LazyBrowserPool
+    from tiered_fetch import TieredFetcher
+    from db_writer import BackgroundWriter
+    from fetch_rendered_html import FIXTURES_DIR
 
+    set_base_url(args.base_url)
+    rate = configure_from_args(args, RATE_LIMIT_SEC, workers=args.shard[1] if args.shard else 1)
     conn = get_db()
     try:
-        schools = fetch_schools(conn, conference_id=args.conference_id)
-    finally:
-        conn.close()
+        schools = real_schools(fetch_schools(conn, conference_id=args.conference_id))
+        if not schools:
+            print("No schools with real athletic.net team IDs found. Update seed or DB.")
+            sys.exit(1)
 
-    real_schools = [
-        (school_id, team_id, name)
-        for school_id, team_id, name in schools
-        if not (str(team_id).upper().startswith("PLACEHOLDER"))
-    ]
+        est_cost_ms = None
+        if args.shard:
+            index, count = args.shard
+            schools, est_cost_ms = shard_schools(conn, args.run_id, schools, args.year, index, count)
+            print(f"Shard {index}/{count} of run {args.run_id}: {len(schools)} school(s), ~{est_cost_ms / 1000:.0f}s estimated.")
 
-    if not real_schools:
-        print("No schools with real athletic.net team IDs found. Update seed or DB.")
-        sys.exit(1)
+        gender = args.gender
+        only = f" ({gender} only)" if gender != "all" else ""
+        print(
+            f"Found {len(schools)} school(s) to sync{only}. Rate limit: adaptive, "
+            f"{rate.interval:g}s between requests to start (floor {rate.min_interval:g}s"
+            + (f", {args.min_interval:g}s across all {args.shard[1]} shards)." if args.shard else ").")
+        )
+        os.makedirs(FIXTURES_DIR, exist_ok=True)
 
-    gender = args.gender
-    if gender != "all":
-        print(f"Found {len(real_schools)} school(s) to sync ({gender} only). Rate limit: {RATE_LIMIT_SEC}s between schools.")
-    else:
-        print(f"Found {len(real_schools)} school(s) to sync. Rate limit: {RATE_LIMIT_SEC}s between schools.")
-    os.makedirs(FIXTURES_DIR, exist_ok=True)
-    url_tpl = "https://www.athletic.net/team/{team_id}/track-and-field-outdoor/{year}/team-summary"
+        planner = None
+        if args.incremental:
+            planner = MeetPlanner.load(
+                conn,
+                [(school_id, args.year) for school_id, _team_id, _name in schools],
+                views_for_gender(gender),
+                args.settle_days,
+                args.max_age_days,
+                args.probe,
+            )
+            rank = {key: i for i, key in enumerate(planner.order(planner.last_sync))}
+            schools.sort(key=lambda school: rank[(school[0], args.year)])
+            print("Incremental: least recently synced schools first; skipping schools with no new meet they take part in.")
 
-    conn = get_db()
-    try:
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            page = browser.new_page()
-            page.set_extra_http_headers({"User-Agent": "ConferenceLeaderboard/1.0 (school use)"})
-
-            for i, (school_id, team_id, name) in enumerate(real_schools):
-                url = url_tpl.format(team_id=team_id, year=args.year)
-                print(f"[{i + 1}/{len(real_schools)}] {name} (team {team_id}) ...")
-
-                views_to_fetch = (
-                    ("men", "relays") if gender == "men"
-                    else ("women", "relays") if gender == "women"
-                    else ("men", "women", "relays")
-                )
-                html_by_view = {}
-                for view in views_to_fetch:
-                    try:
-                        html, out_path = fetch_one(page, url, view, str(team_id), args.year)
-                        html_by_view[view] = html
-                        if not args.no_save_fixtures:
-                            with open(out_path, "w", encoding="utf-8") as f:
-                                f.write(html)
-                    except Exception as e:
-                        print(f"  Warning: {view} failed: {e}")
-                        html_by_view[view] = ""
-
-                steps = (
-                    [("men", html_by_view.get("men", ""), "men"), ("relays (men)", html_by_view.get("relays", ""), "men")]
-                    if gender == "men"
-                    else [("women", html_by_view.get("women", ""), "women"), ("relays (women)", html_by_view.get("relays", ""), "women")]
-                    if gender == "women"
-                    else [
-                        ("men", html_by_view.get("men", ""), "men"),
-                        ("women", html_by_view.get("women", ""), "women"),
-                        ("relays (men)", html_by_view.get("relays", ""), "men"),
-                        ("relays (women)", html_by_view.get("relays", ""), "women"),
-                    ]
-                )
-                for label, html, g in steps:
-                    if not html:
-                        continue
-                    athletes = parse_team_summary(html, school_id, g)
-                    if athletes:
-                        upsert_athletes_marks(conn, school_id, g, athletes)
-                        print(f"  {label}: {len(athletes)} athletes")
+        if args.shard:
+            run_id, done = args.run_id, completed_steps(conn, args.run_id)
+            if done:
+                print(f"Run {run_id}: {len(done)} step(s) already complete.")
+        else:
+            run_id, done = start_or_resume_run(conn, f"{args.conference_id}:{args.year}", args.resume)
+
+        def finish(status, processed, error_message=None):
+            if args.shard:
+                finish_shard_safely(conn, run_id, args.shard, status, len(schools), processed, est_cost_ms, error_message)
+            else:
+                finish_run_safely(conn, run_id, status, processed, error_message)
 
-                if i < len(real_schools) - 1:
-                    time.sleep(RATE_LIMIT_SEC)
+        if args.shard:
+            finish("running", 0)
+        quarantine = Quarantine(args.quarantine, run_id)
+        feed = ChangeFeed(args.change_feed, run_id, args.top_n)
+        processed = failed_steps = failed_writes = skipped = 0
+        try:
+            fetcher = TieredFetcher(
+                mode=args.fetch_tier,
+                browser=LazyBrowserPool(size=1, profile_dir=args.browser_profile, block_resources=args.block_resources),
+                preferred=fetch_preferred_tiers(conn),
+            )
+            writer = (
+                BackgroundWriter(get_db, quarantine, feed, maxsize=args.write_queue, attempts=args.attempts)
+                if args.write_queue > 0
+                else None
+            )
+            try:
+                for i, (school_id, team_id, name) in enumerate(schools):
+                    if all((school_id, args.year, v) in done for v in views_for_gender(gender)):
+                        print(f"[{i + 1}/{len(schools)}] {name}: already synced in run {run_id}, skipping")
+                        processed += 1
+                        continue
+                    reason = planner.reason([school_id], args.year) if planner is not None else None
+                    if planner is not None and reason is None:
+                        print(f"[{i + 1}/{len(schools)}] {name}: no new meet it takes part in, skipping")
+                        skipped += 1
+                        continue
+                    print(f"[{i + 1}/{len(schools)}] {name} (team {team_id}{'; ' + reason if reason else ''}) ...")
+                    _fetched, failed = sync_school_views(
+                        fetcher,
+                        conn,
+                        [school_id],
+                        team_id,
+                        args.year,
+                        gender,
+                        run_id=run_id,
+                        done=done,
+                        save_fixtures=not args.no_save_fixtures,
+                        attempts=args.attempts,
+                        quarantine=quarantine,
+                        feed=feed,
+                        writer=writer,
+                        school_label=name,
+                        on_result=(lambda view, result: planner.observe_result(args.year, view, result)) if planner else None,
+                    )
+                    failed_steps += failed
+                    processed += 1
 
-            browser.close()
+                if writer is not None:
+                    writer.close()
+                    failed_writes = writer.failed
+                    print(
+                        f"DB writer: {writer.written} team page(s) written, {writer.failed} failed; "
+                        f"fetch loop waited {writer.wait_sec:.1f}s on it"
+                    )
+                print(
+                    f"Fetch tiers: {fetcher.tier_counts['http']} http, {fetcher.tier_counts['browser']} browser; "
+                    f"browser page loads: {fetcher.browser.page_loads}"
+                )
+                if quarantine.counts:
+                    print(f"Quarantined ({args.quarantine}): {format_counts(quarantine.counts)}")
+                if feed.counts:
+                    print(f"Change feed ({args.change_feed}): {format_feed_counts(feed.counts)}")
+                print(limiter().summary())
+                if planner is not None:
+                    print(f"Incremental: {len(schools) - skipped} of {len(schools)} school(s) fetched, {skipped} skipped.")
+            finally:
+                if writer is not None:
+                    writer.close()
+                fetcher.browser.close()
+        except BaseException as e:
+            finish("failed", processed, str(e) or type(e).__name__)
+            raise
 
+        rerun = "the same --shard command" if args.shard else "with --resume"
+        if failed_steps or failed_writes:
+            failures = format_failures(failed_steps, failed_writes)
+            finish("failed", processed, f"{failures}; rerun {rerun}")
+            print(f"Done with {failures}. Rerun {rerun} to retry them.")
+            sys.exit(1)
+        finish("success", processed)
+        if args.shard:
+            print(f"Shard {args.shard[0]}/{args.shard[1]} done. Run --finalize once every shard has reported.")
+            return
+        refresh_derived_safely(
+            conn,
+            [(args.conference_id, args.year)],
+            run_id,
+            not args.no_projections,
+            not args.no_benchmarks,
+            not args.no_progressions,
+        )
         print("Done.")
     finally:
         conn.close()
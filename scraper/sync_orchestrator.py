@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Sync several (conference, season) targets in one process.
+
+Schools are collected from every target and grouped by (athletic.net team ID, season), so a team
+that belongs to more than one conference is fetched once and loaded into each matching school row.
+All targets share one Playwright browser page and one DB connection, and each target uses its own
+season window (marks outside Jan 1 of the season .. Jan 1 of the next year are not stored).
+Steps are checkpointed like sync_conference.py; --resume continues the last unfinished run for
+the same target list. After a successful run each target's benchmark_stats, meet projections and
+athlete progression series are brought up to date (benchmark_stats.py, scoring.py, progressions.py),
+as is school_meets; --incremental only fetches team pages with a meet since their last sync (meets.py).
+
+Targets are CONFERENCE_ID[:SEASON_YEAR]; without a year the conference's season_year is used.
+
+Usage (from project root; DATABASE_URL in .env.local):
+  python scraper/sync_orchestrator.py TARGET [TARGET ...] [--gender GENDER] [--no-save-fixtures] [--resume]
+                                      [--quarantine db|jsonl|off] [--change-feed both|db|jsonl|off]
+                                      [--top-n N] [--write-queue N] [--no-projections] [--no-benchmarks]
+                                      [--no-progressions] [--min-interval SEC] [--max-interval SEC]
+                                      [--incremental [--settle-days N] [--max-age-days N] [--probe N]]
+
+Example:
+  python scraper/sync_orchestrator.py 1
+  python scraper/sync_orchestrator.py 1:2026 1:2025 2:2026 --no-save-fixtures
+
+Requires: pip install playwright && python -m playwright install chromium
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+try:
+    from dotenv import load_dotenv
+    load_dotenv(PROJECT_ROOT / ".env")
+    load_dotenv(PROJECT_ROOT / ".env.local", override=True)
+except ImportError:
+    pass
+
+if str(SCRIPT_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPT_DIR))
+
+
+def parse_target(text: str) -> tuple[int, int | None]:
+    """'1:2026' -> (1, 2026); '1' -> (1, None)."""
+    conf, _, year = text.partition(":")
+    try:
+        return int(conf), (int(year) if year else None)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"target must be CONFERENCE_ID[:SEASON_YEAR], got {text!r}")
+
+
+def build_fetch_plan(conn, targets):
+    """
+    Resolve targets to schools and group them by (team_id, season).
+    Returns (plan, resolved) where plan is an ordered dict
+    {(team_id, season): [(school_id, name, conference_id), ...]} and resolved the (conference_id, season) targets.
+    """
+    from run import fetch_conference_season_year, fetch_schools
+    from sync_conference import real_schools
+
+    plan = {}
+    seen_targets = set()
+    for conference_id, season in targets:
+        if season is None:
+            season = fetch_conference_season_year(conn, conference_id)
+            if season is None:
+                print(f"Warning: conference {conference_id} not found; skipping")
+                continue
+        if (conference_id, season) in seen_targets:
+            continue
+        seen_targets.add((conference_id, season))
+        for school_id, team_id, name in real_schools(fetch_schools(conn, conference_id)):
+            plan.setdefault((str(team_id), season), []).append((school_id, name, conference_id))
+    return plan, sorted(seen_targets)
+
+
+def main():
+    from change_feed import ChangeFeed, add_feed_arguments
+    from change_feed import format_counts as format_feed_counts
+    from quarantine import Quarantine, add_sink_argument, format_counts
+    from meets import MeetPlanner, add_meet_arguments
+    from rate_limit import add_rate_arguments, configure_from_args, limiter
+
+    parser = argparse.ArgumentParser(
+        description="Sync several (conference, season) targets, fetching each team page once."
+    )
+    parser.add_argument(
+        "targets",
+        nargs="+",
+        type=parse_target,
+        help="CONFERENCE_ID[:SEASON_YEAR], e.g. 1:2026 (year defaults to the conference's season_year)",
+    )
+    parser.add_argument(
+        "--gender",
+        choices=("all", "men", "women"),
+        default="all",
+        help="sync only men, only women, or all (default: all)",
+    )
+    parser.add_argument(
+        "--no-save-fixtures",
+        action="store_true",
+        help="do not write HTML files to scraper/fixtures",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="continue the last unfinished run for the same targets, skipping completed steps",
+    )
+    parser.add_argument(
+        "--fetch-tier",
+        choices=("auto", "http", "browser"),
+        default="auto",
+        help="auto: plain HTTP first, browser when needed (default); http: never launch a browser; browser: always",
+    )
+    parser.add_argument(
+        "--browser-profile",
+        default=None,
+        help="Chromium profile dir to keep HTTP cache/service workers across runs (default: in-memory)",
+    )
+    parser.add_argument(
+        "--block-resources",
+        action="store_true",
+        help="abort image/font/media requests (routing every request turns off the browser HTTP cache)",
+    )
+    parser.add_argument(
+        "--attempts",
+        type=int,
+        default=3,
+        help="tries per (school, view) step before giving up, with exponential backoff (default: 3)",
+    )
+    parser.add_argument(
+        "--base-url",
+        default=None,
+        help="athletic.net origin to fetch from, e.g. a replay_server.py URL (default: ATHLETIC_NET_BASE_URL or live site)",
+    )
+    parser.add_argument(
+        "--no-projections",
+        action="store_true",
+        help="do not refresh meet_projections (scoring.py) for each target after a successful sync",
+    )
+    parser.add_argument(
+        "--no-benchmarks",
+        action="store_true",
+        help="do not refresh benchmark_stats (benchmark_stats.py) for each target after a successful sync",
+    )
+    parser.add_argument(
+        "--no-progressions",
+        action="store_true",
+        help="do not rebuild athlete_progressions (progressions.py) for each target after a successful sync",
+    )
+    add_sink_argument(parser)
+    add_feed_arguments(parser)
+    add_rate_arguments(parser)
+    add_meet_arguments(parser)
+    parser.add_argument(
+        "--write-queue",
+        type=int,
+        default=2,
+        help="team pages that may wait for the background DB writer while the next is fetched; 0 writes inline (default: 2)",
+    )
+    args = parser.parse_args()
+
+    if args.fetch_tier != "http":
+        try:
+            import playwright.sync_api  # noqa: F401
+        except ImportError:
+            print("Install Playwright: pip install playwright && python -m playwright install chromium")
+            sys.exit(1)
+
+    from run import fetch_preferred_tiers, set_base_url, get_db, RATE_LIMIT_SEC
+    from browser_pool import LazyBrowserPool
+    from tiered_fetch import TieredFetcher
+    from db_writer import BackgroundWriter
+    from fetch_rendered_html import FIXTURES_DIR
+    from sync_conference import (
+        finish_run_safely,
+        format_failures,
+        refresh_derived_safely,
+        start_or_resume_run,
+        sync_school_views,
+        views_for_gender,
+    )
+
+    set_base_url(args.base_url)
+    rate = configure_from_args(args, RATE_LIMIT_SEC)
+    conn = get_db()
+    try:
+        plan, resolved = build_fetch_plan(conn, args.targets)
+        if not plan:
+            print("No schools with real athletic.net team IDs found for the given targets.")
+            sys.exit(1)
+
+        school_rows = sum(len(v) for v in plan.values())
+        print(
+            f"{len(plan)} team page(s) to fetch for {school_rows} school row(s) "
+            f"across {len(args.targets)} target(s). Rate limit: adaptive, "
+            f"{rate.interval:g}s between requests to start (floor {rate.min_interval:g}s)."
+        )
+        os.makedirs(FIXTURES_DIR, exist_ok=True)
+
+        planner = None
+        if args.incremental:
+            planner = MeetPlanner.load(
+                conn,
+                [(school_id, season) for (_team, season), rows in plan.items() for school_id, _name, _conf in rows],
+                views_for_gender(args.gender),
+                args.settle_days,
+                args.max_age_days,
+                args.probe,
+            )
+            rank = {key: i for i, key in enumerate(planner.order(planner.last_sync))}
+            plan = dict(
+                sorted(plan.items(), key=lambda item: min(rank[(sid, item[0][1])] for sid, _name, _conf in item[1]))
+            )
+            print("Incremental: least recently synced pages first; skipping pages with no new meet their schools take part in.")
+
+        target = ",".join(f"{conf}:{season}" for conf, season in resolved)
+        run_id, done = start_or_resume_run(conn, target, args.resume)
+        quarantine = Quarantine(args.quarantine, run_id)
+        feed = ChangeFeed(args.change_feed, run_id, args.top_n)
+        processed = failed_steps = failed_writes = skipped = 0
+        try:
+            fetcher = TieredFetcher(
+                mode=args.fetch_tier,
+                browser=LazyBrowserPool(size=1, profile_dir=args.browser_profile, block_resources=args.block_resources),
+                preferred=fetch_preferred_tiers(conn),
+            )
+            writer = (
+                BackgroundWriter(get_db, quarantine, feed, maxsize=args.write_queue, attempts=args.attempts)
+                if args.write_queue > 0
+                else None
+            )
+            try:
+                for i, ((team_id, season), schools) in enumerate(plan.items()):
+                    school_ids = [school_id for school_id, _name, _conf in schools]
+                    names = ", ".join(sorted({name for _id, name, _conf in schools}))
+                    if all((sid, season, v) in done for sid in school_ids for v in views_for_gender(args.gender)):
+                        print(f"[{i + 1}/{len(plan)}] {names} ({season}): already synced in run {run_id}, skipping")
+                        processed += 1
+                        continue
+                    reason = planner.reason(school_ids, season) if planner is not None else None
+                    if planner is not None and reason is None:
+                        print(f"[{i + 1}/{len(plan)}] {names} ({season}): no new meet, skipping")
+                        skipped += 1
+                        continue
+                    confs = ", ".join(str(c) for c in sorted({conf for _id, _name, conf in schools}))
+                    print(
+                        f"[{i + 1}/{len(plan)}] {names} (team {team_id}, {season}, conference {confs}"
+                        f"{'; ' + reason if reason else ''}) ..."
+                    )
+                    _fetched, failed = sync_school_views(
+                        fetcher,
+                        conn,
+                        school_ids,
+                        team_id,
+                        season,
+                        args.gender,
+                        run_id=run_id,
+                        done=done,
+                        save_fixtures=not args.no_save_fixtures,
+                        attempts=args.attempts,
+                        quarantine=quarantine,
+                        feed=feed,
+                        writer=writer,
+                        school_label=names,
+                        on_result=(
+                            (lambda view, result, season=season: planner.observe_result(season, view, result))
+                            if planner
+                            else None
+                        ),
+                    )
+                    failed_steps += failed
+                    processed += 1
+
+                if writer is not None:
+                    writer.close()
+                    failed_writes = writer.failed
+                    print(
+                        f"DB writer: {writer.written} team page(s) written, {writer.failed} failed; "
+                        f"fetch loop waited {writer.wait_sec:.1f}s on it"
+                    )
+                print(
+                    f"Fetch tiers: {fetcher.tier_counts['http']} http, {fetcher.tier_counts['browser']} browser; "
+                    f"browser page loads: {fetcher.browser.page_loads}"
+                )
+                if quarantine.counts:
+                    print(f"Quarantined ({args.quarantine}): {format_counts(quarantine.counts)}")
+                if feed.counts:
+                    print(f"Change feed ({args.change_feed}): {format_feed_counts(feed.counts)}")
+                print(limiter().summary())
+                if planner is not None:
+                    print(f"Incremental: {len(plan) - skipped} of {len(plan)} team page(s) fetched, {skipped} skipped.")
+            finally:
+                if writer is not None:
+                    writer.close()
+                fetcher.browser.close()
+        except BaseException as e:
+            finish_run_safely(conn, run_id, "failed", processed, str(e) or type(e).__name__)
+            raise
+
+        if failed_steps or failed_writes:
+            failures = format_failures(failed_steps, failed_writes)
+            finish_run_safely(conn, run_id, "failed", processed, f"{failures}; rerun with --resume")
+            print(f"Done with {failures}. Rerun with --resume to retry them.")
+            sys.exit(1)
+        finish_run_safely(conn, run_id, "success", processed)
+        refresh_derived_safely(
+            conn, resolved, run_id, not args.no_projections, not args.no_benchmarks, not args.no_progressions
+        )
+        print("Done.")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
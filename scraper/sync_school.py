@@ -4,11 +4,15 @@ Fetch men, women, and relays for one school with Playwright, then parse and upse
 all marks into the database in one run. Single command per school.
 
 Usage (from project root; DATABASE_URL in .env.local):
-  python scraper/sync_school.py <team_id> <school_id> [--year YEAR]
+  python scraper/sync_school.py <team_id> <school_id> [--year YEAR] [--record-har FILE] [--base-url URL]
+                                                  [--quarantine db|jsonl|off] [--change-feed both|db|jsonl|off]
 
 Example (Liberty Classical Academy, athletic.net team 73442, school_id 1):
   python scraper/sync_school.py 73442 1
   python scraper/sync_school.py 73442 1 --year 2026
+  python scraper/sync_school.py 73442 1 --record-har scraper/fixtures/team_73442_2026.har
+
+--record-har saves every response the page needed (HTML, JS, XHR) for replay_server.py.
 
 Requires: pip install playwright && python -m playwright install chromium
 """
@@ -31,17 +35,32 @@ if str(SCRIPT_DIR) not in sys.path:
 
 
 def main():
+    from change_feed import add_feed_arguments
+    from quarantine import add_sink_argument
+
     parser = argparse.ArgumentParser(
         description="Fetch and load all marks for one school (men, women, relays) in one run."
     )
     parser.add_argument("team_id", help="athletic.net team ID (e.g. 73442)")
     parser.add_argument("school_id", type=int, help="school id in your schools table")
-    parser.add_argument("--year", default="2026", help="season year (default: 2026)")
+    parser.add_argument("--year", type=int, default=2026, help="season year (default: 2026)")
     parser.add_argument(
         "--no-save-fixtures",
         action="store_true",
         help="do not write HTML files to scraper/fixtures (still fetches and loads)",
     )
+    parser.add_argument(
+        "--record-har",
+        default=None,
+        help="save all page responses to this HAR file (replay with replay_server.py --har)",
+    )
+    parser.add_argument(
+        "--base-url",
+        default=None,
+        help="athletic.net origin to fetch from, e.g. a replay_server.py URL (default: ATHLETIC_NET_BASE_URL or live site)",
+    )
+    add_sink_argument(parser)
+    add_feed_arguments(parser)
     args = parser.parse_args()
     team_id = args.team_id
     school_id = args.school_id
@@ -53,47 +72,70 @@ def main():
         print("Install Playwright: pip install playwright && python -m playwright install chromium")
         sys.exit(1)
 
-    from fetch_rendered_html import fetch_one, FIXTURES_DIR
-    from run import parse_team_summary, upsert_athletes_marks, get_db
+    from browser_pool import BrowserPool
+    from fetch_rendered_html import fixture_path, FIXTURES_DIR
+    from run import parse_view, upsert_view, get_db, set_base_url, team_summary_url
+    from change_feed import ChangeFeed
+    from change_feed import format_counts as format_feed_counts
+    from quarantine import Quarantine, format_counts
+    from validate import format_rejections
 
-    url = f"https://www.athletic.net/team/{team_id}/track-and-field-outdoor/{year}/team-summary"
+    set_base_url(args.base_url)
+    url = team_summary_url(team_id, year)
     os.makedirs(FIXTURES_DIR, exist_ok=True)
 
-    # 1. Fetch all three views in one browser session
+    # 1. Fetch all three views from one page load
     html_by_view = {}
     print(f"Fetching {url} ...")
     with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
-        page.set_extra_http_headers({"User-Agent": "ConferenceLeaderboard/1.0 (school use)"})
-        for view in ("men", "women", "relays"):
-            print(f"  {view} ...")
-            html, out_path = fetch_one(page, url, view, team_id, year)
-            html_by_view[view] = html
-            if not args.no_save_fixtures:
-                with open(out_path, "w", encoding="utf-8") as f:
-                    f.write(html)
-                print(f"    saved {len(html)} chars to {os.path.basename(out_path)}")
-        browser.close()
+        pool = BrowserPool(p, record_har=args.record_har)
+        with pool.session() as session:
+            for view in ("men", "women", "relays"):
+                print(f"  {view} ...")
+                html = session.view_html(url, view)
+                html_by_view[view] = html
+                if not args.no_save_fixtures:
+                    out_path = fixture_path(team_id, year, view)
+                    with open(out_path, "w", encoding="utf-8") as f:
+                        f.write(html)
+                    print(f"    saved {len(html)} chars to {os.path.basename(out_path)}")
+        pool.close()
+    if args.record_har:
+        print(f"  recorded HAR to {args.record_har}")
 
     # 2. Parse and upsert all four load steps with one DB connection
     conn = get_db()
+    quarantine = Quarantine(args.quarantine)
+    feed = ChangeFeed(args.change_feed, top_n=args.top_n)
     try:
-        total_athletes = 0
-        for label, (html, gender) in [
-            ("men", (html_by_view["men"], "men")),
-            ("women", (html_by_view["women"], "women")),
-            ("relays (men)", (html_by_view["relays"], "men")),
-            ("relays (women)", (html_by_view["relays"], "women")),
+        total_athletes = total_relays = 0
+        for label, view, gender in [
+            ("men", "men", "men"),
+            ("women", "women", "women"),
+            ("relays (men)", "relays", "men"),
+            ("relays (women)", "relays", "women"),
         ]:
-            athletes = parse_team_summary(html, school_id, gender)
-            if athletes:
-                upsert_athletes_marks(conn, school_id, gender, athletes)
-                total_athletes += len(athletes)
-                print(f"  {label}: {len(athletes)} athletes upserted")
+            kind = "relay results" if view == "relays" else "athletes"
+            rejects = []
+            rows = parse_view(html_by_view[view], view, gender, year, rejects)
+            quarantine.add_parse_rejects(rejects, school_id, gender, year)
+            if rows:
+                rejected = upsert_view(conn, school_id, view, gender, rows, year, quarantine=quarantine, feed=feed)
+                if view == "relays":
+                    total_relays += len(rows)
+                else:
+                    total_athletes += len(rows)
+                dropped = format_rejections(rejected)
+                print(f"  {label}: {len(rows)} {kind} upserted" + (f" (rejected {dropped})" if dropped else ""))
             else:
-                print(f"  {label}: no athletes parsed")
-        print(f"Done. Total athlete records upserted: {total_athletes}")
+                print(f"  {label}: no {kind} parsed")
+        if quarantine.flush(conn):
+            conn.commit()
+        if quarantine.counts:
+            print(f"Quarantined ({args.quarantine}): {format_counts(quarantine.counts)}")
+        if feed.counts:
+            print(f"Change feed ({args.change_feed}): {format_feed_counts(feed.counts)}")
+        print(f"Done. Total athlete records upserted: {total_athletes}; relay results: {total_relays}")
     finally:
         conn.close()
 
@@ -0,0 +1,73 @@
+"""
+Shared helpers for the scraper tests. Run from the project root: python -m pytest scraper/tests
+
+Nothing here needs a database: FakeConn answers the queries a test expects with canned rows.
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRAPER_DIR = Path(__file__).resolve().parent.parent
+if str(SCRAPER_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRAPER_DIR))
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self._rows = []
+        self.rowcount = -1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self.conn.executed.append((sql, params))
+        for marker, rows in self.conn.responses.items():
+            if marker in sql:
+                self._rows = list(rows(params) if callable(rows) else rows)
+                self.rowcount = len(self._rows)
+                return
+        self._rows = []
+        self.rowcount = 0
+
+    def fetchall(self):
+        return self._rows
+
+    def fetchone(self):
+        return self._rows[0] if self._rows else None
+
+
+class FakeConn:
+    """
+    responses: {SQL substring: rows or callable(params) -> rows}; the first matching substring wins.
+    values collects (sql, rows) of execute_values calls when the captured_values fixture is used.
+    """
+
+    def __init__(self, responses=None):
+        self.responses = dict(responses or {})
+        self.executed = []
+        self.values = []
+        self.commits = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        pass
+
+
+@pytest.fixture
+def captured_values(monkeypatch):
+    """Send psycopg2.extras.execute_values to the cursor's FakeConn.values instead of the server."""
+    extras = pytest.importorskip("psycopg2.extras")
+    monkeypatch.setattr(
+        extras, "execute_values", lambda cur, sql, rows, **_kwargs: cur.conn.values.append((sql, list(rows)))
+    )
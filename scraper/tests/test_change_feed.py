@@ -0,0 +1,85 @@
+import re
+from datetime import date
+
+import pytest
+
+from change_feed import ChangeFeed
+from conftest import FakeConn
+
+EVENT_100 = 1
+MEN_SCHOOL_BEST = 11.0
+
+pytestmark = pytest.mark.usefixtures("captured_values")
+
+
+def _feed(stored_prs, boards=()):
+    """stored_prs: [(athlete_id, gender, event_id, value)] already in athlete_event_stats (season 2026)."""
+    conn = FakeConn({
+        "FROM events": [(EVENT_100, False)],
+        "ROW_NUMBER()": lambda params: [(e, a, v) for a, g, e, v in boards if g == params[0]],
+        "FROM athlete_event_stats st": lambda params: [(a, e, v) for a, g, e, v in stored_prs if g == params[1]],
+    })
+    return ChangeFeed(sink="db", run_id=42, top_n=3), conn
+
+
+def _observe(feed, conn, gender, marks):
+    """Observe one batch of marks for school 7 and return the mark_events rows flush() writes."""
+    with conn.cursor() as cur:
+        feed.observe(cur, 7, gender, marks)
+    conn.values.clear()
+    feed.flush(conn)
+    rows = []
+    for sql, values in conn.values:
+        columns = re.search(r"INSERT INTO mark_events \(([^)]*)\)", sql).group(1).split(", ")
+        rows += [dict(zip(columns, row)) for row in values]
+    return rows
+
+
+def _kinds(rows):
+    return sorted(row["kind"] for row in rows)
+
+
+def test_first_mark_is_pr_school_best_and_top_n():
+    feed, conn = _feed([])
+    rows = _observe(feed, conn, "M", [(100, EVENT_100, date(2026, 3, 1), 11.4, "Opener")])
+    assert _kinds(rows) == ["pr", "school_best", "top_n"]
+    assert {(r["run_id"], r["athlete_id"], r["school_id"], r["gender"], r["season_year"]) for r in rows} == {
+        (42, 100, 7, "M", 2026)
+    }
+
+
+def test_school_best_is_per_gender():
+    # The men's school best is 11.0 (loaded with the men's page of the same run); a woman's first 12.5
+    # in the same event (events are shared by both genders) is still the women's school best
+    feed, conn = _feed([(100, "M", EVENT_100, MEN_SCHOOL_BEST)], boards=[(100, "M", EVENT_100, MEN_SCHOOL_BEST)])
+    assert _observe(feed, conn, "M", [(100, EVENT_100, date(2026, 3, 1), 11.2, None)]) == []
+    rows = _observe(feed, conn, "F", [(200, EVENT_100, date(2026, 3, 1), 12.5, "Opener")])
+    assert _kinds(rows) == ["pr", "school_best", "top_n"]
+    school_best = next(r for r in rows if r["kind"] == "school_best")
+    assert school_best["gender"] == "F" and school_best["previous_value"] is None
+
+
+def test_slower_mark_emits_nothing_and_repeat_is_idempotent():
+    feed, conn = _feed([(100, "M", EVENT_100, 11.0)], boards=[(100, "M", EVENT_100, 11.0)])
+    assert _observe(feed, conn, "M", [(100, EVENT_100, date(2026, 3, 1), 11.2, None)]) == []
+    rows = _observe(feed, conn, "M", [(100, EVENT_100, date(2026, 3, 8), 10.9, None)])
+    assert _kinds(rows) == ["pr", "school_best"]  # already on the board, so no new top_n entry
+    assert _observe(feed, conn, "M", [(100, EVENT_100, date(2026, 3, 8), 10.9, None)]) == []
+
+
+def test_best_of_batch_only():
+    feed, conn = _feed([])
+    rows = _observe(feed, conn, "M", [
+        (100, EVENT_100, date(2026, 3, 1), 11.6, None),
+        (100, EVENT_100, date(2026, 3, 8), 11.3, "Relays"),
+    ])
+    pr = next(r for r in rows if r["kind"] == "pr")
+    assert (pr["value"], pr["mark_date"], pr["meet_name"]) == (11.3, date(2026, 3, 8), "Relays")
+
+
+def test_top_n_rank_against_other_schools():
+    boards = [(i, "M", EVENT_100, v) for i, v in ((1, 10.8), (2, 10.9), (3, 11.1))]
+    feed, conn = _feed([], boards=boards)
+    rows = _observe(feed, conn, "M", [(100, EVENT_100, date(2026, 3, 1), 11.0, None)])
+    top_n = next(r for r in rows if r["kind"] == "top_n")
+    assert top_n["rank"] == 3
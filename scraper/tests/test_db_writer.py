@@ -0,0 +1,27 @@
+from collections import Counter
+
+from conftest import FakeConn
+from db_writer import SchoolWrite, write_school
+from tiered_fetch import FetchResult
+
+
+def test_write_school_sums_rejections_over_school_ids(monkeypatch, capsys):
+    import run
+
+    rejections = {1: Counter(out_of_season=2), 2: Counter(above_max=1)}
+    monkeypatch.setattr(run, "upsert_view", lambda conn, school_id, *args, **kwargs: rejections.get(school_id, Counter()))
+    monkeypatch.setattr(run, "record_fetch_stat", lambda *args: None)
+    steps = []
+    monkeypatch.setattr(run, "record_step", lambda conn, run_id, school_id, season, view: steps.append((school_id, view)))
+
+    men = FetchResult("<html>", "http", {"men": [("row",)]})
+    women = FetchResult("<html>", "http", {"women": []})
+    job = SchoolWrite("North", [1, 2], 2026, 5, [("men", [("men", "men")], men), ("women", [("women", "women")], women)])
+    conn = FakeConn()
+    write_school(conn, job)
+
+    out = capsys.readouterr().out
+    assert "North men: 1 athletes (http); rejected above_max 1, out_of_season 2" in out
+    assert "women" not in out  # nothing parsed, nothing reported
+    assert steps == [(1, "men"), (2, "men"), (1, "women"), (2, "women")]
+    assert conn.commits == 1
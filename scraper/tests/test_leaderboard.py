@@ -0,0 +1,91 @@
+from datetime import date
+
+import pytest
+
+from leaderboard import Snapshot
+
+EVENTS = [(1, "100m", "lower"), (2, "lj", "higher"), (3, "4x400", "lower")]
+ATHLETES = [(10, "Ana", 11, 1), (11, "Bea", 12, 2), (12, "Cal", 10, 1), (20, "Dan", 12, 1)]
+SCHOOLS = [(1, "North"), (2, "South")]
+
+
+def _d(month, day):
+    return date(2026, month, day)
+
+
+@pytest.fixture
+def snapshot():
+    marks = [
+        # (id, event_id, gender, athlete_id, value, mark_date, meet_name)
+        (1, 1, "F", 10, 12.50, _d(3, 10), "Opener"),
+        (2, 1, "F", 10, 12.20, _d(4, 1), "Dual"),
+        (3, 1, "F", 10, 12.40, _d(4, 20), "Invite"),
+        (4, 1, "F", 10, 12.60, _d(5, 5), "Conference"),
+        (5, 1, "F", 11, 12.30, _d(3, 20), "Opener"),
+        (6, 1, "F", 11, 12.30, _d(4, 25), "Invite"),
+        (7, 1, "F", 12, 12.35, _d(4, 2), "Dual"),
+        (8, 1, "M", 20, 11.00, _d(4, 2), "Dual"),
+        (9, 2, "F", 10, 5.10, _d(4, 1), "Dual"),
+        (10, 2, "F", 11, 5.30, _d(4, 2), "Dual"),
+    ]
+    relays = [
+        (100, 3, "F", 1, 260.0, _d(4, 1), "Dual"),
+        (101, 3, "F", 1, 255.0, _d(5, 1), "Conference"),
+        (102, 3, "F", 2, 258.0, _d(4, 20), "Invite"),
+    ]
+    members = [(100, 10), (101, 10), (101, 12), (102, 11)]
+    return Snapshot(EVENTS, ATHLETES, SCHOOLS, marks, relays, members, 2026)
+
+
+def _board(rows, key="value"):
+    return [(row["athlete_name"], row[key]) for row in rows]
+
+
+def test_pr_ranks_season_bests_with_their_meet(snapshot):
+    rows = snapshot.rank("100m", "women")
+    assert _board(rows) == [("Ana", 12.2), ("Bea", 12.3), ("Cal", 12.35)]
+    assert [row["rank"] for row in rows] == [1, 2, 3]
+    assert (rows[0]["mark_date"], rows[0]["meet_name"], rows[0]["school_name"]) == (_d(4, 1), "Dual", "North")
+    # A repeated best keeps the latest date
+    assert (rows[1]["mark_date"], rows[1]["meet_name"]) == (_d(4, 25), "Invite")
+    assert _board(snapshot.rank("100m", "men")) == [("Dan", 11.0)]
+
+
+def test_pr_higher_is_better_for_field_events(snapshot):
+    assert _board(snapshot.rank("lj", "women")) == [("Bea", 5.3), ("Ana", 5.1)]
+
+
+def test_avg3_uses_the_three_most_recent_marks(snapshot):
+    rows = snapshot.rank("100m", "women", mode="avg3")
+    # Ana: 12.60, 12.40, 12.20 (the March 12.50 is her fourth most recent)
+    assert _board(rows) == [("Bea", 12.3), ("Cal", 12.35), ("Ana", 12.4)]
+    assert (rows[2]["mark_date_min"], rows[2]["mark_date_max"]) == (_d(4, 1), _d(5, 5))
+
+
+def test_as_of_ranks_the_board_as_it_stood_that_day(snapshot):
+    assert _board(snapshot.rank("100m", "women", as_of=_d(3, 31))) == [("Bea", 12.3), ("Ana", 12.5)]
+    rows = snapshot.rank("100m", "women", mode="avg3", as_of=_d(4, 20))
+    # Ana: 12.40 on the day itself counts, 12.60 on May 5 does not
+    assert _board(rows) == [("Bea", 12.3), ("Cal", 12.35), ("Ana", 12.37)]
+
+
+def test_grade_filter(snapshot):
+    assert _board(snapshot.rank("100m", "women", grades=[10, 12])) == [("Bea", 12.3), ("Cal", 12.35)]
+    assert snapshot.rank("100m", "women", grades=[9]) == []
+
+
+def test_relays_rank_schools_and_filter_by_member_grade(snapshot):
+    rows = snapshot.rank("4x400", "women")
+    assert [(row["school_name"], row["value"]) for row in rows] == [("North", 255.0), ("South", 258.0)]
+    assert rows[0]["athlete_name"] == "Relay" and rows[0]["grade"] is None
+    # Only North's conference relay ran a 10th grader
+    graded = snapshot.rank("4x400", "women", grades=[10])
+    assert [(row["school_name"], row["value"]) for row in graded] == [("North", 255.0)]
+
+
+def test_limit_and_bad_queries(snapshot):
+    assert _board(snapshot.rank("100m", "women", limit=1)) == [("Ana", 12.2)]
+    with pytest.raises(ValueError):
+        snapshot.rank("100m", "women", mode="best")
+    with pytest.raises(KeyError):
+        snapshot.rank("200m", "women")
@@ -0,0 +1,64 @@
+from datetime import date, datetime, timezone
+
+from meets import MeetPlanner, meet_key
+
+NOW = datetime(2026, 4, 16, 8, tzinfo=timezone.utc)  # a Thursday night run
+LAST = datetime(2026, 4, 15, 8, tzinfo=timezone.utc)  # every school synced Wednesday
+
+
+def _planner(meets, last=None, probe=()):
+    last_sync = {(school, 2026): LAST for school in (1, 2, 3)}
+    last_sync.update(last or {})
+    return MeetPlanner(last_sync, meets, settle_days=3, max_age_days=7, probe=probe, now=NOW)
+
+
+def test_meet_key_ignores_years_and_case():
+    assert meet_key("2026 Eagle  Invitational") == meet_key("eagle invitational 2025") == "eagle invitational"
+    assert meet_key("") == meet_key(None) == ""
+
+
+def test_never_synced_and_stale():
+    planner = _planner({}, last={(1, 2026): None, (2, 2026): datetime(2026, 4, 1, tzinfo=timezone.utc)})
+    assert planner.reason([1], 2026) == "never synced"
+    assert planner.reason([2], 2026).startswith("last synced 15 day")
+    assert planner.reason([3], 2026) is None
+
+
+def test_a_meet_only_makes_its_usual_entrants_due():
+    meets = {
+        (1, 2025): {("2025 Eagle Invitational", date(2025, 4, 12))},
+        (3, 2025): {("2025 Prairie Invitational", date(2025, 4, 12))},
+    }
+    planner = _planner(meets)
+    planner.observe(2026, {("2026 Eagle Invitational", date(2026, 4, 15))})  # seen on school 2's page this run
+    assert planner.reason([1], 2026) == "meet 2026 Eagle Invitational on 2026-04-15"
+    assert planner.reason([3], 2026) is None
+
+
+def test_meet_already_on_own_page_is_not_new():
+    meet = ("2026 Eagle Invitational", date(2026, 4, 14))
+    planner = _planner({(1, 2025): {("Eagle Invitational", date(2025, 4, 12))}, (1, 2026): {meet}})
+    planner.observe(2026, {meet})
+    assert planner.reason([1], 2026) is None
+
+
+def test_late_results_once_the_meet_has_settled():
+    meet = ("Dual", date(2026, 4, 11))  # settles on the 14th, after the last sync on the 15th: nothing to do
+    assert _planner({(1, 2026): {meet}}).reason([1], 2026) is None
+    meet = ("Dual", date(2026, 4, 13))  # settles on the 16th, after the last sync
+    assert _planner({(1, 2026): {meet}}).reason([1], 2026) == "late results of Dual on 2026-04-13"
+
+
+def test_usual_meet_day():
+    # School 1 had meets on the last two Wednesdays; a Wednesday has passed since its last sync
+    meets = {(1, 2026): {("Dual A", date(2026, 4, 1)), ("Dual B", date(2026, 4, 8))}}
+    assert _planner(meets).reason([1], 2026) == "usually competes on Wednesdays"
+    # Schools 2 and 3 have no Wednesday meets in the last three weeks
+    meets = {(2, 2026): {("Dual A", date(2026, 3, 18)), ("Sat Inv", date(2026, 4, 11))}}
+    assert _planner(meets).reason([2], 2026) is None
+
+
+def test_probe_and_order():
+    planner = _planner({}, last={(2, 2026): datetime(2026, 4, 14, tzinfo=timezone.utc), (3, 2026): None}, probe=[(2, 2026)])
+    assert planner.reason([2], 2026) == "probe for new meets"
+    assert planner.order([(1, 2026), (2, 2026), (3, 2026)]) == [(3, 2026), (2, 2026), (1, 2026)]
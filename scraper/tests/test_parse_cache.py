@@ -0,0 +1,46 @@
+import parse_cache
+from parse_cache import ParseCache, cached_iter_team_summary, file_digest, html_digest
+
+
+def _rows(n):
+    return [(f"Athlete {i}", 10, [("100m", 11.0 + i / 100, None, "Meet")]) for i in range(n)]
+
+
+def test_file_digest_matches_html_digest(tmp_path):
+    path = tmp_path / "page.html"
+    data = b"<html>" + b"x" * (parse_cache.CHUNK_SIZE + 17) + b"</html>"
+    path.write_bytes(data)
+    assert file_digest(str(path)) == html_digest(data)
+
+
+def test_tee_stores_only_complete_streams(tmp_path):
+    cache = ParseCache(str(tmp_path))
+    assert list(cache.tee("k", iter([1, 2, 3]))) == [1, 2, 3]
+    assert list(cache.get_stream("k")) == [1, 2, 3]
+    partial = cache.tee("p", iter([1, 2, 3]))
+    next(partial)
+    partial.close()
+    assert cache.get_stream("p") is None
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_cached_iter_team_summary_streams_then_replays(tmp_path, monkeypatch):
+    import run
+
+    calls = []
+
+    def fake_iter(path, gender, season_year, rejects):
+        calls.append(path)
+        rejects.append("bad row")
+        yield from _rows(3)
+
+    monkeypatch.setattr(run, "iter_team_summary", fake_iter)
+    monkeypatch.setattr(parse_cache, "parser_fingerprint", lambda: "test")
+    page = tmp_path / "team.html"
+    page.write_text("<html></html>")
+    cache = ParseCache(str(tmp_path / "cache"))
+    for expected_calls in (1, 1):
+        rejects = []
+        assert list(cached_iter_team_summary(str(page), "men", 2026, rejects, cache)) == _rows(3)
+        assert rejects == ["bad row"] and len(calls) == expected_calls
+    assert cache.hits == 1 and cache.misses == 1
@@ -0,0 +1,100 @@
+from argparse import Namespace
+
+import pytest
+
+from rate_limit import RateLimiter, configure_from_args, parse_retry_after
+
+
+class FakeClock:
+    """Monotonic clock that only moves when the limiter sleeps (or a test advances it)."""
+
+    def __init__(self):
+        self.now = 100.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def _limiter(clock, **kwargs):
+    kwargs = {"interval": 8.0, "min_interval": 4.0, "max_interval": 60.0, **kwargs}
+    return RateLimiter(clock=clock, sleep=clock.sleep, **kwargs)
+
+
+def test_requests_are_spaced_by_the_interval(clock):
+    lim = _limiter(clock)
+    assert [lim.wait() for _ in range(3)] == [0.0, 8.0, 8.0]
+    assert clock.slept == [8.0, 8.0]
+    assert lim.rate_per_min() == pytest.approx(7.5)
+
+
+def test_healthy_responses_shrink_the_delay_down_to_the_floor(clock):
+    lim = _limiter(clock, recover_after=1)
+    for _ in range(20):
+        lim.record(200, 0.2)
+    assert lim.interval == 4.0
+
+
+def test_errors_and_5xx_back_off_up_to_the_ceiling(clock):
+    lim = _limiter(clock)
+    lim.record(500, 0.2)
+    assert lim.interval == 16.0
+    lim.record(None, error=True)
+    lim.record(502, 0.2)
+    lim.record(502, 0.2)
+    assert lim.interval == 60.0
+    assert lim.backoffs == 4
+
+
+def test_retry_after_holds_the_next_request(clock):
+    lim = _limiter(clock)
+    lim.wait()
+    lim.record(429, 0.1, retry_after="90")
+    assert lim.retry_afters == 1
+    assert lim.wait() == pytest.approx(90.0)
+
+
+def test_slow_response_raises_the_delay_by_half(clock):
+    lim = _limiter(clock, recover_after=100)
+    for _ in range(4):
+        lim.record(200, 0.5)
+    lim.record(200, 3.0)
+    assert lim.interval == 12.0
+    # Page loads keep their own running average, so one slow browser load is not compared to HTTP
+    lim.record(200, 3.0, kind="browser")
+    assert lim.interval == 12.0
+
+
+def test_parse_retry_after_accepts_seconds_and_http_dates():
+    assert parse_retry_after("30") == 30.0
+    assert parse_retry_after("Thu, 01 Jan 1970 00:01:00 GMT", now=0.0) == 60.0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+def test_shards_divide_the_ceiling():
+    lim = configure_from_args(Namespace(min_interval=4.0, max_interval=120.0), interval=12.0, workers=3)
+    assert (lim.interval, lim.min_interval, lim.max_interval) == (36.0, 12.0, 360.0)
+
+
+def test_concurrent_waits_account_every_slot():
+    import threading
+
+    # The clock stands still, so the n-th slot is n intervals out and the total wait is exact
+    lim = RateLimiter(interval=1.0, min_interval=1.0, clock=lambda: 0.0, sleep=lambda _s: None)
+    threads = [threading.Thread(target=lambda: [lim.wait() for _ in range(250)]) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert lim.requests == 2000
+    assert lim.waited_sec == sum(range(2000))
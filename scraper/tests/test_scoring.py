@@ -0,0 +1,59 @@
+from datetime import date
+
+import numpy as np
+
+from scoring import ConferenceMarks, Entries, Scoring, _score, project
+
+HIGHER = np.array([False, True])  # event 0 a race, event 1 a jump
+
+
+def _entries(rows):
+    """rows: (entrant, school, event, gender, pr); avg3 equals pr."""
+    entrant, school, event, gender, pr = (np.asarray(col) for col in zip(*rows))
+    pr = pr.astype(float)
+    return Entries(entrant, school, event, gender, pr, pr)
+
+
+def _scored(entries, table, limit, keep=None):
+    keep = np.ones(entries.size, dtype=bool) if keep is None else keep
+    idx, place, points = _score(entries, entries.pr, HIGHER, table, limit, keep)
+    return [(int(entries.entrant[i]), int(p), float(pt)) for i, p, pt in zip(idx, place, points)]
+
+
+def test_places_lowest_time_first_and_highest_mark_first():
+    entries = _entries([(1, 1, 0, 0, 11.2), (2, 2, 0, 0, 11.0), (3, 1, 1, 0, 5.0), (4, 2, 1, 0, 6.0)])
+    assert _scored(entries, (10, 8), 3) == [(2, 1, 10.0), (1, 2, 8.0), (4, 1, 10.0), (3, 2, 8.0)]
+
+
+def test_entry_limit_keeps_each_schools_best():
+    entries = _entries([(1, 1, 0, 0, 11.0), (2, 1, 0, 0, 11.1), (3, 1, 0, 0, 11.2), (4, 2, 0, 0, 11.3)])
+    assert _scored(entries, (10, 8, 6), 2) == [(1, 1, 10.0), (2, 2, 8.0), (4, 3, 6.0)]
+
+
+def test_ties_share_the_points_of_their_places():
+    entries = _entries([(1, 1, 0, 0, 11.0), (2, 2, 0, 0, 11.0), (3, 3, 0, 0, 11.5)])
+    assert _scored(entries, (10, 8, 6), 3) == [(1, 1, 9.0), (2, 1, 9.0), (3, 3, 6.0)]
+
+
+def test_tie_straddling_the_last_scoring_place():
+    entries = _entries([(1, 1, 0, 0, 11.0), (2, 2, 0, 0, 11.5), (3, 3, 0, 0, 11.5)])
+    assert _scored(entries, (10, 8), 3) == [(1, 1, 10.0), (2, 2, 4.0), (3, 2, 4.0)]
+
+
+def test_genders_score_separately_and_scratches_and_missing_marks_are_skipped():
+    entries = _entries([(1, 1, 0, 0, 11.0), (2, 2, 0, 1, 12.0), (3, 3, 0, 1, 12.5), (4, 4, 0, 1, 12.1)])
+    entries.pr[3] = np.nan
+    keep = np.array([True, False, True, True])
+    assert _scored(entries, (10, 8), 3, keep) == [(1, 1, 10.0), (3, 1, 10.0)]
+
+
+def test_project_enters_one_relay_per_school():
+    d = date(2026, 4, 1)
+    marks = ConferenceMarks.from_rows(
+        [("100m", "lower"), ("4x100", "lower")],
+        [],
+        [(1, "4x100", "M", 1, 44.0, d), (2, "4x100", "M", 1, 44.5, d), (3, "4x100", "M", 2, 45.0, d)],
+    )
+    projection = project(marks, "pr", Scoring(table=(10, 8, 6)))
+    assert projection.event_rows("4x100", "men") == [(1, 1, 1, 44.0, 10.0, True), (2, 2, 2, 45.0, 8.0, True)]
+    assert projection.standings("men") == [(1, 10.0), (2, 8.0)]
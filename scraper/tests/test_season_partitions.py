@@ -0,0 +1,32 @@
+from conftest import FakeConn
+from season_partitions import prune_orphan_athletes
+
+PARTITIONS = "FROM pg_class c JOIN pg_namespace n"
+
+
+def _prune(partitions):
+    """partitions: (relname, schema, approx_rows, attached) as list_partitions reads them."""
+    conn = FakeConn({PARTITIONS: partitions, "DELETE FROM athletes": [(1,), (2,)]})
+    deleted = prune_orphan_athletes(conn)
+    delete_sql = next(sql for sql, _params in conn.executed if "DELETE FROM athletes" in sql)
+    return deleted, delete_sql, conn
+
+
+def test_prune_keeps_athletes_of_archived_and_detached_seasons():
+    # 2024 archived and 2025 detached by earlier runs; deleting their athletes would cascade into them
+    deleted, sql, conn = _prune([
+        ("marks_y2024", "marks_archive", 900, False),
+        ("marks_y2025", "public", 800, False),
+        ("marks_y2026", "public", 700, True),
+    ])
+    assert deleted == 2 and conn.commits == 1
+    assert 'NOT EXISTS (SELECT 1 FROM "marks_archive"."marks_y2024" p WHERE p.athlete_id = a.id)' in sql
+    assert 'NOT EXISTS (SELECT 1 FROM "public"."marks_y2025" p WHERE p.athlete_id = a.id)' in sql
+    # Attached seasons are already covered by the check on marks
+    assert "marks_y2026" not in sql
+
+
+def test_prune_without_archives_checks_live_tables_only():
+    _deleted, sql, _conn = _prune([("marks_y2026", "public", 700, True)])
+    assert "FROM marks m" in sql and "relay_result_members" in sql
+    assert "marks_archive" not in sql
@@ -0,0 +1,50 @@
+import argparse
+
+import pytest
+
+from conftest import FakeConn
+from shards import DEFAULT_COST_MS, parse_shard, partition, shard_report, shard_schools
+
+
+def test_parse_shard():
+    assert parse_shard("2/3") == (2, 3)
+    for bad in ("0/3", "4/3", "x/3", "3"):
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_shard(bad)
+
+
+def test_partition_is_deterministic_and_complete():
+    ids = list(range(1, 41))
+    costs = {i: (i * 7919) % 9000 + 200 for i in ids if i % 7}
+    shards, loads = partition(ids, costs, 3)
+    assert sorted(sum(shards, [])) == ids
+    assert (shards, loads) == partition(list(reversed(ids)), dict(reversed(list(costs.items()))), 3)
+    assert max(loads) - min(loads) <= max(costs.values())
+
+
+def test_partition_balances_heavy_schools():
+    shards, loads = partition([1, 2, 3, 4], {1: 900, 2: 500, 3: 400, 4: 100}, 2)
+    assert shards == [[1, 4], [2, 3]] and loads == [1000, 900]
+
+
+def test_partition_without_history_uses_default_and_median():
+    shards, loads = partition([1, 2, 3], {}, 2)
+    assert shards == [[1, 3], [2]] and loads == [2 * DEFAULT_COST_MS, DEFAULT_COST_MS]
+    _shards, loads = partition([1, 2, 3, 4], {1: 100, 2: 300, 3: 500}, 1)
+    assert loads == [100 + 300 + 500 + 300]
+
+
+def test_shard_schools_picks_its_share():
+    schools = [(i, f"T{i}", f"School {i}") for i in range(1, 7)]
+    conn = FakeConn({"FROM school_fetch_stats": [(i, i * 100) for i in range(1, 7)]})
+    mine = [shard_schools(conn, 9, schools, 2026, index, 3)[0] for index in (1, 2, 3)]
+    assert sorted(s for share in mine for s in share) == schools
+    assert all(len(share) == 2 for share in mine)
+
+
+def test_shard_report():
+    conn = FakeConn({"FROM scrape_run_shards": [(1, 3, "success", 5, None), (2, 3, "failed", 2, "boom")]})
+    assert shard_report(conn, 7) == (["shard 2/3 is failed: boom", "shard 3/3 has not reported"], 7)
+    conn = FakeConn({"FROM scrape_run_shards": [(1, 2, "success", 5, None), (2, 2, "success", 4, None)]})
+    assert shard_report(conn, 7) == ([], 9)
+    assert shard_report(FakeConn(), 7) == (["no shard has reported for run 7"], 0)
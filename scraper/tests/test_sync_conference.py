@@ -0,0 +1,7 @@
+from sync_conference import format_failures
+
+
+def test_format_failures_keeps_steps_and_writes_apart():
+    assert format_failures(2, 0) == "2 failed step(s)"
+    assert format_failures(0, 1) == "1 team page(s) not written"
+    assert format_failures(3, 1) == "3 failed step(s), 1 team page(s) not written"
@@ -0,0 +1,79 @@
+from contextlib import contextmanager
+
+import pytest
+
+import tiered_fetch
+from tiered_fetch import TieredFetcher, view_url
+
+_TAB = '<a class="nav-link active" href="#">{}</a><div class="athlete">x</div>'
+
+
+@pytest.fixture
+def pages(monkeypatch):
+    """url -> html served by the HTTP tier; parse_view returns one row per gender."""
+    import run
+
+    served = {}
+    requested = []
+
+    def fake_get(url, cache=None, timeout=30):
+        requested.append(url)
+        return served[url]
+
+    monkeypatch.setattr(tiered_fetch, "http_get_conditional", fake_get)
+    monkeypatch.setattr(run, "parse_view", lambda html, view, gender, year, rejects: [(view, gender)])
+    monkeypatch.setattr(run, "team_summary_url", lambda team_id, year: f"http://test/{team_id}/{year}")
+    return served, requested
+
+
+def test_http_tier_requests_the_view(pages, tmp_path):
+    served, requested = pages
+    for view, tab in (("men", "Men"), ("women", "Women"), ("relays", "Relays")):
+        served[view_url("http://test/1/2026", view)] = _TAB.format(tab)
+    fetcher = TieredFetcher(mode="http", cache_dir=str(tmp_path))
+    assert fetcher.fetch(1, 2026, "women", ("women",)).parsed == {"women": [("women", "women")]}
+    relays = fetcher.fetch(1, 2026, "relays", ("men", "women"))
+    assert set(relays.parsed) == {"men", "women"}
+    assert requested == ["http://test/1/2026?view=women", "http://test/1/2026?view=relays"]
+
+
+def test_http_only_rejects_a_page_showing_another_tab(pages, tmp_path):
+    served, _requested = pages
+    # A server that ignores ?view answers with the men tab
+    served["http://test/1/2026?view=women"] = _TAB.format("Men")
+    fetcher = TieredFetcher(mode="http", cache_dir=str(tmp_path))
+    with pytest.raises(ValueError):
+        fetcher.fetch(1, 2026, "women", ("women",))
+    assert fetcher.tier_counts == {"http": 0, "browser": 0}
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.loads = []
+
+    @contextmanager
+    def session(self):
+        yield self
+
+    def view_html(self, url, view):
+        self.loads.append(view)
+        return _TAB.format(view.capitalize())
+
+    def invalidate_all(self):
+        pass
+
+
+def test_auto_keeps_an_escalated_team_on_the_browser(pages, tmp_path):
+    served, requested = pages
+    for team in (1, 2):
+        for view in ("men", "women"):
+            served[view_url(f"http://test/{team}/2026", view)] = (
+                "<html><app-root></app-root></html>" if team == 1 else _TAB.format(view.capitalize())
+            )
+    browser = FakeBrowser()
+    fetcher = TieredFetcher(mode="auto", browser=browser, cache_dir=str(tmp_path))
+    assert [fetcher.fetch(1, 2026, view, (view,)).tier for view in ("men", "women")] == ["browser", "browser"]
+    assert [fetcher.fetch(2, 2026, view, (view,)).tier for view in ("men", "women")] == ["http", "http"]
+    # Team 1 served the Angular shell once; its women's tab skipped the HTTP attempt
+    assert requested == ["http://test/1/2026", "http://test/2/2026", "http://test/2/2026?view=women"]
+    assert browser.loads == ["men", "women"]
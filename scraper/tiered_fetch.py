@@ -0,0 +1,213 @@
+"""
+Tiered team-summary fetcher: a cheap HTTP request first, Playwright only when needed.
+
+Tier 1 ("http") is a GET through the shared keep-alive requests.Session (run.http_get) with
+conditional-GET validators (ETag / Last-Modified) kept in scraper/.http_cache, so unchanged pages
+come back as 304s without a body. It asks for the tab with ?view=women|relays (the men tab is the
+plain URL). If the page fails, looks like the bare Angular shell, shows a
+different tab than the requested view, or parses to no rows for the requested genders, the
+fetch escalates to tier 2 ("browser"): a warm browser_pool session that renders the page and
+switches tabs.
+
+The tier that produced each (school, view) is returned with timings so callers can log it
+(run.record_fetch_stat); `preferred` tiers from recent runs skip the HTTP attempt for teams
+that are known to need the browser. Within a run, once one view of a team escalates, the
+team's remaining views go straight to the browser.
+"""
+import hashlib
+import json
+import os
+import re
+import time
+from dataclasses import dataclass, field
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+HTTP_CACHE_DIR = os.path.join(SCRIPT_DIR, ".http_cache")
+TIERS = ("auto", "http", "browser")
+
+# Angular bootstraps into <app-root>; the shell has it but none of the rendered athlete/relay markup
+_SHELL_MARKER = re.compile(r"<app-root\b", re.I)
+_CONTENT_MARKER = re.compile(r"class=\"[^\"]*\b(athlete|event-header)\b|Relays</h", re.I)
+
+
+# Active tab link, e.g. <a class="nav-link active" ...>Women</a>
+_ACTIVE_TAB = re.compile(
+    r"<a\b[^>]*class=\"[^\"]*\bnav-link\b[^\"]*\bactive\b[^\"]*\"[^>]*>(?:\s*<[^>]+>)*\s*(Men|Women|Relays)\b",
+    re.I,
+)
+
+
+def rendered_view(html: str) -> str | None:
+    """Which tab a server-rendered page shows ('men' / 'women' / 'relays'), or None if no tab bar."""
+    m = _ACTIVE_TAB.search(html or "")
+    return m.group(1).lower() if m else None
+
+
+def view_url(url: str, view: str) -> str:
+    """Team-summary URL that asks for one tab; the men tab is the plain URL."""
+    return url if view == "men" else f"{url}?view={view}"
+
+
+def looks_like_angular_shell(html: str) -> bool:
+    """True for the un-rendered Angular shell athletic.net serves to plain HTTP clients."""
+    if not html:
+        return True
+    return bool(_SHELL_MARKER.search(html)) and not _CONTENT_MARKER.search(html)
+
+
+class ConditionalGetCache:
+    """ETag / Last-Modified validators plus last body per URL, one small JSON file each."""
+
+    def __init__(self, cache_dir: str = HTTP_CACHE_DIR):
+        self.cache_dir = cache_dir
+
+    def _path(self, url: str) -> str:
+        return os.path.join(self.cache_dir, hashlib.sha1(url.encode("utf-8")).hexdigest() + ".json")
+
+    def get(self, url: str) -> dict | None:
+        try:
+            with open(self._path(url), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, url: str, etag: str | None, last_modified: str | None, body: str):
+        if not etag and not last_modified:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(self._path(url), "w", encoding="utf-8") as f:
+            json.dump({"etag": etag, "last_modified": last_modified, "body": body}, f)
+
+
+def http_get_conditional(url: str, cache: ConditionalGetCache | None = None, timeout: int = 30) -> str:
+    """GET url with If-None-Match / If-Modified-Since; a 304 returns the cached body."""
+    from run import http_get
+
+    cached = cache.get(url) if cache else None
+    headers = {}
+    if cached:
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+    resp = http_get(url, headers=headers, timeout=timeout)
+    if resp.status_code == 304 and cached:
+        return cached["body"]
+    resp.raise_for_status()
+    if cache:
+        cache.put(url, resp.headers.get("ETag"), resp.headers.get("Last-Modified"), resp.text)
+    return resp.text
+
+
+@dataclass
+class FetchResult:
+    html: str
+    tier: str
+    parsed: dict = field(default_factory=dict)  # gender -> run.parse_view rows (athletes, or relay results)
+    fetch_ms: int = 0
+    parse_ms: int = 0
+    rejects: dict = field(default_factory=dict)  # gender -> parser rejects (see quarantine.Quarantine.add_parse_rejects)
+
+
+class TieredFetcher:
+    """
+    fetch() returns a FetchResult for one (team, season, view), parsed for the requested genders.
+
+    mode: "auto" (HTTP, escalate to browser), "http" (never launch a browser) or "browser" (skip HTTP).
+    browser: object with a session() context manager yielding a browser_pool.FetchSession;
+    a browser_pool.LazyBrowserPool is created on demand so Chromium only starts if a team needs it.
+    """
+
+    def __init__(self, mode: str = "auto", browser=None, preferred: dict | None = None, cache_dir: str = HTTP_CACHE_DIR):
+        if mode not in TIERS:
+            raise ValueError(f"mode must be one of {TIERS}")
+        self.mode = mode
+        self._browser = browser
+        self._owns_browser = browser is None
+        self.preferred = preferred or {}
+        self._cache = ConditionalGetCache(cache_dir)
+        self._http_page = None  # (url, html) of the last HTTP page
+        self._escalated = set()  # (team_id, season_year) that needed the browser in this run
+        self.tier_counts = {"http": 0, "browser": 0}
+
+    @property
+    def browser(self):
+        if self._browser is None:
+            from browser_pool import LazyBrowserPool
+
+            self._browser = LazyBrowserPool()
+        return self._browser
+
+    def _parse(self, html: str, view: str, genders, season_year: int) -> tuple[dict, dict]:
+        """({gender: rows}, {gender: parser rejects})."""
+        from run import parse_view
+
+        rejects = {g: [] for g in genders}
+        return {g: parse_view(html, view, g, season_year, rejects[g]) for g in genders}, rejects
+
+    def _http_html(self, url: str) -> str:
+        if self._http_page and self._http_page[0] == url:
+            return self._http_page[1]
+        html = http_get_conditional(url, self._cache)
+        self._http_page = (url, html)
+        return html
+
+    def fetch(self, team_id, season_year: int, view: str, genders, school_id=None) -> FetchResult:
+        from run import team_summary_url
+
+        url = team_summary_url(team_id, season_year)
+        team = (str(team_id), season_year)
+        use_http = self.mode == "http" or (
+            self.mode == "auto"
+            and self.preferred.get((school_id, view)) != "browser"
+            and team not in self._escalated
+        )
+        if use_http:
+            t0 = time.perf_counter()
+            try:
+                html = self._http_html(view_url(url, view))
+            except Exception as e:
+                if self.mode == "http":
+                    raise
+                print(f"  HTTP fetch failed ({e}); using browser")
+                html = ""
+            t1 = time.perf_counter()
+            # A server that ignores ?view shows the default (Men) tab; never read it as another view
+            shown = rendered_view(html) or "men"
+            usable = shown == view and not looks_like_angular_shell(html)
+            if self.mode == "http" and not usable:
+                # Otherwise the step would count as done with nothing parsed
+                raise ValueError(f"HTTP page shows the {shown} tab, not {view}, or is the unrendered shell")
+            parsed, rejects = self._parse(html, view, genders, season_year) if usable else ({}, {})
+            t2 = time.perf_counter()
+            if self.mode == "http" or any(parsed.values()):
+                self.tier_counts["http"] += 1
+                return FetchResult(html, "http", parsed, _ms(t1 - t0), _ms(t2 - t1), rejects)
+
+        t0 = time.perf_counter()
+        with self.browser.session() as session:
+            html = session.view_html(url, view)
+        t1 = time.perf_counter()
+        parsed, rejects = self._parse(html, view, genders, season_year)
+        t2 = time.perf_counter()
+        # An unusable HTTP page, or rows only the browser could see: skip HTTP for this team from now on.
+        # A tab that is empty both ways (e.g. no relays) says nothing about the team.
+        if use_http and (not usable or any(parsed.values())):
+            self._escalated.add(team)
+        self.tier_counts["browser"] += 1
+        return FetchResult(html, "browser", parsed, _ms(t1 - t0), _ms(t2 - t1), rejects)
+
+    def invalidate(self):
+        """Drop the cached HTTP page and force the browser to re-navigate (after a failed step)."""
+        self._http_page = None
+        if self._browser is not None:
+            self._browser.invalidate_all()
+
+    def close(self):
+        if self._owns_browser and self._browser is not None:
+            self._browser.close()
+
+
+def _ms(seconds: float) -> int:
+    return int(round(seconds * 1000))
+
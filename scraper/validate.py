@@ -0,0 +1,108 @@
+"""
+Vectorised plausibility checks for parsed marks, run once per write batch.
+
+The parser only drops cells it cannot read; every other rule is applied here, on the whole batch
+at once as NumPy masks over columnar arrays (event code, value, date ordinal):
+
+  unknown_event   slug has no row in the events table
+  above_max       distance above DISTANCE_MAX_METERS (usually a wrong-event or feet/inches mix-up)
+  below_min       distance below DISTANCE_MIN_METERS (place or grade read as a result)
+  time_range      time outside TIME_RANGE_SEC
+  out_of_season   mark_date missing or outside the season window (run.season_window)
+
+Each rejected row is counted under the first rule it fails, in that order.
+
+Usage:
+  keep, rejected = validate_marks(slugs, values, dates, season_year=2026, known_slugs=event_ids)
+  reasons = classify_marks(...)  # per-row RULES index (-1 = kept), e.g. for quarantine.py
+"""
+from collections import Counter
+
+import numpy as np
+
+from run import (
+    DEFAULT_SEASON_YEAR,
+    DISTANCE_MAX_METERS,
+    DISTANCE_MIN_METERS,
+    DISTANCE_SLUGS,
+    TIME_RANGE_SEC,
+    season_window,
+)
+
+RULES = ("unknown_event", "above_max", "below_min", "time_range", "out_of_season")
+
+
+def _bounds_table():
+    """(slug -> code, lo, hi, is_distance) arrays; code len(slugs) is the catch-all for slugs without bounds."""
+    slugs = sorted(DISTANCE_SLUGS | set(TIME_RANGE_SEC))
+    codes = {slug: i for i, slug in enumerate(slugs)}
+    n = len(slugs) + 1
+    lo = np.full(n, -np.inf)
+    hi = np.full(n, np.inf)
+    is_distance = np.zeros(n, dtype=bool)
+    for slug, i in codes.items():
+        if slug in DISTANCE_SLUGS:
+            is_distance[i] = True
+            lo[i] = DISTANCE_MIN_METERS.get(slug, -np.inf)
+            hi[i] = DISTANCE_MAX_METERS.get(slug, np.inf)
+        else:
+            lo[i], hi[i] = TIME_RANGE_SEC[slug]
+    return codes, lo, hi, is_distance
+
+
+_CODES, _LO, _HI, _IS_DISTANCE = _bounds_table()
+_NO_BOUNDS = len(_CODES)
+
+
+def classify_marks(slugs, values, dates, season_year: int | None = None, known_slugs=None):
+    """
+    slugs, values, dates: equal-length sequences (dates are datetime.date or None).
+    known_slugs: container of slugs that exist in the events table (None = don't check).
+    Returns an int8 array: index into RULES of the first rule each row fails, or -1 to keep it.
+    """
+    n = len(values)
+    reasons = np.full(n, -1, dtype=np.int8)
+    if n == 0:
+        return reasons
+    codes = np.fromiter((_CODES.get(s, _NO_BOUNDS) for s in slugs), dtype=np.intp, count=n)
+    vals = np.asarray(values, dtype=np.float64)
+    ordinals = np.fromiter((d.toordinal() if d else 0 for d in dates), dtype=np.int64, count=n)
+    lo_date, hi_date = season_window(season_year or DEFAULT_SEASON_YEAR)
+
+    if known_slugs is None:
+        unknown = np.zeros(n, dtype=bool)
+    else:
+        unknown = np.fromiter((s not in known_slugs for s in slugs), dtype=bool, count=n)
+    distance = _IS_DISTANCE[codes]
+    lo, hi = _LO[codes], _HI[codes]
+    masks = (
+        unknown,
+        distance & (vals > hi),
+        distance & (vals < lo),
+        ~distance & ((vals < lo) | (vals > hi)),
+        (ordinals < lo_date.toordinal()) | (ordinals >= hi_date.toordinal()),
+    )
+    # Apply in reverse so each row ends up with the first rule (in RULES order) it fails
+    for rule_index in range(len(RULES) - 1, -1, -1):
+        reasons[masks[rule_index]] = rule_index
+    return reasons
+
+
+def validate_marks(slugs, values, dates, season_year: int | None = None, known_slugs=None):
+    """
+    Same arguments as classify_marks. Returns (keep, rejected): a boolean array over the rows,
+    and a Counter of rejections per rule.
+    """
+    reasons = classify_marks(slugs, values, dates, season_year, known_slugs)
+    return reasons < 0, count_rejections(reasons)
+
+
+def count_rejections(reasons) -> Counter:
+    """Counter of rejected rows per rule from a classify_marks result."""
+    counts = np.bincount(reasons[reasons >= 0], minlength=len(RULES))
+    return Counter({rule: int(c) for rule, c in zip(RULES, counts) if c})
+
+
+def format_rejections(rejected) -> str:
+    """'out_of_season 12, above_max 1' in RULES order (empty string when nothing was dropped)."""
+    return ", ".join(f"{rule} {rejected[rule]}" for rule in RULES if rejected.get(rule))